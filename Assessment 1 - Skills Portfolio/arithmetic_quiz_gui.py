@@ -1,141 +1,180 @@
 import tkinter as tk
 from tkinter import messagebox
+import getpass
 import random
 
+from instrument import count, sample_event_loop, startup_paint, startup_ready, timed
+from quiz_engine import POINTS_FIRST_TRY, POINTS_SECOND_TRY, PROFILES, QuizSession, solve
+
+results = None  # ResultsStore, opened when the first quiz finishes
+session = None  # QuizSession being played
+
 # -----------------------
 # Function Definitions
 # -----------------------
 
+@timed("quiz.displayMenu")
 def displayMenu():
     """Display difficulty level menu."""
-    clear_window()
-    tk.Label(root, text="SELECT DIFFICULTY LEVEL", font=("Arial", 16, "bold")).pack(pady=10)
-    
-    tk.Button(root, text="1. Easy", width=20, command=lambda: start_quiz("Easy")).pack(pady=5)
-    tk.Button(root, text="2. Moderate", width=20, command=lambda: start_quiz("Moderate")).pack(pady=5)
-    tk.Button(root, text="3. Advanced", width=20, command=lambda: start_quiz("Advanced")).pack(pady=5)
+    show_screen(menu_frame)
 
 def randomInt(level):
     """Return a random integer based on difficulty."""
-    if level == "Easy":
-        return random.randint(1, 9)
-    elif level == "Moderate":
-        return random.randint(10, 99)
-    else:  # Advanced
-        return random.randint(1000, 9999)
+    lo, hi = PROFILES[level]["range"]
+    return random.randint(lo, hi)
 
-def decideOperation():
-    """Randomly decide between + or -"""
-    return random.choice(['+', '-'])
+def decideOperation(level="Easy"):
+    """Randomly decide which operator (by default + or -) to use."""
+    return random.choice(PROFILES[level]["ops"])
 
+@timed("quiz.displayProblem")
 def displayProblem():
     """Display the current arithmetic problem."""
-    clear_window()
-    global current_question, attempts
-    
-    if current_question < 10:
-        num1 = randomInt(level)
-        num2 = randomInt(level)
-        operation = decideOperation()
-        
-        # Avoid negative results in subtraction for simplicity
-        if operation == '-' and num2 > num1:
-            num1, num2 = num2, num1
-        
-        problems.append((num1, num2, operation))
-        question_text.set(f"Question {current_question + 1}: {num1} {operation} {num2} = ")
-        
-        tk.Label(root, textvariable=question_text, font=("Arial", 14)).pack(pady=10)
+    problem = session.current()
+
+    if problem is not None:
+        question_text.set(f"Question {session.index + 1}: {problem} = ")
+
         entry_answer.delete(0, tk.END)
-        entry_answer.pack(pady=5)
-        
-        tk.Button(root, text="Submit", command=check_answer).pack(pady=10)
+        show_screen(question_frame)
+        entry_answer.focus_set()
+        session.mark_shown()
     else:
         displayResults()
 
 def isCorrect(num1, num2, op, answer):
     """Check if user's answer is correct."""
-    correct = num1 + num2 if op == '+' else num1 - num2
-    return answer == correct
+    return answer == solve(num1, num2, op)
 
 def check_answer():
     """Check user's answer and update score."""
-    global score, current_question, attempts
-    
-    num1, num2, op = problems[current_question]
-    
+    if session is None or session.current() is None:
+        return  # Enter pressed after the quiz ended
+    count("quiz.answers")
+
     try:
         user_ans = int(entry_answer.get())
     except ValueError:
         messagebox.showerror("Error", "Please enter a valid number.")
         return
-    
-    if isCorrect(num1, num2, op, user_ans):
-        if attempts == 1:
-            score += 10
-            messagebox.showinfo("Correct!", "Perfect! +10 points")
+
+    result = session.answer(user_ans)
+    if result["outcome"] == "correct":
+        if result["points"] == POINTS_FIRST_TRY:
+            messagebox.showinfo("Correct!", f"Perfect! +{POINTS_FIRST_TRY} points")
         else:
-            score += 5
-            messagebox.showinfo("Correct!", "Correct on second try! +5 points")
-        current_question += 1
-        attempts = 1
+            messagebox.showinfo("Correct!", f"Correct on second try! +{POINTS_SECOND_TRY} points")
         displayProblem()
+    elif result["outcome"] == "retry":
+        messagebox.showwarning("Try Again", "Incorrect. Try once more!")
+        session.mark_shown()
     else:
-        if attempts == 1:
-            attempts += 1
-            messagebox.showwarning("Try Again", "Incorrect. Try once more!")
-        else:
-            messagebox.showinfo("Incorrect", f"Wrong again! The correct answer was {num1 + num2 if op == '+' else num1 - num2}")
-            current_question += 1
-            attempts = 1
-            displayProblem()
+        messagebox.showinfo("Incorrect", f"Wrong again! The correct answer was {result['answer']}")
+        displayProblem()
 
+@timed("quiz.displayResults")
 def displayResults():
     """Display final score and grade."""
-    clear_window()
-    grade = ""
-    if score >= 90:
-        grade = "A+"
-    elif score >= 80:
-        grade = "A"
-    elif score >= 70:
-        grade = "B"
-    elif score >= 60:
-        grade = "C"
-    else:
-        grade = "F"
-    
-    tk.Label(root, text=f"Final Score: {score}/100", font=("Arial", 16)).pack(pady=10)
-    tk.Label(root, text=f"Your Grade: {grade}", font=("Arial", 14, "bold")).pack(pady=5)
-    
-    tk.Button(root, text="Play Again", command=displayMenu).pack(pady=10)
-    tk.Button(root, text="Exit", command=root.destroy).pack(pady=5)
+    score_text.set(f"Final Score: {session.score}/{session.max_score}")
+    grade_text.set(f"Your Grade: {session.grade()}")
+
+    from quiz_results import ResultsError  # loaded with the store, off the startup path
+
+    try:
+        store = results_store()
+        store.record_session(session, player_name.get().strip())
+        board = store.leaderboard(session.level, limit=5)
+        board_text.set("\n".join(f"{i}. {row['player']}  {row['score']}/{row['max_score']}  {row['grade']}"
+                                 for i, row in enumerate(board, 1)))
+    except ResultsError as e:
+        board_text.set(f"Results could not be saved: {e}")
+
+    show_screen(results_frame)
+
+def results_store():
+    """Open the results database on first use, keeping it off the startup path."""
+    global results
+    if results is None:
+        from quiz_results import ResultsStore
+        results = ResultsStore()
+    return results
 
 def start_quiz(selected_level):
-    """Initialize quiz state."""
-    global level, score, current_question, attempts, problems
-    level = selected_level
-    score = 0
-    current_question = 0
-    attempts = 1
-    problems = []
+    """Start a new session: a fixed problem set, or adaptive if ticked on the menu."""
+    global session
+    session = QuizSession(selected_level, adaptive=adaptive.get())
     displayProblem()
 
-def clear_window():
-    """Clear all widgets in window."""
-    for widget in root.winfo_children():
-        widget.pack_forget()
+def show_screen(frame):
+    """Raise one of the prebuilt screens; nothing is created or destroyed."""
+    frame.tkraise()
+    if frame is not question_frame:
+        frame.focus_set()  # take focus off the hidden answer entry so Enter does nothing
+
+def build_screens():
+    """Create the menu, question and results screens once, stacked in one cell."""
+    global menu_frame, question_frame, results_frame, entry_answer
+
+    root.grid_rowconfigure(0, weight=1)
+    root.grid_columnconfigure(0, weight=1)
+
+    # Menu screen
+    menu_frame = tk.Frame(root)
+    tk.Label(menu_frame, text="SELECT DIFFICULTY LEVEL", font=("Arial", 16, "bold")).pack(pady=10)
+    name_row = tk.Frame(menu_frame)
+    tk.Label(name_row, text="Player:").pack(side="left")
+    tk.Entry(name_row, textvariable=player_name, width=16).pack(side="left", padx=5)
+    name_row.pack(pady=5)
+    tk.Checkbutton(menu_frame, text="Adaptive difficulty", variable=adaptive).pack()
+    for i, name in enumerate(PROFILES, 1):
+        tk.Button(menu_frame, text=f"{i}. {name}", width=20,
+                  command=lambda name=name: start_quiz(name)).pack(pady=5)
+
+    # Question screen
+    question_frame = tk.Frame(root)
+    tk.Label(question_frame, textvariable=question_text, font=("Arial", 14)).pack(pady=10)
+    entry_answer = tk.Entry(question_frame, font=("Arial", 12))
+    entry_answer.pack(pady=5)
+    entry_answer.bind("<Return>", lambda event: check_answer())
+    tk.Button(question_frame, text="Submit", command=check_answer).pack(pady=10)
+
+    # Results screen
+    results_frame = tk.Frame(root)
+    tk.Label(results_frame, textvariable=score_text, font=("Arial", 16)).pack(pady=10)
+    tk.Label(results_frame, textvariable=grade_text, font=("Arial", 14, "bold")).pack(pady=5)
+    tk.Label(results_frame, text="Top scores", font=("Arial", 11, "underline")).pack()
+    tk.Label(results_frame, textvariable=board_text, font=("Arial", 10), justify="left").pack()
+    tk.Button(results_frame, text="Play Again", command=displayMenu).pack(pady=10)
+    tk.Button(results_frame, text="Exit", command=root.destroy).pack(pady=5)
+
+    for frame in (menu_frame, question_frame, results_frame):
+        frame.grid(row=0, column=0, sticky="nsew")
 
 # -----------------------
 # Tkinter GUI Setup
 # -----------------------
-root = tk.Tk()
-root.title("Arithmetic Quiz Game")
-root.geometry("400x300")
+def main():
+    """Create the window and screens; importing this module builds nothing."""
+    global root, question_text, score_text, grade_text, board_text, player_name, adaptive
+
+    root = tk.Tk()
+    root.title("Arithmetic Quiz Game")
+    root.geometry("400x470")
+    startup_paint(root)
+
+    question_text = tk.StringVar()
+    score_text = tk.StringVar()
+    grade_text = tk.StringVar()
+    board_text = tk.StringVar()
+    player_name = tk.StringVar(value=getpass.getuser())
+    adaptive = tk.BooleanVar(value=False)
 
-question_text = tk.StringVar()
-entry_answer = tk.Entry(root, font=("Arial", 12))
+    build_screens()
+    sample_event_loop(root)
+    displayMenu()
+    startup_ready(root)
 
-displayMenu()
+    root.mainloop()
 
-root.mainloop()
+if __name__ == "__main__":
+    main()
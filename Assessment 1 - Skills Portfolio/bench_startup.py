@@ -0,0 +1,134 @@
+"""
+Benchmark how fast the three apps start.
+
+    python bench_startup.py [--apps quiz,jokes,students] [--runs 5] [--warmup 1]
+                            [--students 100000] [--jokes 100000] [--out startup_results.json]
+
+Each app is launched as a fresh process in a scratch directory with
+PORTFOLIO_STARTUP set (see instrument.py). It reports two wall-clock
+times, measured from the moment the process was started:
+
+    first paint    the window has been mapped and drawn
+    interactive    its data is loaded and the controls are enabled
+
+and then quits. Warmup runs are discarded so the joke cache and search
+index already exist. --students and --jokes swap in synthetic files of
+that size; by default the repository's own data files are copied.
+Needs a display (on a headless machine, run it under xvfb-run).
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from student_datagen import generate_roster
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+APPS = {
+    "quiz": "arithmetic_quiz_gui.py",
+    "jokes": "import tkinter as tk.2.py",
+    "students": "student_manager.py",
+}
+DATA_FILES = ("studentMarks.txt", "randomJokes.txt")
+TIMEOUT = 120  # seconds before a run is abandoned
+
+
+def generate_jokes(path, count):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            f.write(f"Why did joke {i} cross the road? To get to punchline {i * 7919 % count}.\n")
+
+
+def prepare(workdir, students=0, jokes=0):
+    for name in DATA_FILES:
+        src = os.path.join(HERE, name)
+        if os.path.exists(src):
+            shutil.copy(src, workdir)
+    if students:
+        generate_roster(os.path.join(workdir, "studentMarks.txt"), students)
+    if jokes:
+        generate_jokes(os.path.join(workdir, "randomJokes.txt"), jokes)
+
+
+def launch(app, workdir, timeout=TIMEOUT):
+    """Start one app and return its {"first_paint", "interactive"} in seconds."""
+    marks = os.path.join(workdir, "startup.jsonl")
+    if os.path.exists(marks):
+        os.remove(marks)
+    env = dict(os.environ, PORTFOLIO_STARTUP=marks)
+    started = time.time()
+    proc = subprocess.run([sys.executable, os.path.join(HERE, APPS[app])], cwd=workdir, env=env,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=timeout)
+    try:
+        with open(marks) as f:
+            line = f.readlines()[-1]
+    except (OSError, IndexError):
+        raise RuntimeError(f"{app} reported no startup times (exit code {proc.returncode}):\n"
+                           f"{proc.stderr.decode(errors='replace').strip()}") from None
+    data = json.loads(line)
+    return {k: data[k] - started for k in ("first_paint", "interactive")}
+
+
+def run(apps, runs=5, warmup=1, students=0, jokes=0):
+    workdir = tempfile.mkdtemp(prefix="startup_bench_")
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "students": students or "repository file",
+        "jokes": jokes or "repository file",
+        "apps": {}
+    }
+    try:
+        prepare(workdir, students, jokes)
+        print(f"{'app':<10}{'first paint ms':>16}{'interactive ms':>16}   (median of {runs}, min)")
+        for app in apps:
+            for _ in range(warmup):
+                launch(app, workdir)
+            samples = [launch(app, workdir) for _ in range(runs)]
+            row = {}
+            for key in ("first_paint", "interactive"):
+                values = [s[key] * 1000 for s in samples]
+                row[key] = {"median_ms": round(statistics.median(values), 1),
+                            "min_ms": round(min(values), 1),
+                            "runs_ms": [round(v, 1) for v in values]}
+            results["apps"][app] = row
+            print(f"{app:<10}"
+                  f"{row['first_paint']['median_ms']:>9.1f} ({row['first_paint']['min_ms']:.0f})"
+                  f"{row['interactive']['median_ms']:>9.1f} ({row['interactive']['min_ms']:.0f})")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark app startup (first paint, interactive).")
+    parser.add_argument("--apps", default=",".join(APPS),
+                        help="comma-separated apps (default: %(default)s)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--students", type=int, default=0, help="synthetic roster size")
+    parser.add_argument("--jokes", type=int, default=0, help="synthetic joke file size")
+    parser.add_argument("--out", default="startup_results.json")
+    args = parser.parse_args(argv)
+
+    apps = [a.strip() for a in args.apps.split(",") if a.strip()]
+    unknown = [a for a in apps if a not in APPS]
+    if unknown:
+        parser.error(f"unknown app(s): {', '.join(unknown)} (choose from {', '.join(APPS)})")
+    try:
+        results = run(apps, args.runs, args.warmup, args.students, args.jokes)
+    except (RuntimeError, subprocess.TimeoutExpired) as e:
+        sys.exit(str(e))
+    with open(args.out, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
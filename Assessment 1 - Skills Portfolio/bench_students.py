@@ -0,0 +1,191 @@
+"""
+Benchmark the student records core on synthetic rosters.
+
+    python bench_students.py [--sizes 1000,100000,1000000] [--out bench_results.json]
+                             [--no-memory] [--repeat 3]
+
+Each operation is timed (best of --repeat) and, unless --no-memory is
+given, run once more under tracemalloc to record its peak allocation.
+Results are printed as a table and written as JSON for comparison
+between runs.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from student_core import load_students, percentage, save_students
+from student_datagen import generate_roster
+from student_io import iter_students, summarize
+from student_journal import RosterJournal
+from student_stats import RosterStats
+
+LOOKUPS = 10000
+REPORT_PAGE = 200  # rows VirtualTable formats per page
+
+
+def format_row(s, p, g):
+    return f"{s.name:<28}{s.code:>8}{s.coursework:>6} / 60{s.exam:>6} / 100{p:>9}%  {g}"
+
+
+# ---------------------------------------------------------
+#   OPERATIONS
+# ---------------------------------------------------------
+#   Each entry maps a name to a function of the shared context dict.
+
+def op_load(ctx):
+    errors = []
+    ctx["store"] = load_students(ctx["path"], errors)
+    ctx["errors"] = len(errors)
+
+
+def op_stream_summary(ctx):
+    summarize(iter_students(ctx["path"]))
+
+
+def op_stats(ctx):
+    RosterStats(ctx["store"]).summary()
+
+
+def op_lookup(ctx):
+    store, codes = ctx["store"], ctx["codes"]
+    for code in codes:
+        store.get(code)
+
+
+def op_rank(ctx):
+    store, codes = ctx["store"], ctx["codes"]
+    for code in codes:
+        store.rank(code)
+
+
+def op_top_k(ctx):
+    store = ctx["store"]
+    for _ in range(1000):
+        store.top(10)
+
+
+def op_sort_index(ctx):
+    ctx["store"].top()
+
+
+def op_sort_full(ctx):
+    sorted(ctx["store"], key=percentage, reverse=True)
+
+
+def op_report_page(ctx):
+    stats = RosterStats(ctx["store"])
+    stats.refresh()
+    for i in range(min(REPORT_PAGE, len(stats.records))):
+        format_row(stats.records[i], stats.percentages[i], stats.grades[i])
+
+
+def op_report_full(ctx):
+    stats = RosterStats(ctx["store"])
+    "\n".join(format_row(s, p, g) for s, p, g in stats.rows())
+
+
+def op_save(ctx):
+    save_students(ctx["store"], ctx["save_path"])
+
+
+def op_journal_append(ctx):
+    journal = RosterJournal(ctx["save_path"], compact_at=float("inf"))
+    for s in ctx["store"].top(100):
+        journal.record_put(s)
+    os.remove(journal.path)
+
+
+OPERATIONS = [
+    ("load", op_load),
+    ("stream_summary", op_stream_summary),
+    ("stats", op_stats),
+    ("lookup_10k", op_lookup),
+    ("rank_10k", op_rank),
+    ("top10_x1000", op_top_k),
+    ("sort_index", op_sort_index),
+    ("sort_full", op_sort_full),
+    ("report_page", op_report_page),
+    ("report_full", op_report_full),
+    ("save", op_save),
+    ("journal_append_100", op_journal_append),
+]
+
+
+# ---------------------------------------------------------
+#   RUNNER
+# ---------------------------------------------------------
+
+def measure(fn, ctx, repeat, memory):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(ctx)
+        best = min(best, time.perf_counter() - start)
+
+    result = {"seconds": round(best, 6)}
+    if memory:
+        tracemalloc.start()
+        fn(ctx)
+        result["peak_kb"] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+        tracemalloc.stop()
+    return result
+
+
+def run(sizes, repeat=3, memory=True, malformed=0.001):
+    workdir = tempfile.mkdtemp(prefix="student_bench_")
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "sizes": {}
+    }
+    try:
+        for n in sizes:
+            path = os.path.join(workdir, f"roster_{n}.txt")
+            gen_start = time.perf_counter()
+            generate_roster(path, n, malformed)
+            ctx = {
+                "path": path,
+                "save_path": os.path.join(workdir, f"saved_{n}.txt"),
+            }
+            rng = random.Random(n)
+            ctx["codes"] = [1000 + rng.randrange(n) for _ in range(LOOKUPS)]
+
+            row = {"generate": {"seconds": round(time.perf_counter() - gen_start, 6)},
+                   "file_kb": round(os.path.getsize(path) / 1024, 1)}
+            print(f"\n{n:,} students ({row['file_kb']:,} KB)")
+            for name, fn in OPERATIONS:
+                row[name] = measure(fn, ctx, repeat, memory)
+                peak = f"{row[name]['peak_kb']:>12,.1f} KB" if memory else ""
+                print(f"  {name:<20}{row[name]['seconds'] * 1000:>12.2f} ms{peak}")
+            row["malformed_lines"] = ctx["errors"]
+            results["sizes"][str(n)] = row
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark student_manager workloads.")
+    parser.add_argument("--sizes", default="1000,100000,1000000",
+                        help="comma-separated roster sizes (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--malformed", type=float, default=0.001)
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc runs")
+    parser.add_argument("--out", default="bench_results.json")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    results = run(sizes, args.repeat, not args.no_memory, args.malformed)
+    with open(args.out, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
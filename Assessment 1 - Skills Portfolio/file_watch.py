@@ -0,0 +1,111 @@
+import os
+import time
+from contextlib import contextmanager
+
+# fcntl (POSIX) or msvcrt (Windows) provide advisory locks — import safely
+try:
+    import fcntl
+    _HAS_FCNTL = True
+except Exception:
+    _HAS_FCNTL = False
+
+try:
+    import msvcrt
+    _HAS_MSVCRT = True
+except Exception:
+    _HAS_MSVCRT = False
+
+# ---------------------------------------------------------
+#   FILE SIGNATURES, WATCHING AND LOCKING
+# ---------------------------------------------------------
+#   A file counts as changed when its inode, size or mtime changes,
+#   which costs one stat() per poll. Writers hold an exclusive lock on
+#   "<file>.lock" and readers a shared one, so two running instances
+#   never interleave a write with a read or another write.
+
+POLL_MS = 1000
+
+
+def signature(path):
+    """(inode, size, mtime_ns) of path, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_size, st.st_mtime_ns
+
+
+@contextmanager
+def file_lock(path, shared=False):
+    """
+    Hold an advisory lock for path while the block runs. Shared locks
+    allow other readers; exclusive ones wait for everyone. On Windows
+    every lock is exclusive, and where neither API exists it is a no-op.
+    """
+    with open(path + ".lock", "a+b") as f:
+        if _HAS_FCNTL:
+            fcntl.flock(f.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        elif _HAS_MSVCRT:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.05)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            yield
+
+
+class FileWatcher:
+    """
+    Polls watched files from the Tk loop and calls callback(path) when
+    one changes. A callback that returns False is retried on the next
+    poll (for example while the app still has writes queued).
+    """
+
+    def __init__(self, root, interval_ms=POLL_MS):
+        self.root = root
+        self.interval_ms = interval_ms
+        self._watched = {}  # path -> [signature, callback]
+        self._after_id = None
+
+    def watch(self, path, callback):
+        self._watched[path] = [signature(path), callback]
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval_ms, self._poll)
+
+    def accept(self, path):
+        """Take the file's current state as seen (after our own write)."""
+        if path in self._watched:
+            self._watched[path][0] = signature(path)
+
+    def recheck(self, path):
+        """Call back for path on the next poll even if it does not change again."""
+        if path in self._watched:
+            self._watched[path][0] = None
+
+    def stop(self):
+        if self._after_id is not None:
+            from tkinter import TclError
+            try:
+                self.root.after_cancel(self._after_id)
+            except TclError:
+                pass  # the window is already destroyed, and its timers with it
+            self._after_id = None
+
+    def _poll(self):
+        for path, entry in list(self._watched.items()):
+            current = signature(path)
+            if current != entry[0] and entry[1](path) is not False:
+                entry[0] = current
+        self._after_id = self.root.after(self.interval_ms, self._poll)
@@ -1,65 +1,52 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import random
 import time
 
-# winsound is Windows-only — import safely
-try:
-    import winsound
-    _HAS_WINSOUND = True
-except Exception:
-    _HAS_WINSOUND = False
+from instrument import count, sample_event_loop, startup_paint, startup_ready, timed
+from file_watch import FileWatcher
+from joke_corpus import JokeCorpus
+from joke_history import JokeHistory
+from joke_sampler import JokeSampler
+from joke_search import SearchIndex
+from joke_views import FrameClock, HistoryView, Typewriter
+from task_runner import TaskRunner
+
+
+def _winsound():
+    """winsound is Windows-only — imported safely, on the first laugh."""
+    try:
+        import winsound
+        return winsound
+    except Exception:
+        return None
+
 
 # --------------------- Load Jokes (robust) --------------------- #
-def load_jokes(filename="randomJokes.txt"):
+JOKES_FILE = "randomJokes.txt"
+SEARCH_DELAY_MS = 40  # pause in typing before the search runs
+SEARCH_RESULTS = 50
+
+FALLBACK_JOKES = [
+    ("Why don't scientists trust atoms?", "Because they make up everything."),
+    ("Why did the scarecrow win an award?", "Because he was outstanding in his field."),
+    ("What do you call fake spaghetti?", "An impasta."),
+]
+
+
+@timed("jokes.load")
+def load_jokes(filename=JOKES_FILE):
     """
-    Accepts lines like:
-      Setup?Punchline
-      Setup? Punchline
-      Setup|Punchline
-      Setup::Punchline
-    Falls back to a small built-in list if file not found or malformed.
+    Open the compiled corpus for filename (see joke_corpus for the
+    accepted line formats). The binary cache is rebuilt only when the
+    text file has changed, so startup does not parse anything.
+    Raises if the file is missing or has no valid jokes; runs on a
+    worker thread, so it must not touch Tk.
     """
-    jokes = []
-    try:
-        with open(filename, "r", encoding="utf-8") as f:
-            for raw in f:
-                line = raw.strip()
-                if not line:
-                    continue
-                # Prefer splitting on the first question mark (common)
-                if "?" in line:
-                    parts = line.split("?", 1)
-                    setup = parts[0].strip() + "?"
-                    punch = parts[1].strip()
-                    if punch:
-                        jokes.append((setup, punch))
-                        continue
-                # try other separators
-                for sep in ["|", "::", " - ", " — ", "\t"]:
-                    if sep in line:
-                        parts = line.split(sep, 1)
-                        setup = parts[0].strip()
-                        punch = parts[1].strip()
-                        jokes.append((setup, punch))
-                        break
-                else:
-                    # if no separator found, skip — it's malformed
-                    continue
-        if not jokes:
-            raise ValueError("No valid jokes found in file.")
-        return jokes
-    except FileNotFoundError:
-        messagebox.showwarning("Warning", f"{filename} not found — using built-in jokes.")
-    except Exception as e:
-        # show a quick warning and then continue with the built-in jokes
-        messagebox.showwarning("Warning", f"Couldn't parse {filename}. Using built-in jokes.")
-    # fallback jokes (always valid)
-    return [
-        ("Why don't scientists trust atoms?", "Because they make up everything."),
-        ("Why did the scarecrow win an award?", "Because he was outstanding in his field."),
-        ("What do you call fake spaghetti?", "An impasta."),
-    ]
+    corpus = JokeCorpus(filename)
+    if not len(corpus):
+        corpus.close()
+        raise ValueError("No valid jokes found in file.")
+    return corpus
 
 
 # --------------------- Joke App --------------------- #
@@ -67,13 +54,26 @@ class JokeAssistant:
     def __init__(self, root):
         self.root = root
         self.root.title("Advanced Joke Assistant 😂")
-        self.root.geometry("700x500")
+        self.root.geometry("700x720")
         self.root.configure(bg="#1e272e")
-
-        self.jokes = load_jokes()
+        # Closing the window ends mainloop like Quit, so close() runs before the window goes away
+        self.root.protocol("WM_DELETE_WINDOW", root.quit)
+        startup_paint(root)
+
+        # Jokes are opened in the background once the window is up.
+        self.jokes = None
+        self.sampler = None
+        self.current_index = None
         self.current_joke = None
         self.dark_mode = True
-        self._anim_after_id = None  # to cancel animation if needed
+        self.history = JokeHistory(path=JOKES_FILE + ".history")
+        self.clock = FrameClock(root)  # drives the setup and punchline animations
+        self.index = None  # SearchIndex, loaded or built in the background
+        self.search_hits = []
+        self._search_after_id = None
+        self.runner = TaskRunner(root, workers=1)
+        self.watcher = FileWatcher(root)
+        self._reloading = False
 
         # ---------------- UI Layout ---------------- #
         title = tk.Label(root, text="🤣 Joke Assistant 2.0 🤣",
@@ -101,14 +101,22 @@ class JokeAssistant:
 
         btn_style = {"font": ("Arial", 13), "width": 18, "relief": "ridge"}
 
-        tk.Button(btn_frame, text="Alexa, Tell Me a Joke",
-                  command=self.show_joke, bg="#0fbcf9", fg="black", **btn_style).grid(row=0, column=0, padx=5, pady=5)
+        # Buttons that need the jokes stay disabled until they are loaded
+        self.joke_buttons = []
+        btn = tk.Button(btn_frame, text="Alexa, Tell Me a Joke", state="disabled",
+                        command=self.show_joke, bg="#0fbcf9", fg="black", **btn_style)
+        btn.grid(row=0, column=0, padx=5, pady=5)
+        self.joke_buttons.append(btn)
 
-        tk.Button(btn_frame, text="Show Punchline",
-                  command=self.show_punchline, bg="#05c46b", fg="black", **btn_style).grid(row=0, column=1, padx=5, pady=5)
+        btn = tk.Button(btn_frame, text="Show Punchline", state="disabled",
+                        command=self.show_punchline, bg="#05c46b", fg="black", **btn_style)
+        btn.grid(row=0, column=1, padx=5, pady=5)
+        self.joke_buttons.append(btn)
 
-        tk.Button(btn_frame, text="Next Joke",
-                  command=self.show_joke, bg="#ffa801", fg="black", **btn_style).grid(row=1, column=0, padx=5, pady=5)
+        btn = tk.Button(btn_frame, text="Next Joke", state="disabled",
+                        command=self.show_joke, bg="#ffa801", fg="black", **btn_style)
+        btn.grid(row=1, column=0, padx=5, pady=5)
+        self.joke_buttons.append(btn)
 
         tk.Button(btn_frame, text="Laugh Sound",
                   command=self.play_laugh, bg="#ff5e57", fg="black", **btn_style).grid(row=1, column=1, padx=5, pady=5)
@@ -119,14 +127,84 @@ class JokeAssistant:
         tk.Button(btn_frame, text="Quit",
                   command=root.quit, bg="#ff3f34", fg="white", **btn_style).grid(row=2, column=1, padx=5, pady=5)
 
+        btn = tk.Button(btn_frame, text="👍 Funny", state="disabled",
+                        command=lambda: self.rate_joke(True), bg="#d2dae2", fg="black", **btn_style)
+        btn.grid(row=3, column=0, padx=5, pady=5)
+        self.joke_buttons.append(btn)
+
+        btn = tk.Button(btn_frame, text="👎 Not Funny", state="disabled",
+                        command=lambda: self.rate_joke(False), bg="#d2dae2", fg="black", **btn_style)
+        btn.grid(row=3, column=1, padx=5, pady=5)
+        self.joke_buttons.append(btn)
+
+        self.mode_button = tk.Button(btn_frame, text="Order: No Repeats", state="disabled",
+                                     command=self.toggle_sampling, bg="#d2dae2", fg="black", **btn_style)
+        self.mode_button.grid(row=4, column=0, columnspan=2, padx=5, pady=5)
+        self.joke_buttons.append(self.mode_button)
+
         # ---------------- Joke History Section ---------------- #
         history_frame = tk.LabelFrame(root, text="Joke History", font=("Arial", 14),
                                       bg="#1e272e", fg="white")
         history_frame.pack(fill="both", padx=20, pady=10, ipadx=10)
 
-        self.history_list = tk.Listbox(history_frame, height=7, font=("Arial", 12),
-                                       bg="#2f3542", fg="#dcdde1")
-        self.history_list.pack(fill="both", padx=10, pady=10)
+        self.history_view = HistoryView(history_frame, self.history, height=7,
+                                        font=("Arial", 12), bg="#2f3542", fg="#dcdde1")
+        self.history_view.pack(fill="both", padx=10, pady=10)
+
+        # ---------------- Search Section ---------------- #
+        search_frame = tk.LabelFrame(root, text="Search Jokes", font=("Arial", 14),
+                                     bg="#1e272e", fg="white")
+        search_frame.pack(fill="x", padx=20, pady=(0, 10), ipadx=10)
+
+        self.search_var = tk.StringVar()
+        self.search_entry = tk.Entry(search_frame, textvariable=self.search_var,
+                                     font=("Arial", 12), state="disabled")
+        self.search_entry.pack(fill="x", padx=10, pady=(10, 0))
+        self.search_status = tk.Label(search_frame, text="Indexing jokes…", font=("Arial", 10),
+                                      bg="#1e272e", fg="#d2dae2", anchor="w")
+        self.search_status.pack(fill="x", padx=10)
+        self.search_results = tk.Listbox(search_frame, height=4, font=("Arial", 12),
+                                         bg="#2f3542", fg="#dcdde1", activestyle="none")
+        self.search_results.pack(fill="x", padx=10, pady=(0, 10))
+
+        self.search_var.trace_add("write", lambda *_: self.schedule_search())
+        self.search_entry.bind("<Return>", lambda e: self.show_search_result(0))
+        self.search_results.bind("<Double-Button-1>", lambda e: self.show_search_result())
+        self.search_results.bind("<Return>", lambda e: self.show_search_result())
+
+        self.setup_label.config(text="Loading jokes…")
+        self.runner.submit("Loading jokes", lambda task: self.open_jokes(load_jokes()),
+                           on_done=self.jokes_loaded, on_error=self.jokes_failed)
+
+    # ------------------- Startup ------------------- #
+    @staticmethod
+    def open_jokes(jokes):
+        """Jokes plus their sampler; ratings and the shuffle position persist only for the real corpus."""
+        state = JOKES_FILE + ".sampler.json" if isinstance(jokes, JokeCorpus) else None
+        return jokes, JokeSampler(jokes, state)
+
+    def jokes_loaded(self, result):
+        self.jokes, self.sampler = result
+        self._update_mode_button()
+        self._enable_jokes(True)
+        self.setup_label.config(text="")
+        self.runner.submit("Indexing jokes", lambda task: SearchIndex.for_corpus(self.jokes, task),
+                           on_done=self.search_ready, on_error=self.search_failed)
+        if isinstance(self.jokes, JokeCorpus):
+            self.watcher.watch(JOKES_FILE, self.on_jokes_changed)
+        startup_ready(self.root)
+
+    def _enable_jokes(self, enabled):
+        for btn in self.joke_buttons:
+            btn.config(state="normal" if enabled else "disabled")
+
+    def jokes_failed(self, exc):
+        """Fall back to the built-in jokes (always valid) with a quick warning."""
+        if isinstance(exc, FileNotFoundError):
+            messagebox.showwarning("Warning", f"{JOKES_FILE} not found — using built-in jokes.")
+        else:
+            messagebox.showwarning("Warning", f"Couldn't parse {JOKES_FILE}. Using built-in jokes.")
+        self.jokes_loaded(self.open_jokes(list(FALLBACK_JOKES)))
 
     # ------------------- Core Functions ------------------- #
     def show_joke(self):
@@ -135,25 +213,23 @@ class JokeAssistant:
             messagebox.showinfo("Info", "No jokes available.")
             return
 
-        # Cancel any running animation
-        if self._anim_after_id:
-            try:
-                self.root.after_cancel(self._anim_after_id)
-            except Exception:
-                pass
-            self._anim_after_id = None
+        self.present(self.sampler.next())
 
-        self.current_joke = random.choice(self.jokes)
+    def present(self, index):
+        """Show joke number index: animate its setup and add it to the history."""
+        self.current_index = index
+        self.current_joke = self.jokes[index]
+        count("jokes.shown")
         setup, _ = self.current_joke
 
-        self.setup_label.config(text="")
+        # A new setup replaces the old one; any punchline animation stops
+        self.clock.stop("punchline")
         self.punchline_label.config(text="")
-
-        # Start typewriter animation for setup
-        self._typewriter(self.setup_label, setup, 0)
+        self.clock.start("setup", Typewriter(self.setup_label, setup))
 
         # Put the setup into history right away (so user sees history even if they don't press punchline)
-        self.history_list.insert(tk.END, setup)
+        self.history.add(setup)
+        self.history_view.refresh()
 
     def show_punchline(self):
         """Reveal the current punchline with animation. If no joke chosen, prompt user."""
@@ -163,32 +239,146 @@ class JokeAssistant:
 
         _, punchline = self.current_joke
 
-        # Cancel any running animation on punchline
-        if self._anim_after_id:
-            try:
-                self.root.after_cancel(self._anim_after_id)
-            except Exception:
-                pass
-            self._anim_after_id = None
-
-        self._typewriter(self.punchline_label, punchline, 0)
-
-    # ------------------- Animation (safe) ------------------- #
-    def _typewriter(self, label, text, index, delay=30):
-        """Update label one character at a time using after() (safe for Tkinter)."""
-        # Convert delay to milliseconds if user passed seconds by mistake
-        ms = delay if isinstance(delay, int) else int(delay * 1000)
-        label.config(text=text[:index])
-        if index < len(text):
-            # Schedule next character
-            self._anim_after_id = self.root.after(ms, lambda: self._typewriter(label, text, index + 1, delay))
+        # Restarts only the punchline; a setup still typing keeps going
+        self.clock.start("punchline", Typewriter(self.punchline_label, punchline))
+
+    # ------------------- Search ------------------- #
+    def search_ready(self, index):
+        self.index = index
+        self.search_entry.config(state="normal")
+        self.search_status.config(text=f"Type to search {len(self.jokes):,} jokes")
+        if self.search_var.get():
+            self.run_search()
+
+    def search_failed(self, exc):
+        self.search_status.config(text=f"Search unavailable: {exc}")
+
+    def schedule_search(self):
+        """Debounce keystrokes so a burst of typing runs one search."""
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(SEARCH_DELAY_MS, self.run_search)
+
+    def run_search(self):
+        self._search_after_id = None
+        if self.index is None:
+            return
+        query = self.search_var.get()
+        start = time.perf_counter()
+        self.search_hits = self.index.search(query, SEARCH_RESULTS) if query.strip() else []
+        elapsed = (time.perf_counter() - start) * 1000
+
+        self.search_results.delete(0, tk.END)
+        for i in self.search_hits:
+            self.search_results.insert(tk.END, self.jokes[i][0])
+        if query.strip():
+            found = len(self.search_hits)
+            more = "+" if found == SEARCH_RESULTS else ""
+            self.search_status.config(text=f"{found}{more} matches in {elapsed:.1f} ms")
         else:
-            self._anim_after_id = None
+            self.search_status.config(text=f"Type to search {len(self.jokes):,} jokes")
+
+    def show_search_result(self, row=None):
+        """Present the selected match (or the given row) as the current joke."""
+        if row is None:
+            selection = self.search_results.curselection()
+            if not selection:
+                return
+            row = selection[0]
+        if row < len(self.search_hits):
+            self.present(self.search_hits[row])
+
+    # ------------------- Hot Reload ------------------- #
+    def on_jokes_changed(self, path):
+        """The joke file was edited: recompile and reindex it off the UI thread."""
+        if self._reloading:
+            return False  # picked up again once the current reload is done
+        self._reloading = True
+        self.search_status.config(text="Jokes changed — reloading…")
+
+        # The cache is rebuilt in place and Windows cannot replace a file that
+        # is still mapped, so the old corpus is closed first; the controls that
+        # read it stay disabled until the new one is in.
+        self._enable_jokes(False)
+        self.search_entry.config(state="disabled")
+        self.index = None
+        self.search_hits = []
+        self.search_results.delete(0, tk.END)
+        try:
+            self.sampler.save()
+        except OSError:
+            pass
+        if isinstance(self.jokes, JokeCorpus):
+            self.jokes.close()
+
+        def reopen(task):
+            # Matching saved ratings to the new corpus reads every joke, so it happens here too.
+            corpus = load_jokes(path)
+            try:
+                return (*self.open_jokes(corpus), SearchIndex.for_corpus(corpus, task))
+            except BaseException:
+                corpus.close()
+                raise
+
+        self.runner.submit("Reloading jokes", reopen,
+                           on_done=self.jokes_reloaded, on_error=self.reload_failed)
+
+    def jokes_reloaded(self, result):
+        """Swap in the new corpus; ratings carry over because they are keyed by setup."""
+        corpus, sampler, index = result
+        self._reloading = False
+        self.jokes = corpus
+        sampler.mode = self.sampler.mode  # the built-in jokes' sampler never saved it
+        self.sampler = sampler
+        if self.current_index is not None and (self.current_index >= len(corpus)
+                                               or corpus[self.current_index] != self.current_joke):
+            self.current_index = None  # the joke on screen moved or is gone; it can't be rated now
+        self._enable_jokes(True)
+        self.search_ready(index)
+
+    def reload_failed(self, exc):
+        """The old corpus is already closed, so fall back to the built-in jokes."""
+        self._reloading = False
+        self.current_index = None
+        self.jokes_failed(exc)
+
+    # ------------------- Ratings & Sampling ------------------- #
+    def rate_joke(self, funny):
+        """Rate the current joke; ratings weight the draws in weighted mode."""
+        if self.current_index is None:
+            messagebox.showinfo("Info", "Ask for a joke first!")
+            return
+        try:
+            self.sampler.rate(self.current_index, funny)
+        except OSError as e:
+            messagebox.showwarning("Warning", f"Couldn't save rating: {e}")
+
+    def toggle_sampling(self):
+        """Switch between no-repeat shuffle and rating-weighted picks."""
+        self.sampler.mode = "weighted" if self.sampler.mode == "shuffle" else "shuffle"
+        self._update_mode_button()
+
+    def _update_mode_button(self):
+        label = "Order: No Repeats" if self.sampler.mode == "shuffle" else "Order: By Rating"
+        self.mode_button.config(text=label)
+
+    def close(self):
+        """Persist the shuffle position, mode, ratings and unsaved history, then destroy the window."""
+        try:
+            if self.sampler is not None:
+                self.sampler.save()
+            self.history.flush()
+        except OSError:
+            pass
+        self.watcher.stop()
+        self.runner.shutdown(wait=False)
+        self.root.destroy()
 
     # ------------------- Extra Features ------------------- #
     def play_laugh(self):
         """Play laugh beep on Windows; otherwise show playful message."""
-        if _HAS_WINSOUND:
+        winsound = _winsound()
+        if winsound is not None:
             # quick beep sequence
             try:
                 for _ in range(3):
@@ -220,4 +410,6 @@ class JokeAssistant:
 if __name__ == "__main__":
     root = tk.Tk()
     app = JokeAssistant(root)
+    sample_event_loop(root)
     root.mainloop()
+    app.close()
@@ -0,0 +1,221 @@
+"""
+Opt-in timing and counters for the portfolio apps.
+
+Set PORTFOLIO_PROFILE before starting an app to switch it on:
+
+    PORTFOLIO_PROFILE=1            print a summary to the console on exit
+    PORTFOLIO_PROFILE=out.json     write the summary as JSON on exit
+
+When the variable is unset, timed() hands back the original function,
+span() returns a shared do-nothing context manager and count() does
+nothing, so instrumented code runs at full speed.
+
+PORTFOLIO_STARTUP=<file> is set by bench_startup.py instead: the app
+appends one JSON line with its first-paint and interactive times to
+the file and quits as soon as it is interactive.
+"""
+import atexit
+import functools
+import json
+import os
+import sys
+import time
+from contextlib import nullcontext
+
+_TARGET = os.environ.get("PORTFOLIO_PROFILE", "").strip()
+ENABLED = _TARGET not in ("", "0")
+_STARTUP = os.environ.get("PORTFOLIO_STARTUP", "").strip()
+
+# Durations go into power-of-two microsecond buckets: bucket b holds
+# times in [2^(b-1), 2^b) us, which keeps memory fixed however long
+# an app runs.
+_histograms = {}
+_counters = {}
+
+
+class _Histogram:
+    __slots__ = ("count", "total", "low", "high", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.low = float("inf")
+        self.high = 0.0
+        self.buckets = {}
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.low = min(self.low, seconds)
+        self.high = max(self.high, seconds)
+        b = int(seconds * 1_000_000).bit_length()
+        self.buckets[b] = self.buckets.get(b, 0) + 1
+
+    def percentile(self, q):
+        """Upper bound (ms) of the bucket holding the q-th percentile."""
+        target = self.count * q / 100
+        seen = 0
+        for b in sorted(self.buckets):
+            seen += self.buckets[b]
+            if seen >= target:
+                return (2 ** b) / 1000
+        return self.high * 1000
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total / self.count * 1000, 3),
+            "min_ms": round(self.low * 1000, 3),
+            "max_ms": round(self.high * 1000, 3),
+            "p50_ms<=": self.percentile(50),
+            "p95_ms<=": self.percentile(95),
+            "p99_ms<=": self.percentile(99),
+            "buckets_us": {f"<{2 ** b}": n for b, n in sorted(self.buckets.items())}
+        }
+
+
+def record(name, seconds):
+    """Add one duration sample to the named histogram."""
+    h = _histograms.get(name)
+    if h is None:
+        h = _histograms[name] = _Histogram()
+    h.add(seconds)
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+# ---------------------------------------------------------
+#   PUBLIC HELPERS
+# ---------------------------------------------------------
+
+if ENABLED:
+    def timed(name):
+        """Decorator that records each call's duration under name."""
+        def wrap(fn):
+            @functools.wraps(fn)
+            def timed_call(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    record(name, time.perf_counter() - start)
+            return timed_call
+        return wrap
+
+    def span(name):
+        """Context manager that records the duration of its block."""
+        return _Span(name)
+
+    def count(name, n=1):
+        _counters[name] = _counters.get(name, 0) + n
+else:
+    _NULL = nullcontext()
+
+    def timed(name):
+        return lambda fn: fn
+
+    def span(name):
+        return _NULL
+
+    def count(name, n=1):
+        pass
+
+
+def sample_event_loop(root, interval_ms=100, name="tk.loop_lag"):
+    """
+    Measure Tk event-loop responsiveness: an after() callback is
+    scheduled every interval_ms and how late it fires is recorded.
+    """
+    if not ENABLED:
+        return
+
+    def tick(expected):
+        now = time.perf_counter()
+        record(name, max(0.0, now - expected))
+        root.after(interval_ms, tick, time.perf_counter() + interval_ms / 1000)
+
+    root.after(interval_ms, tick, time.perf_counter() + interval_ms / 1000)
+
+
+# ---------------------------------------------------------
+#   STARTUP TIMING
+# ---------------------------------------------------------
+#   Times are wall-clock (time.time()) so the benchmark can subtract
+#   the moment it launched the process, interpreter startup included.
+
+_startup = {}
+
+
+def startup_paint(root):
+    """Note when root is first drawn; call right after creating the window."""
+    if not _STARTUP:
+        return
+
+    def mapped(event):
+        if event.widget is root and "first_paint" not in _startup:
+            # Idle callbacks run after Tk's pending redraws.
+            root.after_idle(_startup_mark, root, "first_paint")
+
+    root.bind("<Map>", mapped, add="+")
+
+
+def startup_ready(root):
+    """Note that the app now responds to input (data loaded, controls enabled)."""
+    if _STARTUP:
+        root.after_idle(_startup_mark, root, "interactive")
+
+
+def _startup_mark(root, name):
+    if name in _startup:
+        return
+    _startup[name] = time.time()
+    if len(_startup) < 2:
+        return
+    # An app cannot be used before it is visible.
+    _startup["interactive"] = max(_startup["interactive"], _startup["first_paint"])
+    with open(_STARTUP, "a") as f:
+        f.write(json.dumps({"app": os.path.basename(sys.argv[0]), **_startup}) + "\n")
+    root.quit()
+
+
+def report():
+    return {
+        "timings": {k: h.as_dict() for k, h in sorted(_histograms.items())},
+        "counters": dict(sorted(_counters.items()))
+    }
+
+
+def dump():
+    """Write the collected data to PORTFOLIO_PROFILE's file or the console."""
+    if not (_histograms or _counters):
+        return
+    data = report()
+    if _TARGET.lower() in ("1", "true", "yes", "console"):
+        out = sys.stderr
+        print(f"\n{'operation':<28}{'calls':>8}{'mean ms':>10}{'p95 ms<=':>10}{'max ms':>10}", file=out)
+        for name, t in data["timings"].items():
+            print(f"{name:<28}{t['count']:>8}{t['mean_ms']:>10.3f}"
+                  f"{t['p95_ms<=']:>10.3f}{t['max_ms']:>10.3f}", file=out)
+        for name, n in data["counters"].items():
+            print(f"{name:<28}{n:>8}", file=out)
+    else:
+        with open(_TARGET, "w") as f:
+            json.dump(data, f, indent=2)
+
+
+if ENABLED:
+    atexit.register(dump)
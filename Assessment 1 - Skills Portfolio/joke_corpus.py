@@ -0,0 +1,252 @@
+"""
+Compiled, memory-mapped joke corpus.
+
+    python joke_corpus.py [randomJokes.txt] [--rebuild] [--show N]
+
+The text file is parsed once into "<source>.cache":
+
+    header   magic, source mtime_ns, source size, source checksum, joke count, table offset
+    data     "setup\\npunchline" records in UTF-8, back to back
+    table    count + 1 uint64 offsets into data
+
+The header records the source's mtime and size, so editing the text
+file triggers a rebuild on the next open. When the file has only grown
+(the checksum of everything up to the old end still matches), the old
+records are copied over and just the appended lines are parsed.
+Opening a fresh cache only maps the file: any joke is one table lookup
+and one slice, and nothing is parsed or held in memory.
+"""
+import argparse
+import io
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+
+from file_watch import file_lock
+from instrument import timed
+
+MAGIC = b"JOKEIDX3"
+HEADER = struct.Struct("<8sqqI4xQQ")  # magic, mtime_ns, size, source crc, count, table offset
+SEPARATORS = ["|", "::", " - ", " — ", "\t"]  # tried in order after "?"
+FLUSH_EVERY = 1 << 20  # bytes of records buffered before writing
+
+
+def parse_joke(line):
+    """
+    Split one corpus line into (setup, punchline), or None if malformed.
+    Accepts "Setup?Punchline", "Setup? Punchline", "Setup|Punchline",
+    "Setup::Punchline", " - ", " — " and tab separators.
+    """
+    line = line.strip()
+    if not line:
+        return None
+    # Prefer splitting on the first question mark (common)
+    if "?" in line:
+        setup, punch = line.split("?", 1)
+        punch = punch.strip()
+        if punch:
+            return setup.strip() + "?", punch
+    for sep in SEPARATORS:
+        if sep in line:
+            setup, punch = line.split(sep, 1)
+            return setup.strip(), punch.strip()
+    return None
+
+
+def cache_path(source):
+    return source + ".cache"
+
+
+def _source_key(source):
+    st = os.stat(source)
+    return st.st_mtime_ns, st.st_size
+
+
+def _crc(source, end, start=0, crc=0):
+    """CRC-32 of source bytes [start, end), continuing from crc."""
+    with open(source, "rb") as f:
+        f.seek(start)
+        while start < end:
+            chunk = f.read(min(FLUSH_EVERY, end - start))
+            if not chunk:
+                break
+            crc = zlib.crc32(chunk, crc)
+            start += len(chunk)
+    return crc
+
+
+def _appended_to(source, cache):
+    """Header of cache if source only had lines appended since it was built, else None."""
+    try:
+        with open(cache, "rb") as f:
+            header = HEADER.unpack(f.read(HEADER.size))
+    except (OSError, struct.error):
+        return None
+    magic, _, old_size, crc, _, _ = header
+    if magic != MAGIC or not 0 < old_size < os.path.getsize(source):
+        return None
+    with open(source, "rb") as f:
+        f.seek(old_size - 1)
+        if f.read(1) != b"\n":  # the old last line may have been extended
+            return None
+    # The whole prefix is checked: an edit anywhere before the old end
+    # would leave stale records behind. Hashing is far cheaper than parsing.
+    return header if _crc(source, old_size) == crc else None
+
+
+@timed("jokes.compile")
+def compile_corpus(source, cache=None):
+    """Parse source into a binary cache file (atomic replace); returns the joke count."""
+    cache = cache or cache_path(source)
+    mtime_ns, size = _source_key(source)
+    previous = _appended_to(source, cache)
+    tmp = cache + ".tmp"
+    try:
+        with open(source, "rb") as raw, open(tmp, "wb") as out:
+            out.write(HEADER.pack(MAGIC, 0, 0, 0, 0, 0))
+            if previous is None:
+                offsets, pos = array("Q", [0]), 0
+            else:
+                # Reuse the old records byte for byte; parse only what was appended.
+                _, _, old_size, _, count, table = previous
+                with open(cache, "rb") as old:
+                    old.seek(table)
+                    offsets = array("Q")
+                    offsets.fromfile(old, count + 1)
+                    if sys.byteorder != "little":
+                        offsets.byteswap()
+                    pos = offsets[-1]
+                    old.seek(HEADER.size)
+                    for _ in range(0, pos, FLUSH_EVERY):
+                        out.write(old.read(min(FLUSH_EVERY, HEADER.size + pos - old.tell())))
+                raw.seek(old_size)
+
+            src = io.TextIOWrapper(raw, encoding="utf-8", errors="replace")
+            pending, buffered = [], 0
+            for line in src:
+                joke = parse_joke(line)
+                if joke is None:
+                    continue
+                record = f"{joke[0]}\n{joke[1]}".encode("utf-8")
+                pending.append(record)
+                buffered += len(record)
+                pos += len(record)
+                offsets.append(pos)
+                if buffered >= FLUSH_EVERY:
+                    out.write(b"".join(pending))
+                    pending, buffered = [], 0
+            out.write(b"".join(pending))
+
+            # Align the offset table so it can be viewed as uint64 in place.
+            end = HEADER.size + pos
+            padding = -end % 8
+            out.write(b"\0" * padding)
+            table = end + padding
+            if sys.byteorder != "little":
+                offsets.byteswap()
+            offsets.tofile(out)
+            out.seek(0)
+            crc = _crc(source, size) if previous is None else _crc(source, size, old_size, previous[3])
+            out.write(HEADER.pack(MAGIC, mtime_ns, size, crc, len(offsets) - 1, table))
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp, cache)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return len(offsets) - 1
+
+
+class JokeCorpus:
+    """
+    Read-only sequence of (setup, punchline) tuples backed by an mmap
+    of the compiled cache. Supports len(), indexing and iteration, so
+    it can stand in for a list of jokes.
+    """
+
+    def __init__(self, source="randomJokes.txt", cache=None, rebuild=False):
+        self.source = source
+        self.cache = cache or cache_path(source)
+        self.compiled = False
+        if rebuild or not self._fresh():
+            with file_lock(self.cache):  # another instance may be compiling the same cache
+                if rebuild or not self._fresh():
+                    compile_corpus(source, self.cache)
+                    self.compiled = True
+
+        with open(self.cache, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        _, mtime_ns, size, _, self._count, table = HEADER.unpack_from(self._map)
+        self.key = [mtime_ns, size]  # identifies the source version the cache was built from
+        self._data = HEADER.size
+        self._offsets = memoryview(self._map)[table:table + 8 * (self._count + 1)].cast("Q")
+        if sys.byteorder != "little":  # the table is written little-endian
+            self._offsets = array("Q", self._offsets)
+            self._offsets.byteswap()
+
+    def _fresh(self):
+        try:
+            with open(self.cache, "rb") as f:
+                header = f.read(HEADER.size)
+        except OSError:
+            return False
+        if len(header) < HEADER.size:
+            return False
+        magic, mtime_ns, size, _, _, _ = HEADER.unpack(header)
+        return magic == MAGIC and (mtime_ns, size) == _source_key(self.source)
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("joke index out of range")
+        start = self._data + self._offsets[i]
+        end = self._data + self._offsets[i + 1]
+        setup, punch = self._map[start:end].decode("utf-8").split("\n", 1)
+        return setup, punch
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self[i]
+
+    def close(self):
+        if self._map is not None:
+            if isinstance(self._offsets, memoryview):
+                self._offsets.release()
+            self._offsets = None
+            self._map.close()
+            self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile and inspect a joke corpus.")
+    parser.add_argument("source", nargs="?", default="randomJokes.txt")
+    parser.add_argument("--rebuild", action="store_true", help="recompile even if the cache is fresh")
+    parser.add_argument("--show", type=int, metavar="N", help="print joke N")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    with JokeCorpus(args.source, rebuild=args.rebuild) as corpus:
+        elapsed = (time.perf_counter() - start) * 1000
+        action = "Compiled" if corpus.compiled else "Opened cached"
+        print(f"{action} {len(corpus):,} jokes from {args.source} in {elapsed:.1f} ms")
+        if args.show is not None:
+            setup, punch = corpus[args.show]
+            print(f"{setup}\n  {punch}")
+
+
+if __name__ == "__main__":
+    main()
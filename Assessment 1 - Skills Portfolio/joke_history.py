@@ -0,0 +1,127 @@
+import os
+
+# ---------------------------------------------------------
+#   BOUNDED JOKE HISTORY
+# ---------------------------------------------------------
+#   A fixed-capacity ring buffer of shown setups (oldest first). Showing
+#   the same joke twice in a row bumps one entry instead of adding a new
+#   one, and counts track how often each retained setup was shown.
+#   New entries are appended to "<file>" in batches, one line per show,
+#   and loading replays the whole file. Once it holds twice the lines
+#   the retained entries need, it is rewritten with just those.
+
+HISTORY_SIZE = 500
+FLUSH_EVERY = 20  # entries buffered before they are appended to disk
+
+
+class JokeHistory:
+    def __init__(self, capacity=HISTORY_SIZE, path=None, flush_every=FLUSH_EVERY):
+        self.capacity = capacity
+        self.path = path
+        self.flush_every = flush_every
+        self._items = [None] * capacity  # [setup, times shown in a row]
+        self._start = 0
+        self._len = 0
+        self.counts = {}   # setup -> times shown among retained entries
+        self._pending = []
+        self._logged = 0   # lines in the file on disk
+        self.version = 0   # bumped on every change, for views
+        if path:
+            self._load()
+
+    # ---------------- Ring buffer ---------------- #
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, i):
+        """Entry i, oldest first, as (setup, times shown in a row)."""
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError("history index out of range")
+        setup, times = self._items[(self._start + i) % self.capacity]
+        return setup, times
+
+    def window(self, first, count):
+        return [self[i] for i in range(max(0, first), min(self._len, first + count))]
+
+    def add(self, setup, persist=True):
+        self.counts[setup] = self.counts.get(setup, 0) + 1
+        if self._len and self[-1][0] == setup:
+            self._items[(self._start + self._len - 1) % self.capacity][1] += 1
+        else:
+            if self._len == self.capacity:
+                self._evict()
+            self._items[(self._start + self._len) % self.capacity] = [setup, 1]
+            self._len += 1
+        self.version += 1
+
+        if persist and self.path:
+            self._pending.append(setup)
+            if len(self._pending) >= self.flush_every:
+                self.flush()
+
+    def _evict(self):
+        setup, times = self._items[self._start]
+        left = self.counts[setup] - times
+        if left:
+            self.counts[setup] = left
+        else:
+            del self.counts[setup]
+        self._items[self._start] = None
+        self._start = (self._start + 1) % self.capacity
+        self._len -= 1
+
+    def clear(self):
+        self._items = [None] * self.capacity
+        self._start = self._len = 0
+        self.counts.clear()
+        self._pending.clear()
+        self.version += 1
+        if self.path:
+            self._rewrite()
+
+    # ---------------- Persistence ---------------- #
+
+    def _load(self):
+        # Replay every line: repeats bump one entry, so the last `capacity`
+        # lines can hold fewer than `capacity` entries. The ring evicts the rest.
+        line = ""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    self._logged += 1
+                    if line.endswith("\n"):
+                        self.add(line[:-1], persist=False)
+        except OSError:
+            return
+        if line and not line.endswith("\n"):
+            self._rewrite()  # drop a torn last line before appending after it
+
+    def _retained_lines(self):
+        return sum(self.counts.values())  # one line per show of each retained entry
+
+    def flush(self):
+        """Append pending entries; compact the file once it holds twice the lines it needs."""
+        if not self.path or not self._pending:
+            return
+        if self._logged + len(self._pending) > 2 * max(self.capacity, self._retained_lines()):
+            self._pending.clear()
+            self._rewrite()
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(s + "\n" for s in self._pending))
+        self._logged += len(self._pending)
+        self._pending.clear()
+
+    def _rewrite(self):
+        lines = []
+        for i in range(self._len):
+            setup, times = self[i]
+            lines.extend([setup] * times)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("".join(s + "\n" for s in lines))
+        os.replace(tmp, self.path)
+        self._logged = len(lines)
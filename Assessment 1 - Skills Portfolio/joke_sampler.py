@@ -0,0 +1,220 @@
+import json
+import os
+import random
+
+# ---------------------------------------------------------
+#   JOKE SAMPLING
+# ---------------------------------------------------------
+#   Samplers work on joke indices only, so they never copy the corpus.
+#   ShuffleBag   - every joke once per cycle, in random order
+#   AliasSampler - O(1) draws weighted by user ratings
+
+MIN_SCORE, MAX_SCORE = -3, 5  # net rating (ups - downs) is clamped to this
+RATING_BASE = 1.5             # weight = RATING_BASE ** net rating; unrated jokes weigh 1
+
+
+class ShuffleBag:
+    """
+    Lazy Fisher-Yates shuffle over range(n). Only positions that have
+    been swapped are stored, so memory grows with the number of draws
+    in the current cycle rather than with n.
+    """
+
+    def __init__(self, n, rng=None):
+        self.rng = rng or random.Random()
+        self.n = n
+        self.remaining = n
+        self.swaps = {}   # position -> index moved there by an earlier draw
+        self.last = None  # previous draw, not repeated across a refill
+        self.cycle = 0
+
+    def draw(self):
+        if self.n == 0:
+            raise IndexError("draw from an empty bag")
+        if self.remaining == 0:
+            self.remaining = self.n
+            self.swaps.clear()
+            self.cycle += 1
+
+        j = self.rng.randrange(self.remaining)
+        if self.remaining == self.n and self.n > 1:
+            while j == self.last:  # a fresh cycle must not start with the joke just shown
+                j = self.rng.randrange(self.remaining)
+
+        top = self.remaining - 1
+        value = self.swaps.get(j, j)
+        moved = self.swaps.pop(top, top)
+        if j != top:
+            self.swaps[j] = moved
+        self.remaining = top
+        self.last = value
+        return value
+
+    def state(self):
+        return {"n": self.n, "remaining": self.remaining, "last": self.last,
+                "cycle": self.cycle, "swaps": list(self.swaps.items())}
+
+    @classmethod
+    def from_state(cls, state, n, rng=None):
+        bag = cls(n, rng)
+        if state and state.get("n") == n:
+            bag.remaining = state["remaining"]
+            bag.last = state["last"]
+            bag.cycle = state["cycle"]
+            bag.swaps = {int(k): v for k, v in state["swaps"]}
+        return bag
+
+
+class AliasSampler:
+    """
+    Vose's alias method over a list of weights: O(len(weights)) to build,
+    O(1) per draw (one randrange, one random).
+    """
+
+    def __init__(self, weights, rng=None):
+        self.rng = rng or random.Random()
+        n = len(weights)
+        if n == 0:
+            raise ValueError("no weights")
+        total = float(sum(weights))
+        if total <= 0:
+            raise ValueError("weights must sum to a positive value")
+
+        scaled = [w * n / total for w in weights]
+        self.prob = [0.0] * n
+        self.alias = [0] * n
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        for i in small + large:  # leftovers are 1 up to rounding error
+            self.prob[i] = 1.0
+
+    def draw(self):
+        i = self.rng.randrange(len(self.prob))
+        return i if self.rng.random() < self.prob[i] else self.alias[i]
+
+
+# ---------------------------------------------------------
+#   SAMPLER FOR THE JOKE APP
+# ---------------------------------------------------------
+
+class JokeSampler:
+    """
+    Picks the next joke index in "shuffle" or "weighted" mode and keeps
+    ratings. Ratings are keyed by setup text so they survive edits to
+    the corpus; their indices are only re-resolved when it changes.
+    Only rated jokes enter the alias table, alongside one entry standing
+    for all unrated jokes, which is resolved by uniform rejection.
+    """
+
+    MODES = ("shuffle", "weighted")
+
+    def __init__(self, corpus, path=None, rng=None):
+        self.corpus = corpus
+        self.path = path
+        self.rng = rng or random.Random()
+        self.mode = "shuffle"
+        self.ratings = {}  # setup -> [ups, downs]
+        self.rated = {}    # corpus index -> setup
+        self.last = None
+        self._alias = None  # (AliasSampler, indices), rebuilt after a rating changes
+        state = self._read()
+        self.mode = state.get("mode", "shuffle") if state.get("mode") in self.MODES else "shuffle"
+        self.ratings = state.get("ratings", {})
+
+        key = [len(corpus), getattr(corpus, "key", None)]
+        if state.get("corpus") == key:
+            self.rated = {int(i): setup for i, setup in state.get("rated", {}).items()}
+            self.bag = ShuffleBag.from_state(state.get("bag"), len(corpus), self.rng)
+        else:
+            self._resolve_ratings()
+            self.bag = ShuffleBag(len(corpus), self.rng)
+        self._key = key
+
+    def _read(self):
+        if not self.path:
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _resolve_ratings(self):
+        """Find corpus indices for rated setups (one pass, only when ratings exist)."""
+        self.rated = {}
+        if self.ratings:
+            for i, (setup, _) in enumerate(self.corpus):
+                if setup in self.ratings:
+                    self.rated[i] = setup
+        self._alias = None
+
+    # ---------------- Drawing ---------------- #
+
+    def next(self):
+        if self.mode == "weighted" and self.rated:
+            i = self._weighted()
+            if i == self.last and len(self.corpus) > 1:
+                i = self._weighted()  # one redraw makes an immediate repeat unlikely
+        else:
+            i = self.bag.draw()
+        self.last = i
+        return i
+
+    def _weighted(self):
+        if self._alias is None:
+            indices = list(self.rated)
+            weights = [self.weight(i) for i in indices]
+            unrated = len(self.corpus) - len(indices)
+            if unrated:
+                indices.append(None)
+                weights.append(float(unrated))
+            self._alias = (AliasSampler(weights, self.rng), indices)
+
+        sampler, indices = self._alias
+        i = indices[sampler.draw()]
+        while i is None:
+            # The unrated bucket: any joke without a rating, uniformly.
+            j = self.rng.randrange(len(self.corpus))
+            if j not in self.rated:
+                i = j
+        return i
+
+    # ---------------- Ratings ---------------- #
+
+    def weight(self, i):
+        setup = self.rated.get(i)
+        if setup is None:
+            return 1.0
+        ups, downs = self.ratings[setup]
+        return RATING_BASE ** max(MIN_SCORE, min(MAX_SCORE, ups - downs))
+
+    def rate(self, i, up=True):
+        setup = self.corpus[i][0]
+        counts = self.ratings.setdefault(setup, [0, 0])
+        counts[0 if up else 1] += 1
+        self.rated[i] = setup
+        self._alias = None
+        self.save()
+
+    # ---------------- Persistence ---------------- #
+
+    def save(self):
+        if not self.path:
+            return
+        state = {
+            "mode": self.mode,
+            "corpus": self._key,
+            "bag": self.bag.state(),
+            "ratings": self.ratings,
+            "rated": self.rated,
+        }
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.path)
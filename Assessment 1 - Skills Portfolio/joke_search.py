@@ -0,0 +1,270 @@
+"""
+Full-text search over a joke corpus.
+
+    python joke_search.py "query words" [--source randomJokes.txt] [--limit 10]
+
+An inverted index maps each term to the jokes that contain it. The
+last query word is treated as a prefix, so results update while a word
+is still being typed. Jokes must contain every query word. Matches are
+ranked with BM25, which weighs rare words up and long jokes down.
+
+Jokes are numbered shortest first inside the index, so every postings
+list is already in BM25 length order. A query walks its most selective
+word's postings, keeps the jokes that contain the other words, and
+stops after a few times `limit` matches instead of scoring them all.
+
+For a compiled JokeCorpus the index is saved to "<source>.search" and
+reused until the corpus changes:
+
+    header    magic, corpus key, joke count, term count, vocabulary bytes, postings
+    vocab     sorted terms, newline separated (UTF-8)
+    starts    term count + 1 uint64 offsets into postings
+    postings  uint32 ranks (joke numbers in length order)
+    docs      uint32 corpus index of each rank
+    lengths   uint16 tokens per rank
+"""
+import argparse
+import bisect
+import heapq
+import math
+import os
+import re
+import struct
+import sys
+import time
+from array import array
+
+from instrument import timed
+
+MAGIC = b"JOKESRC2"
+HEADER = struct.Struct("<8sqqQQQQ")  # magic, mtime_ns, size, jokes, terms, vocab bytes, postings
+TOKEN = re.compile(r"[^\W_]+(?:'[^\W_]+)*")
+MIN_PREFIX = 2         # shorter trailing words only match whole terms
+PREFIX_TERMS = 64      # most frequent expansions of a prefix that are searched
+RERANK = 4             # matches gathered per result before the final ranking
+K1, B = 1.2, 0.75      # BM25 constants
+
+
+def tokenize(text):
+    return TOKEN.findall(text.casefold())
+
+
+def index_path(source):
+    return source + ".search"
+
+
+class SearchIndex:
+    def __init__(self, terms, starts, postings, docs, lengths):
+        self.terms = terms          # sorted vocabulary
+        self.starts = starts        # postings of terms[i] are postings[starts[i]:starts[i + 1]]
+        self.postings = postings
+        self.docs = docs            # rank -> corpus index
+        self.lengths = lengths      # rank -> tokens, ascending
+        self.count = len(lengths)
+        self.avg_length = (sum(lengths) / self.count) if self.count else 1.0
+
+    # ---------------- Building ---------------- #
+
+    @classmethod
+    @timed("jokes.search_build")
+    def build(cls, jokes, task=None):
+        """Index an iterable of (setup, punchline); task may report progress or cancel."""
+        table = {}
+        lengths = array("H")
+        total = len(jokes) if hasattr(jokes, "__len__") else 0
+        for doc, (setup, punch) in enumerate(jokes):
+            tokens = tokenize(f"{setup} {punch}")
+            lengths.append(min(len(tokens), 0xFFFF))
+            for term in set(tokens):
+                hits = table.get(term)
+                if hits is None:
+                    table[term] = hits = array("I")
+                hits.append(doc)
+            if task is not None and doc % 10000 == 0:
+                task.check()
+                if total:
+                    task.progress(doc / total)
+
+        # Renumber jokes shortest first (stable, so ties keep corpus order).
+        docs = array("I", sorted(range(len(lengths)), key=lengths.__getitem__))
+        rank = array("I", bytes(4 * len(docs)))
+        for r, doc in enumerate(docs):
+            rank[doc] = r
+
+        terms = sorted(table)
+        starts = array("Q", [0])
+        postings = array("I")
+        for term in terms:
+            postings.extend(sorted(rank[doc] for doc in table.pop(term)))
+            starts.append(len(postings))
+        return cls(terms, starts, postings, docs, array("H", (lengths[d] for d in docs)))
+
+    # ---------------- Persistence ---------------- #
+
+    def save(self, path, key):
+        vocab = "\n".join(self.terms).encode("utf-8")
+        tmp = path + ".tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(HEADER.pack(MAGIC, key[0], key[1], self.count, len(self.terms),
+                                    len(vocab), len(self.postings)))
+                f.write(vocab)
+                for arr in (self.starts, self.postings, self.docs, self.lengths):
+                    out = arr
+                    if sys.byteorder != "little":
+                        out = array(arr.typecode, arr)
+                        out.byteswap()
+                    out.tofile(f)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    @classmethod
+    def load(cls, path, key):
+        """Read a saved index, or return None if it is missing or was built for another corpus."""
+        try:
+            with open(path, "rb") as f:
+                header = f.read(HEADER.size)
+                if len(header) < HEADER.size:
+                    return None
+                magic, mtime_ns, size, count, nterms, vocab_len, npostings = HEADER.unpack(header)
+                if magic != MAGIC or [mtime_ns, size] != list(key):
+                    return None
+                vocab = f.read(vocab_len).decode("utf-8")
+                terms = vocab.split("\n") if nterms else []
+                arrays = []
+                for code, n in (("Q", nterms + 1), ("I", npostings), ("I", count), ("H", count)):
+                    arr = array(code)
+                    arr.fromfile(f, n)
+                    if sys.byteorder != "little":
+                        arr.byteswap()
+                    arrays.append(arr)
+        except (OSError, EOFError, UnicodeDecodeError):
+            return None
+        return cls(terms, *arrays)
+
+    @classmethod
+    def for_corpus(cls, corpus, task=None):
+        """Load the saved index for a JokeCorpus, building and saving it if stale."""
+        key = getattr(corpus, "key", None)
+        if key is None:
+            return cls.build(corpus, task)
+        path = index_path(corpus.source)
+        index = cls.load(path, key)
+        if index is None or index.count != len(corpus):
+            index = cls.build(corpus, task)
+            try:
+                index.save(path, key)
+            except OSError:
+                pass  # still usable, just rebuilt next time
+        return index
+
+    # ---------------- Querying ---------------- #
+
+    def _df(self, i):
+        return self.starts[i + 1] - self.starts[i]
+
+    def _contains(self, i, rank):
+        lo, hi = self.starts[i], self.starts[i + 1]
+        j = bisect.bisect_left(self.postings, rank, lo, hi)
+        return j < hi and self.postings[j] == rank
+
+    def _lookup(self, term):
+        i = bisect.bisect_left(self.terms, term)
+        return i if i < len(self.terms) and self.terms[i] == term else None
+
+    def _expand(self, prefix):
+        """Term ids starting with prefix, most frequent first, capped at PREFIX_TERMS."""
+        lo = bisect.bisect_left(self.terms, prefix)
+        hi = bisect.bisect_left(self.terms, prefix + "\U0010ffff")
+        return heapq.nlargest(PREFIX_TERMS, range(lo, hi), key=self._df)
+
+    def _idf(self, df):
+        return math.log(1 + (self.count - df + 0.5) / (df + 0.5))
+
+    def _iter_postings(self, i):
+        postings = self.postings
+        for j in range(self.starts[i], self.starts[i + 1]):  # no slice copy; callers stop early
+            yield postings[j]
+
+    def _stream(self, ids):
+        """Ranks containing any of the term ids, ascending, without duplicates."""
+        if len(ids) == 1:
+            yield from self._iter_postings(ids[0])
+            return
+        last = None
+        for r in heapq.merge(*(self._iter_postings(i) for i in ids)):
+            if r != last:
+                yield r
+                last = r
+
+    @timed("jokes.search")
+    def search(self, query, limit=20):
+        """Corpus indices of the best matching jokes, best first."""
+        words = tokenize(query)
+        if not words:
+            return []
+
+        # Each query word becomes a group of term ids: one exact term, or
+        # the expansions of the trailing word while it is being typed.
+        groups = []
+        for n, word in enumerate(words):
+            exact = self._lookup(word)
+            if n == len(words) - 1 and len(word) >= MIN_PREFIX and not query[-1:].isspace():
+                ids = self._expand(word)
+            else:
+                ids = [] if exact is None else [exact]
+            if not ids:
+                return []
+            df = min(self.count, sum(self._df(i) for i in ids))
+            groups.append((ids, df, exact))
+
+        # Walk the most selective group in length order, probing the others.
+        groups.sort(key=lambda g: g[1])
+        others = [ids for ids, _, _ in groups[1:]]
+        found = []
+        for r in self._stream(groups[0][0]):
+            if all(any(self._contains(i, r) for i in ids) for ids in others):
+                found.append(r)
+                if len(found) >= limit * RERANK:
+                    break
+
+        # BM25 with one occurrence per word. A word typed in full outranks
+        # longer words that merely start with it.
+        bonus = [(exact, self._idf(self._df(exact)))
+                 for ids, df, exact in groups if len(ids) > 1 and exact is not None]
+        base = sum(self._idf(df) for _, df, _ in groups)
+        lengths, avg = self.lengths, self.avg_length
+
+        def score(r):
+            weight = base + sum(idf for i, idf in bonus if self._contains(i, r))
+            return weight * (K1 + 1) / (1 + K1 * (1 - B + B * lengths[r] / avg))
+
+        return [self.docs[r] for r in heapq.nlargest(limit, found, key=score)]
+
+
+def main(argv=None):
+    from joke_corpus import JokeCorpus
+
+    parser = argparse.ArgumentParser(description="Search a joke corpus.")
+    parser.add_argument("query")
+    parser.add_argument("--source", default="randomJokes.txt")
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    with JokeCorpus(args.source) as corpus:
+        start = time.perf_counter()
+        index = SearchIndex.for_corpus(corpus)
+        loaded = time.perf_counter()
+        hits = index.search(args.query, args.limit)
+        done = time.perf_counter()
+        print(f"Index ready in {(loaded - start) * 1000:.1f} ms, "
+              f"query in {(done - loaded) * 1000:.2f} ms")
+        for i in hits:
+            setup, punch = corpus[i]
+            print(f"{i:>8}  {setup}  {punch}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import time
+import tkinter as tk
+
+from instrument import timed
+
+# ---------------------------------------------------------
+#   FRAME-CLOCK ANIMATION
+# ---------------------------------------------------------
+
+class FrameClock:
+    """
+    One shared after() loop for all running animations. Each frame
+    steps every animation with the current time, stopping early once
+    the frame budget is spent (the rest go first next frame). The loop
+    only runs while something is animating.
+    """
+
+    FRAME_MS = 16
+    BUDGET = 0.008  # seconds of work allowed per frame
+
+    def __init__(self, root, frame_ms=FRAME_MS, budget=BUDGET):
+        self.root = root
+        self.frame_ms = frame_ms
+        self.budget = budget
+        self.animations = {}  # key -> animation with step(now) -> finished?
+        self._after_id = None
+
+    def start(self, key, animation):
+        """Run animation under key, replacing only an animation with the same key."""
+        self.animations[key] = animation
+        animation.step(time.perf_counter())
+        if self._after_id is None:
+            self._after_id = self.root.after(self.frame_ms, self._tick)
+
+    def stop(self, key):
+        self.animations.pop(key, None)
+
+    @timed("jokes.animation_frame")
+    def _tick(self):
+        self._after_id = None
+        now = time.perf_counter()
+        deadline = now + self.budget
+        items = list(self.animations.items())
+        for n, (key, animation) in enumerate(items):
+            if n and time.perf_counter() > deadline:
+                # Over budget: the animations skipped this frame go first next frame.
+                skipped = {k: self.animations[k] for k, _ in items[n:] if k in self.animations}
+                skipped.update(self.animations)
+                self.animations = skipped
+                break
+            if animation.step(now):
+                if self.animations.get(key) is animation:
+                    del self.animations[key]
+        if self.animations:
+            self._after_id = self.root.after(self.frame_ms, self._tick)
+
+
+class Typewriter:
+    """Reveals text on a label at a fixed rate, as many characters per frame as time allows."""
+
+    def __init__(self, label, text, chars_per_second=33):
+        self.label = label
+        self.text = text
+        self.rate = chars_per_second
+        self.started = time.perf_counter()
+        self.shown = -1
+
+    def step(self, now):
+        n = min(len(self.text), int((now - self.started) * self.rate))
+        if n != self.shown:
+            self.label.config(text=self.text[:n])
+            self.shown = n
+        return n == len(self.text)
+
+
+# ---------------------------------------------------------
+#   VIRTUALIZED HISTORY LIST
+# ---------------------------------------------------------
+
+class HistoryView(tk.Frame):
+    """
+    Listbox over a JokeHistory that only ever holds the visible rows.
+    Scrolling moves a window over the model; while the view is at the
+    bottom it follows new entries.
+    """
+
+    def __init__(self, master, history, height=7, **listbox_kw):
+        super().__init__(master, bg=master.cget("bg"))
+        self.history = history
+        self.rows = height
+        self.top = 0
+        self.listbox = tk.Listbox(self, height=height, activestyle="none", **listbox_kw)
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.listbox.pack(side="left", fill="both", expand=True)
+        for event in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.listbox.bind(event, self._on_wheel)
+        self.scroll_to_end()
+
+    def _max_top(self):
+        return max(0, len(self.history) - self.rows)
+
+    def scroll_to_end(self):
+        self.top = self._max_top()
+        self.render()
+
+    def refresh(self):
+        """Call after the model changes."""
+        following = self.top >= self._max_top() - 1
+        if following:
+            self.scroll_to_end()
+        else:
+            self.render()
+
+    def render(self):
+        self.top = min(self.top, self._max_top())
+        self.listbox.delete(0, tk.END)
+        for setup, times in self.history.window(self.top, self.rows):
+            shown = self.history.counts.get(setup, times)
+            self.listbox.insert(tk.END, f"{setup}  (×{shown})" if shown > 1 else setup)
+        total = len(self.history)
+        if total:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + self.rows) / total))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def scroll(self, rows):
+        self.top = max(0, min(self._max_top(), self.top + rows))
+        self.render()
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self.top = int(float(value) * len(self.history))
+            self.scroll(0)
+        elif action == "scroll":
+            self.scroll(int(value) * (self.rows if unit == "pages" else 1))
+
+    def _on_wheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.scroll(-1)
+        else:
+            self.scroll(1)
+        return "break"
@@ -0,0 +1,261 @@
+import random
+import statistics
+import time
+from collections import deque
+
+# ---------------------------------------------------------
+#   HEADLESS ARITHMETIC QUIZ ENGINE
+# ---------------------------------------------------------
+#   No tkinter here: a QuizSession holds one player's state, so any
+#   number of sessions can run side by side (GUI, server, tests).
+
+QUESTIONS = 10
+POINTS_FIRST_TRY = 10
+POINTS_SECOND_TRY = 5
+
+# Difficulty profiles: operand range (inclusive) and allowed operators.
+# The first three are the brief's levels; the rest are extensions.
+PROFILES = {
+    "Easy": {"range": (1, 9), "ops": "+-"},
+    "Moderate": {"range": (10, 99), "ops": "+-"},
+    "Advanced": {"range": (1000, 9999), "ops": "+-"},
+    "Times Tables": {"range": (2, 12), "ops": "*"},
+    "Mixed": {"range": (2, 30), "ops": "+-*/"},
+}
+
+
+def solve(a, b, op):
+    if op == "+":
+        return a + b
+    if op == "-":
+        return a - b
+    if op == "*":
+        return a * b
+    if op == "/":
+        return a // b
+    raise ValueError(f"Unknown operator {op!r}")
+
+
+def grade_for(score, max_score=QUESTIONS * POINTS_FIRST_TRY):
+    """Letter grade from displayResults, scaled to the session's maximum."""
+    percent = score * 100 / max_score if max_score else 0
+    if percent >= 90:
+        return "A+"
+    if percent >= 80:
+        return "A"
+    if percent >= 70:
+        return "B"
+    if percent >= 60:
+        return "C"
+    return "F"
+
+
+class Problem:
+    __slots__ = ("a", "b", "op", "answer")
+
+    def __init__(self, a, b, op):
+        self.a = a
+        self.b = b
+        self.op = op
+        self.answer = solve(a, b, op)
+
+    def __str__(self):
+        return f"{self.a} {self.op} {self.b}"
+
+    def __repr__(self):
+        return f"Problem({self.a}, {self.b}, {self.op!r})"
+
+
+def generate_problems(profile, n=QUESTIONS, rng=None):
+    """
+    Build a whole problem set in one batch: operands and operators are
+    drawn with single choices(k=n) calls rather than one call per value.
+    Subtractions never go negative and divisions always divide exactly.
+    """
+    if isinstance(profile, str):
+        profile = PROFILES[profile]
+    rng = rng or random.Random()
+    lo, hi = profile["range"]
+    values = range(lo, hi + 1)
+    left = rng.choices(values, k=n)
+    right = rng.choices(values, k=n)
+    ops = rng.choices(profile["ops"], k=n)
+
+    problems = []
+    for a, b, op in zip(left, right, ops):
+        if op == "-" and b > a:
+            a, b = b, a
+        elif op == "/":
+            b = b or 1
+            a = a * b  # the quotient is the drawn operand
+        problems.append(Problem(a, b, op))
+    return problems
+
+
+# ---------------------------------------------------------
+#   ADAPTIVE DIFFICULTY
+# ---------------------------------------------------------
+
+OPERATOR_LADDER = "+-*/"  # operators unlocked in this order as the player climbs
+WINDOW = 4                # problems in the rolling accuracy/speed window
+LOOKAHEAD = 3             # problems generated ahead of the one on screen
+STEP_UP_ACCURACY = 0.75   # first-try accuracy needed to climb...
+FAST_SECONDS = 6.0        # ...with a median time at or under this
+STEP_DOWN_ACCURACY = 0.5  # drop a step at or below this accuracy...
+SLOW_SECONDS = 15.0       # ...or with a median time over this
+MIN_STEP, MAX_STEP = -2, 4
+RANGE_GROWTH = 1.6        # operand span multiplier per step
+
+
+class AdaptiveScheduler:
+    """
+    Serves problems for one session, moving the difficulty step up or
+    down from the player's rolling first-try accuracy and median answer
+    time. Each step scales the operand span; steps 2 and 4 unlock the
+    next operator. The next LOOKAHEAD problems are generated ahead of
+    time and only regenerated when the step changes.
+    """
+
+    def __init__(self, profile, rng=None, window=WINDOW, lookahead=LOOKAHEAD):
+        self.base = PROFILES[profile] if isinstance(profile, str) else profile
+        self.rng = rng or random.Random()
+        self.step = 0
+        self.recent = deque(maxlen=window)  # (correct first time?, seconds)
+        self.lookahead = lookahead
+        self.ahead = deque()
+        self._refill()
+
+    def profile(self):
+        """Operand range and operators for the current step."""
+        lo, hi = self.base["range"]
+        span = max(1, round((hi - lo) * RANGE_GROWTH ** self.step))
+        ops = self.base["ops"]
+        locked = [op for op in OPERATOR_LADDER if op not in ops]
+        ops += "".join(locked[:max(0, self.step) // 2])
+        return {"range": (lo, lo + span), "ops": ops}
+
+    def _refill(self):
+        missing = self.lookahead + 1 - len(self.ahead)
+        if missing > 0:
+            self.ahead.extend(generate_problems(self.profile(), missing, self.rng))
+
+    def next(self):
+        problem = self.ahead.popleft()
+        self._refill()
+        return problem
+
+    def observe(self, first_try, seconds):
+        """Feed back one closed problem; returns the step change (-1, 0 or +1)."""
+        self.recent.append((first_try, seconds))
+        if len(self.recent) < self.recent.maxlen:
+            return 0
+
+        accuracy = sum(c for c, _ in self.recent) / len(self.recent)
+        pace = statistics.median(t for _, t in self.recent)
+        if accuracy >= STEP_UP_ACCURACY and pace <= FAST_SECONDS and self.step < MAX_STEP:
+            change = 1
+        elif (accuracy <= STEP_DOWN_ACCURACY or pace > SLOW_SECONDS) and self.step > MIN_STEP:
+            change = -1
+        else:
+            return 0
+
+        self.step += change
+        self.recent.clear()  # judge the new step on its own answers
+        self.ahead.clear()
+        self._refill()
+        return change
+
+
+# ---------------------------------------------------------
+#   SESSION
+# ---------------------------------------------------------
+
+class QuizSession:
+    """
+    One play of the quiz: problems, attempts, score and answer log.
+    With adaptive=True the problems come one at a time from an
+    AdaptiveScheduler instead of a fixed set drawn up front.
+    """
+
+    def __init__(self, level="Easy", questions=QUESTIONS, seed=None, adaptive=False):
+        self.level = level
+        self.seed = seed
+        self.questions = questions
+        self.rng = random.Random(seed)
+        if adaptive:
+            self.scheduler = AdaptiveScheduler(level, self.rng)
+            self.problems = [self.scheduler.next()]
+        else:
+            self.scheduler = None
+            self.problems = generate_problems(level, questions, self.rng)
+        self.index = 0
+        self.attempts = 1
+        self.score = 0
+        self.log = []  # (question number, given answer, correct?, attempt, seconds taken)
+        self.started = time.time()
+        self.ended = None
+        self.mark_shown()
+
+    @property
+    def max_score(self):
+        return self.questions * POINTS_FIRST_TRY
+
+    @property
+    def finished(self):
+        return self.index >= self.questions
+
+    def mark_shown(self):
+        """
+        Start the answer clock. Called automatically whenever a new
+        attempt begins; a GUI calls it again once the question is
+        actually on screen, so dialogs in between are not counted.
+        """
+        self._asked = time.perf_counter()
+        if self.attempts == 1:
+            self._problem_started = self._asked
+
+    def current(self):
+        return None if self.finished else self.problems[self.index]
+
+    def answer(self, value):
+        """
+        Submit an answer to the current problem. Returns a dict with
+        "outcome" ("correct", "retry" or "wrong"), "points" and the
+        correct "answer" once the problem is closed.
+        """
+        problem = self.current()
+        if problem is None:
+            raise RuntimeError("The quiz is already finished.")
+
+        now = time.perf_counter()
+        correct = value == problem.answer
+        self.log.append((self.index + 1, value, correct, self.attempts, now - self._asked))
+
+        if correct:
+            points = POINTS_FIRST_TRY if self.attempts == 1 else POINTS_SECOND_TRY
+            self.score += points
+            self._advance()
+            return {"outcome": "correct", "points": points, "answer": problem.answer}
+
+        if self.attempts == 1:
+            self.attempts += 1
+            self.mark_shown()
+            return {"outcome": "retry", "points": 0, "answer": None}
+
+        self._advance()
+        return {"outcome": "wrong", "points": 0, "answer": problem.answer}
+
+    def _advance(self):
+        if self.scheduler is not None:
+            first_try = self.attempts == 1 and self.log[-1][2]
+            self.scheduler.observe(first_try, time.perf_counter() - self._problem_started)
+        self.index += 1
+        self.attempts = 1
+        if self.finished:
+            self.ended = time.time()
+        elif self.scheduler is not None:
+            self.problems.append(self.scheduler.next())
+        self.mark_shown()
+
+    def grade(self):
+        return grade_for(self.score, self.max_score)
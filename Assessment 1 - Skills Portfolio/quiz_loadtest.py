@@ -0,0 +1,117 @@
+"""
+Load test for quiz_server.py: many simulated players at once.
+
+    python quiz_loadtest.py [--players 300] [--level Moderate] [--accuracy 0.8] [--adaptive]
+                            [--host 127.0.0.1 --port 8765 | --spawn [--results FILE]]
+
+Each player opens a keep-alive connection, starts a session and answers
+every question (right with probability --accuracy). The run reports
+requests per second and latency percentiles. --spawn starts a server
+in the same process on a free port, recording results only if
+--results is given.
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+
+from quiz_engine import solve
+
+
+async def request(reader, writer, method, path, body=None):
+    data = json.dumps(body).encode() if body is not None else b""
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n".encode() + data
+    )
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    length = next(int(l.split(":", 1)[1]) for l in lines if l.lower().startswith("content-length"))
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def player(host, port, level, accuracy, rng, latencies, errors, adaptive=False):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        async def timed(method, path, body=None):
+            start = time.perf_counter()
+            status, payload = await request(reader, writer, method, path, body)
+            latencies.append(time.perf_counter() - start)
+            if status >= 400:
+                errors.append(status)
+            return payload
+
+        state = await timed("POST", "/sessions", {"level": level, "player": f"bot{rng.randrange(1000)}",
+                                            "adaptive": adaptive})
+        sid = state["id"]
+        while not state["finished"]:
+            a, op, b = state["question"]["text"].rstrip(" =").split(" ")
+            answer = solve(int(a), int(b), op)
+            if rng.random() > accuracy:
+                answer += 1
+            state = await timed("POST", f"/sessions/{sid}/answer", {"answer": answer})
+        await timed("DELETE", f"/sessions/{sid}")
+        return state["grade"]
+    finally:
+        writer.close()
+
+
+def percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+
+async def run(players, host, port, level, accuracy, adaptive=False, seed=1):
+    rng = random.Random(seed)
+    latencies, errors = [], []
+    start = time.perf_counter()
+    grades = await asyncio.gather(*(player(host, port, level, accuracy, random.Random(rng.random()),
+                                           latencies, errors, adaptive)
+                                    for _ in range(players)), return_exceptions=True)
+    elapsed = time.perf_counter() - start
+
+    failed = [g for g in grades if isinstance(g, Exception)]
+    ordered = sorted(latencies)
+    print(f"Players: {players} ({len(failed)} failed)   Requests: {len(ordered)}   "
+          f"HTTP errors: {len(errors)}")
+    if ordered:
+        print(f"Elapsed: {elapsed:.2f}s   Throughput: {len(ordered) / elapsed:,.0f} req/s")
+        print(f"Latency ms  mean {statistics.mean(ordered) * 1000:.2f}   "
+              f"p50 {percentile(ordered, 50) * 1000:.2f}   p95 {percentile(ordered, 95) * 1000:.2f}   "
+              f"p99 {percentile(ordered, 99) * 1000:.2f}   max {ordered[-1] * 1000:.2f}")
+    if failed:
+        print(f"First failure: {failed[0]!r}")
+
+
+async def main_async(args):
+    if args.spawn:
+        from quiz_server import QuizServer, start
+        server, listener = await start(args.host, 0, QuizServer(results_path=args.results))
+        port = listener.sockets[0].getsockname()[1]
+        try:
+            async with listener:
+                await run(args.players, args.host, port, args.level, args.accuracy, args.adaptive)
+        finally:
+            server.close()
+    else:
+        await run(args.players, args.host, args.port, args.level, args.accuracy, args.adaptive)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the quiz server.")
+    parser.add_argument("--players", type=int, default=300)
+    parser.add_argument("--level", default="Moderate")
+    parser.add_argument("--accuracy", type=float, default=0.8)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--adaptive", action="store_true", help="play adaptive sessions")
+    parser.add_argument("--spawn", action="store_true", help="run a server in this process")
+    parser.add_argument("--results", help="results file for the spawned server")
+    asyncio.run(main_async(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Append-only quiz results store (SQLite) with leaderboard and analytics.
+
+    python quiz_results.py leaderboard [--level Easy] [--limit 10]
+    python quiz_results.py player NAME [--level Easy]
+    python quiz_results.py level LEVEL
+
+Every finished QuizSession becomes one row in `sessions` plus one row
+per attempt in `answers`. Rows are only ever inserted; the leaderboard
+and per-player queries are served from indexes.
+"""
+import argparse
+import sqlite3
+import time
+
+RESULTS_FILE = "quizResults.db"
+ResultsError = sqlite3.Error  # raised when the database cannot be opened, read or written
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id        INTEGER PRIMARY KEY,
+    player    TEXT    NOT NULL,
+    level     TEXT    NOT NULL,
+    started   REAL    NOT NULL,
+    ended     REAL    NOT NULL,
+    score     INTEGER NOT NULL,
+    max_score INTEGER NOT NULL,
+    percent   REAL    NOT NULL,
+    grade     TEXT    NOT NULL
+);
+CREATE TABLE IF NOT EXISTS answers (
+    session_id INTEGER NOT NULL REFERENCES sessions(id),
+    question   INTEGER NOT NULL,
+    attempt    INTEGER NOT NULL,
+    a          INTEGER NOT NULL,
+    op         TEXT    NOT NULL,
+    b          INTEGER NOT NULL,
+    given      INTEGER NOT NULL,
+    correct    INTEGER NOT NULL,
+    seconds    REAL
+);
+CREATE INDEX IF NOT EXISTS sessions_board  ON sessions(percent DESC, ended);
+CREATE INDEX IF NOT EXISTS sessions_level  ON sessions(level, percent DESC, ended);
+CREATE INDEX IF NOT EXISTS sessions_player ON sessions(player, level, started);
+CREATE INDEX IF NOT EXISTS answers_session ON answers(session_id);
+"""
+
+
+class ResultsStore:
+    """Thin wrapper over one SQLite connection; use it from one thread at a time."""
+
+    def __init__(self, path=RESULTS_FILE, check_same_thread=True):
+        self.path = path
+        self.db = sqlite3.connect(path, check_same_thread=check_same_thread)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    # ---------------- Writes ---------------- #
+
+    def record_session(self, session, player=""):
+        """Append a finished session and all of its attempts in one transaction."""
+        ended = session.ended or time.time()
+        percent = session.score * 100 / session.max_score if session.max_score else 0
+        with self.db:
+            cur = self.db.execute(
+                "INSERT INTO sessions (player, level, started, ended, score, max_score, percent, grade)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (player or "anonymous", session.level, session.started, ended,
+                 session.score, session.max_score, percent, session.grade()),
+            )
+            sid = cur.lastrowid
+            problems = session.problems
+            self.db.executemany(
+                "INSERT INTO answers (session_id, question, attempt, a, op, b, given, correct, seconds)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(sid, q, attempt, problems[q - 1].a, problems[q - 1].op, problems[q - 1].b,
+                  given, int(correct), seconds)
+                 for q, given, correct, attempt, seconds in session.log],
+            )
+        return sid
+
+    # ---------------- Queries ---------------- #
+
+    def leaderboard(self, level=None, limit=10):
+        """Best sessions, highest percentage first (earliest wins a tie)."""
+        if limit < 1:
+            raise ValueError(f"limit must be at least 1, not {limit}")  # SQLite reads LIMIT -1 as no limit
+        sql = "SELECT player, level, score, max_score, grade, ended FROM sessions"
+        if level:
+            rows = self.db.execute(sql + " WHERE level = ? ORDER BY percent DESC, ended LIMIT ?",
+                                   (level, limit))
+        else:
+            rows = self.db.execute(sql + " ORDER BY percent DESC, ended LIMIT ?", (limit,))
+        keys = ("player", "level", "score", "max_score", "grade", "ended")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def player_stats(self, player, level=None):
+        """Sessions, best/average score, accuracy by operator, answer time and daily trend."""
+        where, args = "s.player = ?", [player]
+        if level:
+            where += " AND s.level = ?"
+            args.append(level)
+        return self._stats(where, args)
+
+    def level_stats(self, level):
+        return self._stats("s.level = ?", [level])
+
+    def _stats(self, where, args):
+        sessions, best, average = self.db.execute(
+            f"SELECT COUNT(*), MAX(percent), AVG(percent) FROM sessions s WHERE {where}", args
+        ).fetchone()
+
+        by_op = {}
+        for op, attempts, correct, seconds in self.db.execute(
+            "SELECT a.op, COUNT(*), SUM(a.correct), AVG(a.seconds)"
+            f" FROM sessions s JOIN answers a ON a.session_id = s.id WHERE {where} GROUP BY a.op",
+            args,
+        ):
+            by_op[op] = {"attempts": attempts, "correct": correct,
+                         "accuracy": correct * 100 / attempts, "mean_seconds": seconds}
+
+        trend = [
+            {"day": day, "sessions": n, "average": avg}
+            for day, n, avg in self.db.execute(
+                "SELECT date(started, 'unixepoch', 'localtime'), COUNT(*), AVG(percent)"
+                f" FROM sessions s WHERE {where} GROUP BY 1 ORDER BY 1", args,
+            )
+        ]
+
+        attempts = sum(o["attempts"] for o in by_op.values())
+        timed = [(o["mean_seconds"], o["attempts"]) for o in by_op.values() if o["mean_seconds"] is not None]
+        return {
+            "sessions": sessions,
+            "best": best,
+            "average": average,
+            "accuracy": sum(o["correct"] for o in by_op.values()) * 100 / attempts if attempts else None,
+            "mean_seconds": (sum(s * n for s, n in timed) / sum(n for _, n in timed)) if timed else None,
+            "by_operator": by_op,
+            "trend": trend,
+        }
+
+
+# ---------------------------------------------------------
+#   COMMAND LINE
+# ---------------------------------------------------------
+
+def print_stats(title, stats):
+    print(title)
+    if not stats["sessions"]:
+        print("  No results recorded.")
+        return
+    print(f"  Sessions: {stats['sessions']}   Best: {stats['best']:.0f}%   Average: {stats['average']:.1f}%")
+    if stats["accuracy"] is not None:
+        line = f"  Accuracy: {stats['accuracy']:.1f}%"
+        if stats["mean_seconds"] is not None:
+            line += f"   Mean answer time: {stats['mean_seconds']:.2f}s"
+        print(line)
+    for op, o in sorted(stats["by_operator"].items()):
+        seconds = f"{o['mean_seconds']:.2f}s" if o["mean_seconds"] is not None else "-"
+        print(f"    {op}  {o['accuracy']:5.1f}% of {o['attempts']:<6} {seconds}")
+    for t in stats["trend"][-10:]:
+        print(f"  {t['day']}  {t['sessions']:>4} sessions  {t['average']:5.1f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Quiz results and leaderboards.")
+    parser.add_argument("--db", default=RESULTS_FILE)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("leaderboard")
+    p.add_argument("--level")
+    p.add_argument("--limit", type=int, default=10)
+    p = sub.add_parser("player")
+    p.add_argument("name")
+    p.add_argument("--level")
+    p = sub.add_parser("level")
+    p.add_argument("level")
+
+    args = parser.parse_args(argv)
+    if args.command == "leaderboard" and args.limit < 1:
+        parser.error("--limit must be at least 1")
+    store = ResultsStore(args.db)
+    try:
+        if args.command == "leaderboard":
+            for i, row in enumerate(store.leaderboard(args.level, args.limit), 1):
+                when = time.strftime("%Y-%m-%d", time.localtime(row["ended"]))
+                print(f"{i:>3}. {row['player']:<20} {row['level']:<13} "
+                      f"{row['score']:>3}/{row['max_score']:<3} {row['grade']:<3} {when}")
+        elif args.command == "player":
+            print_stats(f"Player {args.name}", store.player_stats(args.name, args.level))
+        else:
+            print_stats(f"Level {args.level}", store.level_stats(args.level))
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""
+Multi-player arithmetic quiz server (asyncio, JSON over HTTP, no extra packages).
+
+    python quiz_server.py [--host 127.0.0.1] [--port 8765]
+
+API
+    GET    /profiles                  difficulty profiles
+    POST   /sessions                  {"level": "Easy", "player": "ana", "adaptive": true}
+    GET    /sessions/<id>             current state
+    POST   /sessions/<id>/answer      {"answer": 42}
+    DELETE /sessions/<id>
+    GET    /leaderboard?level=Easy&limit=10
+    GET    /players/<name>/stats?level=Easy
+
+Every session is an independent QuizSession, so scoring (10 points on
+the first try, 5 on the second) and grades match the desktop quiz.
+Finished sessions are appended to the results store (--results) on a
+single background thread, so SQLite never blocks the event loop.
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from quiz_engine import PROFILES, QuizSession
+from quiz_results import RESULTS_FILE, ResultsStore
+
+MAX_SESSIONS = 10000
+IDLE_TIMEOUT = 30 * 60  # seconds before an untouched session is dropped
+MAX_BODY = 64 * 1024
+
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 413: "Payload Too Large", 503: "Service Unavailable"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# ---------------------------------------------------------
+#   SESSION REGISTRY
+# ---------------------------------------------------------
+
+class QuizServer:
+    def __init__(self, max_sessions=MAX_SESSIONS, idle_timeout=IDLE_TIMEOUT, results_path=None):
+        self.sessions = {}  # id -> [QuizSession, player, last used]
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.requests = 0
+
+        # One thread owns the SQLite connection; writes and reads queue on it.
+        self.results = None
+        if results_path:
+            self._db = ThreadPoolExecutor(max_workers=1, thread_name_prefix="results")
+            self.results = self._db.submit(ResultsStore, results_path, False).result()
+
+    async def _results(self, fn, *args):
+        if self.results is None:
+            raise HTTPError(404, "results are not being recorded")
+        return await asyncio.get_running_loop().run_in_executor(self._db, fn, *args)
+
+    def describe(self, sid, session):
+        state = {
+            "id": sid,
+            "level": session.level,
+            "score": session.score,
+            "max_score": session.max_score,
+            "finished": session.finished,
+            "attempt": session.attempts,
+        }
+        problem = session.current()
+        if problem is not None:
+            state["question"] = {"number": session.index + 1,
+                                 "total": session.questions,
+                                 "text": f"{problem} ="}
+        else:
+            state["grade"] = session.grade()
+        return state
+
+    def lookup(self, sid):
+        entry = self.sessions.get(sid)
+        if entry is None:
+            raise HTTPError(404, "unknown session")
+        entry[2] = time.monotonic()
+        return entry[0]
+
+    # ---------------- Routes ---------------- #
+
+    async def handle(self, method, path, body):
+        url = urlsplit(path)
+        parts = [unquote(p) for p in url.path.split("/") if p]
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+        if parts == ["profiles"] and method == "GET":
+            return 200, {name: {"range": p["range"], "ops": p["ops"]} for name, p in PROFILES.items()}
+
+        if parts == ["leaderboard"] and method == "GET":
+            try:
+                limit = min(int(query.get("limit", 10)), 100)
+            except ValueError:
+                raise HTTPError(400, "limit must be a whole number") from None
+            if limit < 1:
+                raise HTTPError(400, "limit must be at least 1")
+            return 200, await self._results(self.results.leaderboard, query.get("level"), limit)
+
+        if len(parts) == 3 and parts[0] == "players" and parts[2] == "stats" and method == "GET":
+            return 200, await self._results(self.results.player_stats, parts[1], query.get("level"))
+
+        if parts == ["sessions"] and method == "POST":
+            if len(self.sessions) >= self.max_sessions:
+                raise HTTPError(503, "too many sessions")
+            level = body.get("level", "Easy")
+            if not isinstance(level, str) or level not in PROFILES:
+                raise HTTPError(400, f"unknown level {level!r}")
+            seed = body.get("seed")
+            if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool)):
+                raise HTTPError(400, "seed must be a whole number")
+            adaptive = body.get("adaptive", False)
+            if not isinstance(adaptive, bool):
+                raise HTTPError(400, "adaptive must be true or false")
+            session = QuizSession(level, seed=seed, adaptive=adaptive)
+            sid = uuid.uuid4().hex
+            self.sessions[sid] = [session, str(body.get("player", ""))[:64], time.monotonic()]
+            return 201, self.describe(sid, session)
+
+        if len(parts) >= 2 and parts[0] == "sessions":
+            sid = parts[1]
+            if len(parts) == 2 and method == "GET":
+                return 200, self.describe(sid, self.lookup(sid))
+            if len(parts) == 2 and method == "DELETE":
+                self.lookup(sid)
+                del self.sessions[sid]
+                return 200, {"deleted": sid}
+            if parts[2:] == ["answer"] and method == "POST":
+                session = self.lookup(sid)
+                if session.finished:
+                    raise HTTPError(400, "quiz already finished")
+                value = body.get("answer")
+                if not isinstance(value, int) or isinstance(value, bool):
+                    raise HTTPError(400, "answer must be a whole number")
+                result = session.answer(value)
+                if session.finished and self.results is not None:
+                    # The session is no longer mutated, so the writer can read it safely.
+                    self._db.submit(self.results.record_session, session, self.sessions[sid][1])
+                return 200, {**result, **self.describe(sid, session)}
+
+        raise HTTPError(404 if method in ("GET", "POST", "DELETE") else 405, "no such route")
+
+    async def expire_idle(self, every=60):
+        while True:
+            await asyncio.sleep(every)
+            cutoff = time.monotonic() - self.idle_timeout
+            for sid in [sid for sid, (_, _, seen) in self.sessions.items() if seen < cutoff]:
+                del self.sessions[sid]
+
+    # ---------------- HTTP ---------------- #
+
+    async def serve_client(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, path, version = lines[0].split(" ", 2)
+                except ValueError:
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        key, value = line.split(":", 1)
+                        headers[key.strip().lower()] = value.strip()
+
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                try:
+                    length = int(headers.get("content-length", 0))
+                    if length > MAX_BODY:
+                        raise HTTPError(413, "body too large")
+                    raw = await reader.readexactly(length) if length else b""
+                    body = json.loads(raw) if raw else {}
+                    if not isinstance(body, dict):
+                        raise HTTPError(400, "body must be a JSON object")
+                    status, payload = await self.handle(method, path, body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except (ValueError, UnicodeDecodeError):
+                    status, payload = 400, {"error": "invalid JSON"}
+
+                self.requests += 1
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    def close(self):
+        if self.results is not None:
+            self._db.submit(self.results.close)
+            self._db.shutdown(wait=True)
+            self.results = None
+
+
+async def start(host="127.0.0.1", port=8765, server=None):
+    """Start listening; returns (QuizServer, asyncio server)."""
+    server = server or QuizServer()
+    listener = await asyncio.start_server(server.serve_client, host, port, backlog=1024)
+    asyncio.get_running_loop().create_task(server.expire_idle())
+    return server, listener
+
+
+async def main_async(host, port, results_path):
+    server, listener = await start(host, port, QuizServer(results_path=results_path))
+    print(f"Quiz server on http://{host}:{port}")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Multi-session arithmetic quiz server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--results", default=RESULTS_FILE,
+                        help="SQLite results file ('' to keep nothing)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(main_async(args.host, args.port, args.results))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+import csv
+import json
+
+from student_columns import FIELDS, StudentRecord
+from student_core import save_students, validate_fields
+
+# ---------------------------------------------------------
+#   BULK IMPORT
+# ---------------------------------------------------------
+#   A source file is streamed row by row and checked in full before
+#   anything changes. Valid rows are then applied to the store together
+#   and written with one atomic save; if that save fails the store is
+#   rolled back, so a batch is either fully applied or not at all.
+#
+#   Rows may be complete students (code, name, c1, c2, c3, exam) or
+#   partial mark updates that name an existing code plus the fields
+#   to change, e.g. "code,exam".
+
+EXPORT_FIELDS = ("code", "name", "c1", "c2", "c3", "coursework", "exam", "percentage", "grade")
+
+
+def iter_source(path):
+    """Yield (row number, raw field dict) from a .csv, .json or .jsonl file."""
+    lower = path.lower()
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if lower.endswith(".jsonl"):
+            for n, line in enumerate(f, 1):
+                if line.strip():
+                    try:
+                        yield n, json.loads(line)
+                    except json.JSONDecodeError as e:
+                        yield n, ValueError(f"invalid JSON: {e.msg}")
+        elif lower.endswith(".json"):
+            data = json.load(f)
+            if isinstance(data, dict):
+                data = data.get("students", [])
+            for n, item in enumerate(data, 1):
+                yield n, item
+        else:
+            reader = csv.reader(f)
+            header = None
+            for n, row in enumerate(reader, 1):
+                if not row or not any(cell.strip() for cell in row):
+                    continue
+                if header is None and n == 1 and not row[0].strip().lstrip("-").isdigit():
+                    header = [cell.strip().lower() for cell in row]
+                    continue
+                keys = header or FIELDS
+                if len(row) != len(keys):
+                    yield n, ValueError(f"expected {len(keys)} fields, found {len(row)}")
+                    continue
+                yield n, dict(zip(keys, row))
+
+
+def coerce(raw):
+    """Turn a raw field dict into typed fields; raises ValueError."""
+    if isinstance(raw, Exception):
+        raise raw
+    if not isinstance(raw, dict):
+        raise ValueError("expected an object with student fields")
+    fields = {}
+    for key in FIELDS:
+        if key not in raw or raw[key] in (None, ""):
+            continue
+        value = raw[key]
+        if key == "name":
+            fields[key] = str(value).strip()
+        else:
+            try:
+                fields[key] = int(str(value).strip())
+            except ValueError:
+                raise ValueError(f"{key} must be a whole number") from None
+    if "code" not in fields:
+        raise ValueError("missing student code")
+    return fields
+
+
+def plan_import(rows, store):
+    """
+    Validate a row stream against the store without changing it.
+    Returns ({code: StudentRecord}, [(row number, reason), ...]).
+    """
+    changes = {}
+    rejected = []
+    for n, raw in rows:
+        try:
+            fields = coerce(raw)
+            validate_fields(fields)
+            code = fields["code"]
+            if len(fields) == len(FIELDS):
+                changes[code] = StudentRecord(*(fields[k] for k in FIELDS))
+                continue
+            base = changes.get(code) or store.get(code)
+            if base is None:
+                raise ValueError(f"student {code} not found for a partial update")
+            merged = StudentRecord(*base.as_tuple())
+            merged.update(fields)
+            changes[code] = merged
+        except ValueError as e:
+            rejected.append((n, str(e)))
+    return changes, rejected
+
+
+def apply_changes(store, changes):
+    """Apply planned records; returns an undo list for rollback()."""
+    undo = []
+    for code, record in changes.items():
+        old = store.get(code)
+        if old is None:
+            store.add(record)
+            undo.append((code, None))
+        else:
+            undo.append((code, old.as_tuple()))
+            store.update(code, **{k: record[k] for k in FIELDS[1:]})
+    return undo
+
+
+def rollback(store, undo):
+    for code, before in reversed(undo):
+        if before is None:
+            store.delete(code)
+        else:
+            store.update(code, **dict(zip(FIELDS[1:], before[1:])))
+
+
+def import_file(store, source, journal, strict=False):
+    """
+    Import a whole file as one transaction with a single roster write
+    through journal (a RosterJournal). If another process changed the
+    roster since it was loaded, the batch is appended to the journal in
+    one write instead. With strict=True any rejected row cancels the
+    batch. Returns {"added", "updated", "rejected"}.
+    """
+    changes, rejected = plan_import(iter_source(source), store)
+    added = sum(1 for code in changes if code not in store)
+    result = {"added": added, "updated": len(changes) - added, "rejected": rejected}
+    if (strict and rejected) or not changes:
+        result["added"] = result["updated"] = 0
+        return result
+
+    undo = apply_changes(store, changes)
+    try:
+        if not save_students(store, journal.roster_path, journal):
+            journal.record_many(changes.values())
+    except Exception:
+        rollback(store, undo)
+        raise
+    return result
+
+
+# ---------------------------------------------------------
+#   STREAMING EXPORT
+# ---------------------------------------------------------
+
+def export_rows(graded_rows, dest):
+    """
+    Write (record, percentage, grade) rows to .csv, .json or .jsonl
+    one at a time, without building the output in memory.
+    Returns the number of rows written.
+    """
+    lower = dest.lower()
+    count = 0
+    with open(dest, "w", encoding="utf-8", newline="") as f:
+        if lower.endswith(".json") or lower.endswith(".jsonl"):
+            lines = lower.endswith(".jsonl")
+            if not lines:
+                f.write("[")
+            for s, p, g in graded_rows:
+                item = json.dumps(dict(zip(EXPORT_FIELDS, (s.code, s.name, s.c1, s.c2, s.c3,
+                                                          s.coursework, s.exam, p, g))))
+                if lines:
+                    f.write(item + "\n")
+                else:
+                    f.write(("," if count else "") + "\n  " + item)
+                count += 1
+            if not lines:
+                f.write("\n]\n")
+        else:
+            writer = csv.writer(f)
+            writer.writerow(EXPORT_FIELDS)
+            for s, p, g in graded_rows:
+                writer.writerow((s.code, s.name, s.c1, s.c2, s.c3, s.coursework, s.exam, p, g))
+                count += 1
+    return count
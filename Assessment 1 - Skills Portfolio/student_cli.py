@@ -0,0 +1,212 @@
+"""
+Command line front end for the student records core (no tkinter needed).
+
+    python student_cli.py report [--asc] [--limit N]
+    python student_cli.py show CODE
+    python student_cli.py find NAME
+    python student_cli.py rank CODE
+    python student_cli.py between LOW HIGH
+    python student_cli.py stats
+    python student_cli.py add CODE NAME C1 C2 C3 EXAM
+    python student_cli.py update CODE [--name N] [--c1 X] ... [--exam X]
+    python student_cli.py delete CODE
+    python student_cli.py import FILE.(csv|json|jsonl) [--strict]
+    python student_cli.py export OUT.(csv|json|jsonl)
+    python student_cli.py compact
+"""
+import argparse
+import json
+import sys
+
+from student_bulk import export_rows, import_file
+from student_core import FILE, StudentService, format_errors
+
+# ---------------------------------------------------------
+#   OUTPUT HELPERS
+# ---------------------------------------------------------
+
+HEADER = f"{'Rank':>5}  {'Code':>5}  {'Name':<28}{'CW':>4}{'Exam':>6}{'%':>8}  Grade"
+
+
+def format_row(rank, s, p, g):
+    return f"{rank:>5}  {s.code:>5}  {s.name:<28}{s.coursework:>4}{s.exam:>6}{p:>8.2f}  {g}"
+
+
+def print_record(service, s):
+    p, g = service.graded(s)
+    print(f"Name: {s.name}\nCode: {s.code}\nCoursework: {s.coursework} / 60\n"
+          f"Exam: {s.exam} / 100\nPercentage: {p}%\nGrade: {g}")
+
+
+# ---------------------------------------------------------
+#   COMMANDS
+# ---------------------------------------------------------
+
+def cmd_report(service, args):
+    print(HEADER)
+    for rank, s in enumerate(service.ranked(reverse=not args.asc, limit=args.limit), 1):
+        print(format_row(rank, s, *service.graded(s)))
+    summary = service.summary()
+    print(f"\nTotal Students: {summary['count']}\nAverage Percentage: {summary['mean']}%")
+
+
+def cmd_show(service, args):
+    s = service.get(args.code)
+    if s is None:
+        sys.exit(f"Student {args.code} not found.")
+    print_record(service, s)
+
+
+def cmd_find(service, args):
+    for s in service.query(name=args.name):
+        print(format_row("-", s, *service.graded(s)))
+
+
+def cmd_rank(service, args):
+    rank = service.rank(args.code)
+    if rank is None:
+        sys.exit(f"Student {args.code} not found.")
+    print(f"Student {args.code} is ranked {rank} of {len(service.store)}.")
+
+
+def cmd_between(service, args):
+    print(HEADER)
+    for s in service.between(args.low, args.high):
+        print(format_row(service.rank(s.code), s, *service.graded(s)))
+
+
+def cmd_stats(service, args):
+    print(json.dumps(service.summary(), indent=2))
+
+
+def cmd_add(service, args):
+    try:
+        service.add(args.code, args.name, args.c1, args.c2, args.c3, args.exam)
+    except ValueError as e:
+        sys.exit(str(e))
+    print(f"Added {args.code}.")
+
+
+def cmd_update(service, args):
+    changes = {k: v for k, v in vars(args).items()
+               if k in ("name", "c1", "c2", "c3", "exam") and v is not None}
+    try:
+        service.update(args.code, **changes)
+    except KeyError:
+        sys.exit(f"Student {args.code} not found.")
+    except ValueError as e:
+        sys.exit(str(e))
+    print(f"Updated {args.code}.")
+
+
+def cmd_delete(service, args):
+    if service.delete(args.code) is None:
+        sys.exit(f"Student {args.code} not found.")
+    print(f"Deleted {args.code}.")
+
+
+def cmd_import(service, args):
+    try:
+        result = import_file(service.store, args.source, service.journal, strict=args.strict)
+    except (OSError, ValueError) as e:
+        sys.exit(f"Could not read {args.source}: {e}")
+    if result["rejected"]:
+        print(f"Rejected {len(result['rejected'])} rows:\n{format_errors(result['rejected'])}",
+              file=sys.stderr)
+        if args.strict:
+            sys.exit("Nothing imported (--strict).")
+    print(f"Imported {result['added']} new and {result['updated']} updated students.")
+
+
+def cmd_export(service, args):
+    count = export_rows(service.stats.rows(), args.dest)
+    print(f"Exported {count} students to {args.dest}.")
+
+
+def cmd_compact(service, args):
+    service.save()
+    print(f"Compacted {service.path}.")
+
+
+# ---------------------------------------------------------
+#   ENTRY POINT
+# ---------------------------------------------------------
+
+def positive_int(text):
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {value}")
+    return value
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Student records batch tool.")
+    parser.add_argument("--file", default=FILE, help="roster file (default: %(default)s)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("report", help="ranked report")
+    p.add_argument("--asc", action="store_true", help="lowest first")
+    p.add_argument("--limit", type=positive_int)
+    p.set_defaults(func=cmd_report)
+
+    p = sub.add_parser("show", help="one student by code")
+    p.add_argument("code", type=int)
+    p.set_defaults(func=cmd_show)
+
+    p = sub.add_parser("find", help="students by name prefix")
+    p.add_argument("name")
+    p.set_defaults(func=cmd_find)
+
+    p = sub.add_parser("rank", help="rank of one student")
+    p.add_argument("code", type=int)
+    p.set_defaults(func=cmd_rank)
+
+    p = sub.add_parser("between", help="students with a percentage in a range")
+    p.add_argument("low", type=float)
+    p.add_argument("high", type=float)
+    p.set_defaults(func=cmd_between)
+
+    sub.add_parser("stats", help="class statistics as JSON").set_defaults(func=cmd_stats)
+
+    p = sub.add_parser("add", help="add a student")
+    p.add_argument("code", type=int)
+    p.add_argument("name")
+    for field in ("c1", "c2", "c3", "exam"):
+        p.add_argument(field, type=int)
+    p.set_defaults(func=cmd_add)
+
+    p = sub.add_parser("update", help="change fields of a student")
+    p.add_argument("code", type=int)
+    p.add_argument("--name")
+    for field in ("c1", "c2", "c3", "exam"):
+        p.add_argument(f"--{field}", type=int)
+    p.set_defaults(func=cmd_update)
+
+    p = sub.add_parser("delete", help="delete a student")
+    p.add_argument("code", type=int)
+    p.set_defaults(func=cmd_delete)
+
+    p = sub.add_parser("import", help="add or update students from a CSV/JSON file in one transaction")
+    p.add_argument("source")
+    p.add_argument("--strict", action="store_true", help="import nothing if any row is rejected")
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("export", help="export graded roster to .csv, .json or .jsonl")
+    p.add_argument("dest")
+    p.set_defaults(func=cmd_export)
+
+    sub.add_parser("compact", help="fold the journal into the roster file").set_defaults(func=cmd_compact)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    service = StudentService(args.file)
+    if service.errors:
+        print(f"Warning: skipped lines in {args.file}:\n{format_errors(service.errors)}",
+              file=sys.stderr)
+    args.func(service, args)
+
+
+if __name__ == "__main__":
+    main()
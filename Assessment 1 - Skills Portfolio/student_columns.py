@@ -0,0 +1,126 @@
+from array import array
+
+from student_io import grade, total_percentage
+
+# ---------------------------------------------------------
+#   COMPACT STUDENT RECORD
+# ---------------------------------------------------------
+
+FIELDS = ("code", "name", "c1", "c2", "c3", "exam")
+
+
+class StudentRecord:
+    """Slotted student record that still supports s["name"] style access."""
+
+    __slots__ = FIELDS
+
+    def __init__(self, code, name, c1, c2, c3, exam):
+        self.code = code
+        self.name = name
+        self.c1 = c1
+        self.c2 = c2
+        self.c3 = c3
+        self.exam = exam
+
+    @classmethod
+    def from_mapping(cls, m):
+        return cls(m["code"], m["name"], m["c1"], m["c2"], m["c3"], m["exam"])
+
+    @property
+    def coursework(self):
+        return self.c1 + self.c2 + self.c3
+
+    def __getitem__(self, key):
+        if key == "coursework" or key in FIELDS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key not in FIELDS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def update(self, changes):
+        for key, value in changes.items():
+            self[key] = value
+
+    def as_tuple(self):
+        return (self.code, self.name, self.c1, self.c2, self.c3, self.exam)
+
+    def __repr__(self):
+        return "StudentRecord(%r, %r, %r, %r, %r, %r)" % self.as_tuple()
+
+
+# ---------------------------------------------------------
+#   COLUMNAR ROSTER
+# ---------------------------------------------------------
+
+class StudentColumns:
+    """
+    Struct-of-arrays roster: codes and marks live in typed int arrays,
+    names in one UTF-8 string table addressed by offsets.
+    """
+
+    def __init__(self, rows=()):
+        self.code = array("i")
+        self.c1 = array("i")
+        self.c2 = array("i")
+        self.c3 = array("i")
+        self.exam = array("i")
+        self._names = bytearray()
+        self._offsets = array("I", [0])
+        for row in rows:
+            self.append(row)
+
+    def __len__(self):
+        return len(self.code)
+
+    def append(self, row):
+        """Append a (code, name, c1, c2, c3, exam) row."""
+        code, name, c1, c2, c3, exam = row
+        self.code.append(code)
+        self.c1.append(c1)
+        self.c2.append(c2)
+        self.c3.append(c3)
+        self.exam.append(exam)
+        self._names += name.encode("utf-8")
+        self._offsets.append(len(self._names))
+
+    def name(self, i):
+        return self._names[self._offsets[i]:self._offsets[i + 1]].decode("utf-8")
+
+    def __getitem__(self, i):
+        """Return row i as a StudentRecord for the per-student display code."""
+        if i < 0:
+            i += len(self)
+        return StudentRecord(self.code[i], self.name(i),
+                             self.c1[i], self.c2[i], self.c3[i], self.exam[i])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    # ---------------- Column maths ---------------- #
+
+    def totals(self):
+        return array("i", map(lambda a, b, c, d: a + b + c + d,
+                              self.c1, self.c2, self.c3, self.exam))
+
+    def percentages(self):
+        return array("d", map(total_percentage, self.totals()))
+
+    def grades(self):
+        return [grade(p) for p in self.percentages()]
+
+    def order(self, reverse=False):
+        """Row indices sorted by percentage, leaving the columns untouched."""
+        totals = self.totals()
+        return sorted(range(len(totals)), key=totals.__getitem__, reverse=reverse)
+
+    def argmax(self):
+        totals = self.totals()
+        return max(range(len(totals)), key=totals.__getitem__) if totals else None
+
+    def argmin(self):
+        totals = self.totals()
+        return min(range(len(totals)), key=totals.__getitem__) if totals else None
@@ -0,0 +1,280 @@
+import os
+
+from file_watch import file_lock, signature
+from instrument import timed
+from student_columns import StudentRecord
+from student_io import grade, iter_students, total_percentage
+from student_journal import RosterJournal
+from student_stats import RosterStats
+from student_store import StudentStore
+from student_versions import RosterHistory
+
+# ---------------------------------------------------------
+#   HEADLESS STUDENT RECORDS CORE
+# ---------------------------------------------------------
+#   Everything here works without tkinter, so it can be imported
+#   by the GUI, the command line tool, batch jobs and benchmarks.
+
+FILE = "studentMarks.txt"
+
+# Allowed ranges for each numeric field (inclusive)
+LIMITS = {
+    "code": (1000, 9999),
+    "c1": (0, 20),
+    "c2": (0, 20),
+    "c3": (0, 20),
+    "exam": (0, 100)
+}
+
+
+def validate_fields(fields):
+    """Raise ValueError if any given field is out of range or unusable."""
+    for key, value in fields.items():
+        if key == "name":
+            if not value or not value.strip():
+                raise ValueError("name must not be empty")
+            if "," in value or "\n" in value:
+                raise ValueError("name must not contain commas or line breaks")
+        elif key in LIMITS:
+            lo, hi = LIMITS[key]
+            if not isinstance(value, int) or not lo <= value <= hi:
+                raise ValueError(f"{key} must be a whole number from {lo} to {hi}")
+
+
+@timed("student.load")
+def load_students(path=FILE, errors=None, journal=None):
+    """
+    Load a roster (base file + journal) into a StudentStore.
+    Skipped lines are appended to errors as (line number, reason).
+    A RosterJournal passed in remembers what was read, for later
+    catch_up() and safe compaction.
+    """
+    journal = journal or RosterJournal(path)
+    with file_lock(path, shared=True):
+        if not os.path.exists(path):
+            with open(path, "w") as f:
+                f.write("0\n")
+
+        students = StudentStore()
+        duplicates = []  # keep the first record for a duplicated code
+        students.extend((StudentRecord(*row) for row in iter_students(path, errors)), duplicates)
+        if errors is not None:
+            errors.extend((None, f"duplicate student code {s.code}") for s in duplicates)
+
+        journal.roster_signature = signature(path)
+        journal.replay(students)
+    return students
+
+
+@timed("student.save")
+def save_students(students, path=FILE, journal=None):
+    """
+    Write the full roster and fold away any pending journal. With the
+    journal used to load students, the write is skipped (returning
+    False) if another instance changed the files since.
+    """
+    if journal is None:
+        return RosterJournal(path).compact(students, force=True)
+    return journal.compact(students)
+
+
+def sync_students(students, journal, path=FILE):
+    """
+    Bring a loaded store up to date with the files on disk, touching
+    only the rows that differ. New journal lines are replayed directly;
+    if the roster itself was replaced, it is re-read and diffed by code.
+    Returns the number of rows changed.
+    """
+    changed = catch_up_students(students, journal, path)
+    if changed is None:
+        changed = merge_roster(students, journal, reread_roster(journal, path))
+    return changed
+
+
+def catch_up_students(students, journal, path=FILE):
+    """
+    Replay journal lines appended since we last looked (cheap). Returns
+    rows changed, or None if the roster or journal was replaced and has
+    to go through reread_roster() and merge_roster() instead.
+    """
+    with file_lock(path, shared=True):
+        if signature(path) != journal.roster_signature:
+            return None
+        return journal.catch_up(students)
+
+
+def reread_roster(journal, path=FILE):
+    """
+    Read a replaced roster into a fresh (store, journal) pair. This is
+    the slow part of a sync and touches neither argument, so a GUI can
+    run it on a worker thread.
+    """
+    fresh_journal = RosterJournal(path, journal.compact_at)
+    return load_students(path, journal=fresh_journal), fresh_journal
+
+
+def merge_roster(students, journal, reread):
+    """Apply a reread_roster() result to students, diffing by code; returns rows changed."""
+    fresh, fresh_journal = reread
+    changed = 0
+    for s in list(students):
+        if s.code not in fresh:
+            students.delete(s.code)
+            changed += 1
+    for s in fresh:
+        old = students.get(s.code)
+        if old is None:
+            students.add(StudentRecord(*s.as_tuple()))
+            changed += 1
+        elif old.as_tuple() != s.as_tuple():
+            students.update(s.code, name=s.name, c1=s.c1, c2=s.c2, c3=s.c3, exam=s.exam)
+            changed += 1
+
+    journal.inode = fresh_journal.inode
+    journal.offset = fresh_journal.offset
+    journal.roster_signature = fresh_journal.roster_signature
+    return changed
+
+
+def percentage(s):
+    return total_percentage(s["coursework"] + s["exam"])
+
+
+def format_errors(errors, limit=10):
+    lines = [f"Line {n}: {reason}" if n else reason for n, reason in errors[:limit]]
+    if len(errors) > limit:
+        lines.append(f"... and {len(errors) - limit} more")
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------
+#   SERVICE API
+# ---------------------------------------------------------
+
+class StudentService:
+    """Query, edit and analyse one roster file; edits are journaled immediately."""
+
+    def __init__(self, path=FILE):
+        self.path = path
+        self.errors = []
+        self.journal = RosterJournal(path)
+        self.store = load_students(path, self.errors, self.journal)
+        self.stats = RosterStats(self.store)
+        self.history = RosterHistory(self.store)
+
+    # ---------------- Queries ---------------- #
+
+    def get(self, code):
+        return self.store.get(code)
+
+    def query(self, code=None, name=None):
+        """Records matching a code and/or a name prefix (all records if neither)."""
+        if code is not None:
+            s = self.store.get(code)
+            found = [s] if s is not None else []
+            if name is not None:
+                found = [s for s in found if s.name.lower().startswith(name.lower())]
+            return found
+        if name is not None:
+            return self.store.find_by_name(name)
+        return list(self.store)
+
+    def graded(self, s):
+        """(percentage, grade) for one record."""
+        return self.stats.of(s.code)
+
+    def ranked(self, reverse=True, limit=None):
+        return self.store.top(limit) if reverse else self.store.bottom(limit)
+
+    def rank(self, code):
+        return self.store.rank(code)
+
+    def between(self, low, high):
+        return self.store.between(low, high)
+
+    def summary(self):
+        return self.stats.summary()
+
+    # ---------------- Edits ---------------- #
+
+    def add(self, code, name, c1, c2, c3, exam):
+        validate_fields({"code": code, "name": name, "c1": c1, "c2": c2, "c3": c3, "exam": exam})
+        if code in self.store:
+            raise ValueError(f"Duplicate student code: {code}")
+        before = self.history.capture([code])
+        s = self.store.add(StudentRecord(code, name, c1, c2, c3, exam))
+        self.history.record(f"Add {code}", before)
+        self._logged_put(s)
+        return s
+
+    def update(self, code, **changes):
+        validate_fields(changes)
+        if code not in self.store:
+            raise KeyError(code)
+        before = self.history.capture([code])
+        s = self.store.update(code, **changes)
+        self.history.record(f"Update {code}", before)
+        self._logged_put(s)
+        return s
+
+    def delete(self, code):
+        if code not in self.store:
+            return None
+        before = self.history.capture([code])
+        s = self.store.delete(code)
+        self.history.record(f"Delete {code}", before)
+        self.journal.record_delete(code)
+        self._maybe_compact()
+        return s
+
+    def undo(self):
+        """Revert the last edit (and journal the result); returns its label or None."""
+        return self._journal_history(self.history.undo())
+
+    def redo(self):
+        return self._journal_history(self.history.redo())
+
+    def _journal_history(self, result):
+        if result is None:
+            return None
+        label, puts, deletes = result
+        if puts:
+            self.journal.record_many(puts)
+        for code in deletes:
+            self.journal.record_delete(code)
+        self._maybe_compact()
+        return label
+
+    def view(self, version=None):
+        """Read-only roster as of an earlier version (see RosterHistory.versions())."""
+        return self.history.view(version)
+
+    def sync(self):
+        """
+        Pick up changes other processes made to the roster; returns rows
+        changed. Undo history is dropped if anything changed, since
+        undoing across someone else's edit could overwrite it.
+        """
+        changed = sync_students(self.store, self.journal, self.path)
+        if changed:
+            self.history.reset()
+        return changed
+
+    def save(self):
+        """
+        Fold pending journal entries into the roster file. Every edit is
+        already journaled, so merging other processes' changes first
+        cannot lose anything of ours.
+        """
+        if not save_students(self.store, self.path, self.journal):
+            self.sync()
+            save_students(self.store, self.path, self.journal)
+
+    def _logged_put(self, s):
+        self.journal.record_put(s)
+        self._maybe_compact()
+
+    def _maybe_compact(self):
+        if self.journal.needs_compaction():
+            self.save()
+
@@ -0,0 +1,55 @@
+"""
+Synthetic studentMarks.txt generator for benchmarks.
+
+    python student_datagen.py OUT.txt ROWS [--malformed 0.001] [--seed 1] [--first-code 1000]
+
+Codes are unique and count up from --first-code (1000), so rosters bigger than the
+brief's 4-digit range (9000 students) get 5+ digit codes; the loader
+accepts them, only the add/import validation enforces 1000-9999.
+"""
+import argparse
+import random
+
+FIRST = ["Jake", "Emily", "Mark", "Sarah", "Daniel", "Aisha", "Omar", "Priya",
+         "Liam", "Chloe", "Noah", "Fatima", "Ethan", "Zara", "Lucas", "Maya"]
+LAST = ["Hobbs", "Stone", "Johnson", "Ahmed", "Green", "Khan", "Patel", "Smith",
+        "Brown", "Wilson", "Taylor", "Ali", "Evans", "Thomas", "Roberts", "Walker"]
+
+MALFORMED = [
+    "{code},{name},10,11",            # too few fields
+    "{code},{name},x,11,10,43",       # non-integer mark
+    "not a student line",
+    "{code},,10,11,10,43",            # missing name
+]
+
+
+def generate_roster(path, rows, malformed=0.0, seed=1, first_code=1000):
+    """Write a roster with rows valid students plus a share of bad lines."""
+    rng = random.Random(seed)
+    with open(path, "w") as f:
+        f.write(f"{rows}\n")
+        for i in range(rows):
+            code = first_code + i
+            name = f"{rng.choice(FIRST)} {rng.choice(LAST)}"
+            if malformed and rng.random() < malformed:
+                f.write(rng.choice(MALFORMED).format(code=code, name=name) + "\n")
+            c1, c2, c3 = rng.randint(0, 20), rng.randint(0, 20), rng.randint(0, 20)
+            f.write(f"{code},{name},{c1},{c2},{c3},{rng.randint(0, 100)}\n")
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic student roster.")
+    parser.add_argument("out")
+    parser.add_argument("rows", type=int)
+    parser.add_argument("--malformed", type=float, default=0.001,
+                        help="share of extra malformed lines (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--first-code", type=int, default=1000,
+                        help="code of the first student, to keep shards apart")
+    args = parser.parse_args(argv)
+    generate_roster(args.out, args.rows, args.malformed, args.seed, args.first_code)
+
+
+if __name__ == "__main__":
+    main()
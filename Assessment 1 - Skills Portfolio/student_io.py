@@ -0,0 +1,136 @@
+# ---------------------------------------------------------
+#   STREAMING ROSTER READER
+# ---------------------------------------------------------
+#   Reads studentMarks.txt in fixed-size chunks and yields one
+#   compact (code, name, c1, c2, c3, exam) tuple per valid row, so
+#   callers that only need a total or a single student never hold
+#   the whole file in memory.
+
+CHUNK_SIZE = 64 * 1024
+TOTAL_MARKS = 160  # 3 x 20 coursework + 100 exam
+
+
+def iter_lines(path, chunk_size=CHUNK_SIZE):
+    """Yield (line number, text) pairs, reading the file chunk by chunk."""
+    lineno = 0
+    tail = ""
+    with open(path, "r") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            lines = (tail + chunk).split("\n")
+            tail = lines.pop()
+            for line in lines:
+                lineno += 1
+                yield lineno, line
+    if tail:
+        yield lineno + 1, tail
+
+
+def parse_row(line):
+    """Parse one CSV row; raises ValueError with a readable reason."""
+    parts = line.split(",")
+    if len(parts) != 6:
+        raise ValueError(f"expected 6 fields, found {len(parts)}")
+    name = parts[1].strip()
+    if not name:
+        raise ValueError("missing name")
+    try:
+        code, c1, c2, c3, exam = (int(parts[i]) for i in (0, 2, 3, 4, 5))
+    except ValueError:
+        raise ValueError("code and marks must be whole numbers") from None
+    return code, name, c1, c2, c3, exam
+
+
+def iter_students(path, errors=None, chunk_size=CHUNK_SIZE):
+    """
+    Yield student tuples from a roster file.
+    Malformed lines are skipped; if an errors list is given, a
+    (line number, reason) pair is appended to it for each one.
+    """
+    header_seen = False
+    expected = None
+    count = 0
+
+    for lineno, raw in iter_lines(path, chunk_size):
+        line = raw.strip()
+        if not line:
+            continue
+
+        if not header_seen:
+            header_seen = True
+            try:
+                expected = int(line)
+                continue
+            except ValueError:
+                if errors is not None:
+                    errors.append((lineno, "first line should be the student count"))
+                if "," not in line:
+                    continue
+
+        try:
+            row = parse_row(line)
+        except ValueError as e:
+            if errors is not None:
+                errors.append((lineno, str(e)))
+            continue
+
+        count += 1
+        yield row
+
+    if errors is not None and expected is not None and expected != count:
+        errors.append((1, f"header says {expected} students, found {count}"))
+
+
+# ---------------------------------------------------------
+#   SINGLE-PASS QUERIES
+# ---------------------------------------------------------
+
+def total_percentage(total):
+    """Percentage for total marks; every view rounds through here so they agree."""
+    return round(total / TOTAL_MARKS * 100, 2)
+
+
+def row_percentage(row):
+    return total_percentage(sum(row[2:6]))
+
+
+def grade(p):
+    if p >= 70: return "A"
+    if p >= 60: return "B"
+    if p >= 50: return "C"
+    if p >= 40: return "D"
+    return "F"
+
+
+def summarize(rows):
+    """Count, average, highest and lowest of a row stream in one pass."""
+    count = 0
+    total = 0.0
+    best = worst = None
+    best_p = worst_p = None
+
+    for row in rows:
+        p = row_percentage(row)
+        count += 1
+        total += p
+        if best is None or p > best_p:
+            best, best_p = row, p
+        if worst is None or p < worst_p:
+            worst, worst_p = row, p
+
+    return {
+        "count": count,
+        "average": round(total / count, 2) if count else 0.0,
+        "highest": best,
+        "lowest": worst
+    }
+
+
+def find_student(rows, code):
+    """Return the first row with the given code, stopping early."""
+    for row in rows:
+        if row[0] == code:
+            return row
+    return None
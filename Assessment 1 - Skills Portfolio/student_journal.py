@@ -0,0 +1,183 @@
+import os
+
+from file_watch import file_lock, signature
+from instrument import count, timed
+
+# ---------------------------------------------------------
+#   JOURNALED ROSTER STORAGE
+# ---------------------------------------------------------
+#   Edits are appended to "<roster>.journal" as one line each:
+#       P,code,name,c1,c2,c3,exam   (add or update a student)
+#       D,code                      (delete a student)
+#   Both operations are idempotent, so replaying a journal over a
+#   base file that already contains its changes is harmless.
+#
+#   Several instances may share one roster. Appends and compactions hold
+#   the roster's exclusive lock. Each journal remembers how far it has
+#   replayed (inode + byte offset) and the roster version it loaded, so
+#   another instance's appends can be applied incrementally, and it
+#   refuses to compact over changes it has not merged yet.
+
+COMPACT_AT = 256 * 1024  # fold the journal back into the roster past this size
+
+
+@timed("student.write_roster")
+def write_roster(path, students, task=None):
+    """
+    Atomically write the canonical count + CSV roster file.
+    An optional background Task gets progress updates and may cancel
+    the write, in which case the original file is left untouched.
+    """
+    tmp = path + ".tmp"
+    total = len(students)
+    try:
+        with open(tmp, "w") as f:
+            f.write(str(total) + "\n")
+            for i, s in enumerate(students):
+                f.write(f"{s['code']},{s['name']},{s['c1']},{s['c2']},{s['c3']},{s['exam']}\n")
+                if task is not None and i % 10000 == 0:
+                    task.check()
+                    task.progress(i / total)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+class RosterJournal:
+    """Append-only change log kept next to a roster file."""
+
+    def __init__(self, roster_path, compact_at=COMPACT_AT):
+        self.roster_path = roster_path
+        self.path = roster_path + ".journal"
+        self.compact_at = compact_at
+        self.inode = None   # journal file the offset refers to
+        self.offset = 0     # bytes of it already applied to our store
+        self.roster_signature = None  # roster version our store was built from
+
+    # ---------------- Writing ---------------- #
+
+    def record_put(self, s):
+        self._append(f"P,{s['code']},{s['name']},{s['c1']},{s['c2']},{s['c3']},{s['exam']}\n")
+
+    def record_many(self, students):
+        """Log several puts with a single append and fsync."""
+        self._append("".join(f"P,{s['code']},{s['name']},{s['c1']},{s['c2']},{s['c3']},{s['exam']}\n"
+                             for s in students))
+
+    def record_delete(self, code):
+        self._append(f"D,{code}\n")
+
+    def _append(self, line):
+        count("student.journal_appends")
+        data = line.encode("utf-8")
+        with file_lock(self.roster_path):
+            with open(self.path, "ab") as f:
+                # Only skip past our own line if nobody else wrote since our last sync.
+                st = os.fstat(f.fileno())
+                in_sync = st.st_size == self.offset and self.inode in (None, st.st_ino)
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            if in_sync:
+                self.inode = st.st_ino
+                self.offset += len(data)
+
+    # ---------------- Replay & compaction ---------------- #
+
+    def replay(self, store, start=0):
+        """
+        Apply logged changes from byte offset start to a StudentStore;
+        returns how many applied and remembers where it stopped.
+        """
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            self.inode, self.offset = None, 0
+            return 0
+
+        applied = 0
+        with f:
+            self.inode = os.fstat(f.fileno()).st_ino
+            f.seek(start)
+            self.offset = start
+            for raw in f:
+                if not raw.endswith(b"\n"):  # torn write from a crash
+                    break
+                self.offset += len(raw)
+                parts = raw.decode("utf-8", "replace").rstrip("\n").split(",")
+                try:
+                    if parts[0] == "P" and len(parts) == 7:
+                        code = int(parts[1])
+                        fields = {
+                            "name": parts[2],
+                            "c1": int(parts[3]),
+                            "c2": int(parts[4]),
+                            "c3": int(parts[5]),
+                            "exam": int(parts[6])
+                        }
+                        if code in store:
+                            store.update(code, **fields)
+                        else:
+                            store.add({"code": code, **fields})
+                    elif parts[0] == "D" and len(parts) == 2:
+                        store.delete(int(parts[1]))
+                    else:
+                        continue
+                except ValueError:
+                    continue
+                applied += 1
+        return applied
+
+    def catch_up(self, store):
+        """
+        Apply only lines appended since the last replay. Returns how many
+        were applied, or None if the journal was replaced or truncated
+        (another instance compacted) and the caller must reload.
+        """
+        current = signature(self.path)
+        if current is None:
+            return 0 if self.offset == 0 else None
+        inode, size, _ = current
+        if inode != self.inode and self.inode is not None or size < self.offset:
+            return None
+        if size == self.offset:
+            return 0
+        return self.replay(store, self.offset)
+
+    def synced(self):
+        """True when our store reflects everything on disk (roster and journal)."""
+        if signature(self.roster_path) != self.roster_signature:
+            return False
+        current = signature(self.path)
+        if current is None:
+            return self.offset == 0
+        return current[0] == self.inode and current[1] == self.offset
+
+    def size(self):
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def needs_compaction(self):
+        return self.size() > self.compact_at
+
+    def compact(self, students, task=None, force=False):
+        """
+        Fold the journal into the roster file, then discard the journal.
+        Unless force is set, nothing is written (and False is returned)
+        while another instance has changes we have not merged; the
+        journal keeps them safe until a later attempt.
+        """
+        with file_lock(self.roster_path):
+            if not force and not self.synced():
+                return False
+            write_roster(self.roster_path, students, task)
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self.inode, self.offset = None, 0
+            self.roster_signature = signature(self.roster_path)
+        return True
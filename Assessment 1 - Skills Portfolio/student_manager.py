@@ -1,71 +1,18 @@
 import tkinter as tk
-from tkinter import messagebox, simpledialog, ttk
-import os
-
-FILE = "studentMarks.txt"
-
-# ---------------------------------------------------------
-#   FILE HANDLING & UTILITIES
-# ---------------------------------------------------------
-
-def load_students():
-    if not os.path.exists(FILE):
-        with open(FILE, "w") as f:
-            f.write("0\n")
-        return []
-
-    with open(FILE, "r") as f:
-        lines = [line.strip() for line in f.readlines() if line.strip()]
-
-    if len(lines) < 1:
-        return []
-
-    try:
-        student_count = int(lines[0])
-    except:
-        messagebox.showerror("Error", "Invalid studentMarks.txt format.")
-        return []
-
-    students = []
-    for line in lines[1:]:
-        parts = line.split(",")
-        if len(parts) != 6:  
-            continue
-        code = int(parts[0])
-        name = parts[1]
-        c1, c2, c3 = map(int, parts[2:5])
-        exam = int(parts[5])
-
-        students.append({
-            "code": code,
-            "name": name,
-            "c1": c1,
-            "c2": c2,
-            "c3": c3,
-            "coursework": c1 + c2 + c3,
-            "exam": exam
-        })
-
-    return students
-
-
-def save_students(students):
-    with open(FILE, "w") as f:
-        f.write(str(len(students)) + "\n")
-        for s in students:
-            f.write(f"{s['code']},{s['name']},{s['c1']},{s['c2']},{s['c3']},{s['exam']}\n")
-
-
-def percentage(s):
-    return round((s["coursework"] + s["exam"]) / 160 * 100, 2)
-
-
-def grade(p):
-    if p >= 70: return "A"
-    if p >= 60: return "B"
-    if p >= 50: return "C"
-    if p >= 40: return "D"
-    return "F"
+from tkinter import filedialog, messagebox, simpledialog, ttk
+
+from file_watch import FileWatcher
+from instrument import sample_event_loop, startup_paint, startup_ready, timed
+from student_columns import StudentColumns, StudentRecord
+from student_core import (FILE, catch_up_students, format_errors, grade, load_students,
+                          merge_roster, reread_roster, save_students, sync_students,
+                          validate_fields)
+from student_io import row_percentage, total_percentage
+from student_journal import RosterJournal
+from student_stats import RosterStats, compute_summary
+from student_versions import RosterHistory
+from student_views import VirtualTable
+from task_runner import TaskRunner
 
 
 # ---------------------------------------------------------
@@ -76,7 +23,7 @@ class StudentGUI:
     def __init__(self, root):
         self.root = root
         self.root.title("Student Manager – Automotive Edition")
-        self.root.geometry("950x600")
+        self.root.geometry("950x680")
 
         # Automotive dashboard palette
         BG = "#1A1D21"         # carbon dark
@@ -86,7 +33,20 @@ class StudentGUI:
         BUTTON_BG = "#2B2F33"  # graphite steel
 
         self.root.configure(bg=BG)
-        self.students = load_students()
+        startup_paint(root)
+        # The roster is loaded in the background once the window is up;
+        # until then students is None and the buttons are disabled.
+        self.journal = RosterJournal(FILE)
+        self.students = None
+        self.stats = None
+        self.history = None  # undo/redo over edits, made once the roster is loaded
+        self.runner = TaskRunner(root, on_progress=self.update_progress)
+        self.watcher = FileWatcher(root)
+        self._compacting = False
+        self._rereading = False
+        self.cohort_dir = None  # folder of roster files for cross-cohort reports
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+        sample_event_loop(root)
 
         # Title
         tk.Label(
@@ -97,9 +57,12 @@ class StudentGUI:
             bg=BG
         ).pack(pady=20)
 
-        # Output Panel
+        # Output Panel (detail text and record table share this space)
+        self.panel = tk.Frame(root, bg=BG)
+        self.panel.pack(pady=10)
+
         self.output = tk.Text(
-            root,
+            self.panel,
             width=110,
             height=22,
             bg=PANEL,
@@ -110,7 +73,7 @@ class StudentGUI:
             highlightthickness=1,
             highlightbackground="#333"
         )
-        self.output.pack(pady=10)
+        self.output.pack()
 
         # Tkinter button styling
         style = ttk.Style()
@@ -127,6 +90,31 @@ class StudentGUI:
                   background=[("active", ACCENT)],
                   foreground=[("active", "black")])
 
+        style.configure("Dashboard.Treeview",
+                        background=PANEL,
+                        fieldbackground=PANEL,
+                        foreground=TEXT_LIGHT,
+                        rowheight=24,
+                        font=("Consolas", 11))
+
+        style.configure("Dashboard.Treeview.Heading",
+                        background=BUTTON_BG,
+                        foreground=ACCENT,
+                        font=("Segoe UI", 11))
+
+        # Record Table (only the rows scrolled into view are built)
+        self.table_frame = tk.Frame(self.panel, bg=BG)
+        self.table = VirtualTable(
+            self.table_frame,
+            columns=("Name", "Code", "Coursework", "Exam", "Percentage", "Grade"),
+            widths=(260, 90, 120, 100, 120, 80),
+            bg=BG
+        )
+        self.table.pack(fill="both", expand=True)
+        self.table_footer = tk.Label(self.table_frame, text="", font=("Consolas", 12),
+                                     fg=ACCENT, bg=BG, anchor="w")
+        self.table_footer.pack(fill="x", pady=(6, 0))
+
         # Button Frame
         frame = tk.Frame(root, bg=BG)
         frame.pack(pady=10)
@@ -137,102 +125,335 @@ class StudentGUI:
             ("Highest Score", self.highest),
             ("Lowest Score", self.lowest),
             ("Sort Records", self.sort_records),
+            ("Score Range", self.score_range),
             ("Add Student", self.add_student),
             ("Delete Student", self.delete_student),
-            ("Update Student", self.update_student)
+            ("Update Student", self.update_student),
+            ("Class Statistics", self.show_stats),
+            ("Bulk Import", self.import_records),
+            ("Export Grades", self.export_records),
+            ("Cohort Report", self.cohort_report),
+            ("Find in Cohorts", self.find_in_cohorts),
+            ("Undo", self.undo),
+            ("Redo", self.redo)
         ]
 
+        self.buttons = []
         for i, (text, cmd) in enumerate(buttons):
-            ttk.Button(frame, text=text, command=cmd, width=20,
-                       style="Dashboard.TButton").grid(
-                row=i // 2, column=i % 2, padx=12, pady=6
-            )
+            button = ttk.Button(frame, text=text, command=cmd, width=20,
+                                style="Dashboard.TButton", state="disabled")
+            button.grid(row=i // 3, column=i % 3, padx=12, pady=6)
+            self.buttons.append(button)
+
+        # Status Bar (background task progress)
+        status = tk.Frame(root, bg=BG)
+        status.pack(fill="x", side="bottom", padx=20, pady=(0, 10))
+
+        self.status_label = tk.Label(status, text="Ready", font=("Segoe UI", 10),
+                                     fg=TEXT_LIGHT, bg=BG, anchor="w")
+        self.status_label.pack(side="left")
+
+        self.cancel_button = ttk.Button(status, text="Cancel", style="Dashboard.TButton",
+                                        command=self.runner.cancel_all, state="disabled")
+        self.cancel_button.pack(side="right")
+
+        self.progress = ttk.Progressbar(status, length=200, mode="determinate", maximum=1.0)
+        self.progress.pack(side="right", padx=10)
+
+        self.show(f"Loading {FILE}...")
+        errors = []
+        self.runner.submit("Loading records",
+                           lambda task: load_students(FILE, errors, self.journal),
+                           on_done=lambda students: self.records_loaded(students, errors),
+                           on_error=self.load_failed)
+
+    # ---------------------------------------------------------
+    #   Startup
+    # ---------------------------------------------------------
+
+    def records_loaded(self, students, errors):
+        self.students = students
+        self.stats = RosterStats(students)
+        self.history = RosterHistory(students)
+        self.root.bind("<Control-z>", lambda e: self.undo())
+        self.root.bind("<Control-y>", lambda e: self.redo())
+        # Another instance (or an editor) may change the roster while we run.
+        for path in (FILE, self.journal.path):
+            self.watcher.watch(path, self.on_disk_change)
+        for button in self.buttons:
+            button.state(["!disabled"])
+        self.show(f"Loaded {len(students)} student records from {FILE}.")
+        startup_ready(self.root)
+        if errors:
+            messagebox.showwarning("Skipped Lines",
+                                   f"Some lines in {FILE} were skipped:\n\n{format_errors(errors)}")
+
+    def load_failed(self, error):
+        self.show(f"Could not load {FILE}:\n{error}")
+        messagebox.showerror("Load Failed", f"Could not load {FILE}:\n{error}")
 
     # ---------------------------------------------------------
     #   Display Helper
     # ---------------------------------------------------------
 
+    @timed("student.show")
     def show(self, content):
+        self.table_frame.pack_forget()
+        self.output.pack()
         self.output.delete("1.0", tk.END)
         self.output.insert(tk.END, content)
 
+    @timed("student.show_table")
+    def show_table(self, count, record_at, caption=""):
+        """Show count records in the virtual table with a class summary footer."""
+        def row_at(i):
+            s = record_at(i)
+            p, g = self.stats.of(s.code)
+            return (s.name, s.code, f"{s.coursework} / 60", f"{s.exam} / 100", f"{p}%", g)
+
+        self.output.pack_forget()
+        self.table_frame.pack(fill="both", expand=True)
+        self.table.set_source(count, row_at)
+
+        self.table_footer.config(text="Calculating summary...")
+        self.with_summary(lambda summary: self.table_footer.config(
+            text=caption +
+                 f"Total Students: {summary['count']}    "
+                 f"Average Percentage: {summary['mean']}%"
+        ))
+
+    def update_progress(self, task):
+        if task is None:
+            self.status_label.config(text="Ready")
+            self.progress["value"] = 0
+            self.cancel_button.state(["disabled"])
+        else:
+            self.status_label.config(text=f"{task.name}...")
+            self.progress["value"] = task.fraction
+            self.cancel_button.state(["!disabled"])
+
+    def with_summary(self, callback):
+        """Call back with the class summary, computing it on a worker if stale."""
+        summary = self.stats.cached_summary()
+        if summary is not None:
+            return callback(summary)
+
+        version, percentages, grades, columns = self.stats.summary_inputs()
+
+        def done(summary):
+            self.stats.accept_summary(version, summary)
+            callback(summary)
+
+        self.runner.submit("Computing statistics",
+                           lambda task: compute_summary(percentages, grades, columns),
+                           on_done=done)
+
     # ---------------------------------------------------------
-    #   Core Functions
+    #   Persistence Helpers
     # ---------------------------------------------------------
+    #   All writes go through the runner's single writer thread, so
+    #   journal appends and compactions never overlap and stay in order.
+
+    def record_put(self, s):
+        snapshot = StudentRecord(*s.as_tuple())
+        self.runner.submit("Saving", lambda task: self.journal.record_put(snapshot),
+                           on_done=self.saved, on_error=self.save_failed, writer=True)
+        self.maybe_compact()
+
+    def record_delete(self, code):
+        self.runner.submit("Saving", lambda task: self.journal.record_delete(code),
+                           on_done=self.saved, on_error=self.save_failed, writer=True)
+        self.maybe_compact()
+
+    def maybe_compact(self):
+        if self._compacting or not self.journal.needs_compaction():
+            return
 
-    def view_all(self):
-        if not self.students:
-            return self.show("No student records found.")
+        self._compacting = True
+        snapshot = StudentColumns(r.as_tuple() for r in self.students)
+
+        def finished(_=None):
+            self._compacting = False
+            self.saved()
+
+        def failed(error):
+            finished()
+            self.save_failed(error)
+
+        self.runner.submit("Compacting roster", lambda task: self.journal.compact(snapshot, task),
+                           on_done=finished, on_error=failed, on_cancel=finished, writer=True)
+
+    def saved(self, _=None):
+        """
+        Our own write landed. Once every queued write is done, and if no
+        other instance wrote meanwhile, the watcher takes the files as
+        seen, so our write is not reloaded as an outside change.
+        """
+        if not self.runner.writing() and self.journal.synced():
+            for path in (FILE, self.journal.path):
+                self.watcher.accept(path)
+
+    def save_failed(self, error):
+        messagebox.showerror("Save Failed", f"Could not write {FILE}:\n{error}")
+
+    def on_disk_change(self, path):
+        """Merge edits made by other processes, touching only the rows that differ."""
+        if self.runner.writing() or self._rereading:
+            return False  # our own writes (or a re-read) go first; look again on the next poll
+        try:
+            changed = catch_up_students(self.students, self.journal, FILE)
+        except (OSError, ValueError) as e:
+            return self.reload_failed(e)
+        if changed is None:
+            self.reread()
+        else:
+            self.disk_changed(changed)
+
+    def reread(self):
+        """The roster was replaced: parse it on a worker, then merge it here."""
+        self._rereading = True
+        version = self.students.version
+
+        def done(reread):
+            self._rereading = False
+            if self.students.version != version or self.runner.writing():
+                # Merging now would undo the edit made while we read; read again.
+                self.watcher.recheck(FILE)
+                return
+            self.disk_changed(merge_roster(self.students, self.journal, reread))
 
-        out = ""
-        percentages_list = []
+        def failed(error):
+            self._rereading = False
+            self.reload_failed(error)
 
-        for s in self.students:
-            p = percentage(s)
-            percentages_list.append(p)
+        def cancelled():
+            self._rereading = False
+            self.watcher.recheck(FILE)
 
-            out += (
-                f"Name: {s['name']}\n"
-                f"Code: {s['code']}\n"
-                f"Coursework Total: {s['coursework']} / 60\n"
-                f"Exam: {s['exam']} / 100\n"
-                f"Percentage: {p}%\n"
-                f"Grade: {grade(p)}\n"
-                f"{'-' * 45}\n"
-            )
+        self.runner.submit("Reloading roster", lambda task: reread_roster(self.journal, FILE),
+                           on_done=done, on_error=failed, on_cancel=cancelled)
 
-        avg = round(sum(percentages_list) / len(percentages_list), 2)
-        out += f"\nTotal Students: {len(self.students)}"
-        out += f"\nAverage Percentage: {avg}%"
+    def reload_failed(self, error):
+        self.status_label.config(text=f"Could not reload {FILE}: {error}")
 
-        self.show(out)
+    def disk_changed(self, changed):
+        if changed:
+            # Undoing past another instance's edit could overwrite it.
+            self.history.reset()
+            self.status_label.config(text=f"Reloaded {changed} record(s) changed on disk")
+
+    def close(self):
+        self.runner.shutdown(wait=True)  # let queued writes land first
+        self.watcher.stop()
+        if self.students is not None and self.journal.size():
+            # Merge anything other instances wrote, so the compaction keeps it.
+            sync_students(self.students, self.journal, FILE)
+            save_students(self.students, FILE, self.journal)
+        self.root.destroy()
+
+    # ---------------------------------------------------------
+    #   Core Functions
+    # ---------------------------------------------------------
+
+    def view_all(self, caption=""):
+        if not self.students:
+            return self.show(caption + "No student records found.")
+
+        self.stats.refresh()
+        self.show_table(len(self.stats.records), self.stats.records.__getitem__, caption)
 
     def view_one(self):
         code = simpledialog.askinteger("Search Student", "Enter student code:")
         if code is None:
             return
 
-        for s in self.students:
-            if s["code"] == code:
-                p = percentage(s)
-                return self.show(
-                    f"Name: {s['name']}\n"
-                    f"Code: {s['code']}\n"
-                    f"Coursework: {s['coursework']}\n"
-                    f"Exam: {s['exam']}\n"
-                    f"Percentage: {p}%\n"
-                    f"Grade: {grade(p)}"
-                )
+        s = self.students.get(code)
+        if s is None:
+            return messagebox.showinfo("Not Found", "Student not found.")
 
-        messagebox.showinfo("Not Found", "Student not found.")
+        p, g = self.stats.of(code)
+        self.show(
+            f"Name: {s['name']}\n"
+            f"Code: {s['code']}\n"
+            f"Coursework: {s['coursework']}\n"
+            f"Exam: {s['exam']}\n"
+            f"Percentage: {p}%\n"
+            f"Grade: {g}\n"
+            f"Rank: {self.students.rank(code)} of {len(self.students)}"
+        )
 
     def highest(self):
-        s = max(self.students, key=lambda x: percentage(x))
-        p = percentage(s)
+        s = self.stats.best()
+        if s is None:
+            return self.show("No student records found.")
+        p, g = self.stats.of(s.code)
         self.show(
             f"TOP PERFORMER\n\n"
             f"Name: {s['name']}\nCode: {s['code']}\n"
             f"Coursework: {s['coursework']}\nExam: {s['exam']}\n"
-            f"Percentage: {p}%\nGrade: {grade(p)}"
+            f"Percentage: {p}%\nGrade: {g}"
         )
 
     def lowest(self):
-        s = min(self.students, key=lambda x: percentage(x))
-        p = percentage(s)
+        s = self.stats.worst()
+        if s is None:
+            return self.show("No student records found.")
+        p, g = self.stats.of(s.code)
         self.show(
             f"LOWEST PERFORMER\n\n"
             f"Name: {s['name']}\nCode: {s['code']}\n"
             f"Coursework: {s['coursework']}\nExam: {s['exam']}\n"
-            f"Percentage: {p}%\nGrade: {grade(p)}"
+            f"Percentage: {p}%\nGrade: {g}"
+        )
+
+    def show_stats(self):
+        if not self.students:
+            return self.show("No student records found.")
+
+        self.show("Calculating statistics...")
+        self.with_summary(self.render_stats)
+
+    def render_stats(self, summary):
+        pct = summary["percentiles"]
+        comp = summary["components"]
+        self.show(
+            f"CLASS STATISTICS\n\n"
+            f"Students: {summary['count']}\n"
+            f"Mean: {summary['mean']}%   Median: {summary['median']}%   "
+            f"Std Dev: {summary['std']}\n"
+            f"Percentiles: " + ", ".join(f"P{q} {v}%" for q, v in pct.items()) + "\n\n"
+            f"Grades: " + ", ".join(f"{g}: {n}" for g, n in summary["grades"].items()) + "\n\n"
+            f"Average C1: {comp['c1']} / 20\n"
+            f"Average C2: {comp['c2']} / 20\n"
+            f"Average C3: {comp['c3']} / 20\n"
+            f"Average Exam: {comp['exam']} / 100"
         )
 
     def sort_records(self):
         order = simpledialog.askstring("Sort", "Enter 'asc' or 'desc':")
         if order not in ("asc", "desc"):
             return
+        if not self.students:
+            return self.show("No student records found.")
 
-        self.students.sort(key=lambda x: percentage(x), reverse=(order == "desc"))
-        self.view_all()
+        # read straight from the rank index; the stored (file) order is untouched
+        reverse = order == "desc"
+        self.show_table(len(self.students), lambda i: self.students.ranked_at(i, reverse),
+                        caption=f"Sorted {'high to low' if reverse else 'low to high'}    ")
+
+    def score_range(self):
+        low = simpledialog.askfloat("Score Range", "Lowest percentage:", minvalue=0, maxvalue=100)
+        if low is None:
+            return
+        high = simpledialog.askfloat("Score Range", "Highest percentage:", minvalue=low, maxvalue=100)
+        if high is None:
+            return
+
+        found = self.students.between(low, high)
+        if not found:
+            return self.show(f"No students between {low}% and {high}%.")
+        self.show_table(len(found), found.__getitem__,
+                        caption=f"{len(found)} between {low}% and {high}%    ")
 
     def add_student(self):
         code = simpledialog.askinteger("Add", "Student Code:")
@@ -245,17 +466,17 @@ class StudentGUI:
         if None in (code, name, c1, c2, c3, exam):
             return
 
-        self.students.append({
-            "code": code,
-            "name": name,
-            "c1": c1,
-            "c2": c2,
-            "c3": c3,
-            "coursework": c1 + c2 + c3,
-            "exam": exam
-        })
-
-        save_students(self.students)
+        try:
+            validate_fields({"code": code, "name": name, "c1": c1, "c2": c2, "c3": c3, "exam": exam})
+            if code in self.students:
+                raise ValueError(f"Duplicate student code: {code}")
+        except ValueError as e:
+            return messagebox.showerror("Error", str(e))
+
+        before = self.history.capture([code])
+        s = self.students.add(StudentRecord(code, name.strip(), c1, c2, c3, exam))
+        self.history.record(f"Add {code}", before)
+        self.record_put(s)
         self.view_all()
 
     def delete_student(self):
@@ -263,8 +484,13 @@ class StudentGUI:
         if code is None:
             return
 
-        self.students = [s for s in self.students if s["code"] != code]
-        save_students(self.students)
+        if code not in self.students:
+            return messagebox.showinfo("Not Found", "Student not found.")
+
+        before = self.history.capture([code])
+        self.students.delete(code)
+        self.history.record(f"Delete {code}", before)
+        self.record_delete(code)
         self.view_all()
 
     def update_student(self):
@@ -272,32 +498,224 @@ class StudentGUI:
         if code is None:
             return
 
-        for s in self.students:
-            if s["code"] == code:
-                new_exam = simpledialog.askinteger("Update", "New exam mark:")
-                new_c = simpledialog.askinteger("Update", "New coursework total (0–60):")
+        if code not in self.students:
+            return messagebox.showinfo("Not Found", "Student not found.")
+
+        new_exam = simpledialog.askinteger("Update", "New exam mark:")
+        new_c = simpledialog.askinteger("Update", "New coursework total (0–60):")
+
+        changes = {}
+        if new_exam is not None:
+            changes["exam"] = new_exam
+
+        if new_c is not None:
+            if not 0 <= new_c <= 60:
+                return messagebox.showerror("Error", "Coursework total must be from 0 to 60.")
+            p = new_c // 3
+            changes["c1"] = changes["c2"] = changes["c3"] = p
 
-                if new_exam is not None:
-                    s["exam"] = new_exam
+        try:
+            validate_fields(changes)
+        except ValueError as e:
+            return messagebox.showerror("Error", str(e))
 
-                if new_c is not None:
-                    p = new_c // 3
-                    s["c1"] = s["c2"] = s["c3"] = p
-                    s["coursework"] = new_c
+        before = self.history.capture([code])
+        s = self.students.update(code, **changes)
+        self.history.record(f"Update {code}", before)
+        self.record_put(s)
+        self.view_all()
+
+    def undo(self):
+        """Revert the last edit; the restored records are journaled like any edit."""
+        if self.history is None:
+            return
+        self.apply_history(self.history.undo(), "Undid", "Nothing to undo.")
 
-                save_students(self.students)
-                self.view_all()
+    def redo(self):
+        if self.history is None:
+            return
+        self.apply_history(self.history.redo(), "Redid", "Nothing to redo.")
+
+    def apply_history(self, result, verb, nothing):
+        if result is None:
+            return self.show(nothing)
+        label, puts, deletes = result
+        if puts:
+            batch = [StudentRecord(*s.as_tuple()) for s in puts]
+            self.runner.submit("Saving", lambda task: self.journal.record_many(batch),
+                               on_done=self.saved, on_error=self.save_failed, writer=True)
+        for code in deletes:
+            self.runner.submit("Saving", lambda task, code=code: self.journal.record_delete(code),
+                               on_done=self.saved, on_error=self.save_failed, writer=True)
+        self.maybe_compact()
+        self.view_all(caption=f"{verb}: {label}    ")
+
+    def import_records(self):
+        from student_bulk import iter_source, plan_import
+
+        path = filedialog.askopenfilename(
+            title="Bulk Import",
+            filetypes=[("Student files", "*.csv *.json *.jsonl"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+
+        version = self.students.version
+
+        def done(result):
+            changes, rejected = result
+            if self.students.version != version:  # edited while validating
+                changes, rejected = plan_import(iter_source(path), self.students)
+            self.apply_import(path, changes, rejected)
+
+        self.runner.submit("Validating import",
+                           lambda task: plan_import(iter_source(path), self.students),
+                           on_done=done,
+                           on_error=lambda e: messagebox.showerror("Import Failed", str(e)))
+
+    def apply_import(self, path, changes, rejected):
+        """Apply a validated batch, then write it with a single roster save."""
+        from student_bulk import apply_changes, rollback
+
+        if rejected:
+            if not messagebox.askyesno(
+                "Rejected Rows",
+                f"{len(rejected)} row(s) in {path} were rejected:\n\n{format_errors(rejected)}"
+                f"\n\nImport the {len(changes)} valid row(s)?"
+            ):
                 return
+        if not changes:
+            return messagebox.showinfo("Bulk Import", "No valid rows to import.")
+
+        before = self.history.capture(changes)
+        undo = apply_changes(self.students, changes)
+        version = self.history.record(f"Import of {len(changes)} record(s)", before)
+        snapshot = StudentColumns(r.as_tuple() for r in self.students)
+        batch = [StudentRecord(*r.as_tuple()) for r in changes.values()]
+
+        def save(task):
+            # If another instance changed the roster meanwhile, journal the batch instead.
+            if not self.journal.compact(snapshot, task):
+                self.journal.record_many(batch)
+
+        def undone():
+            # Nothing reached the disk (the roster is replaced atomically), so undo in memory.
+            rollback(self.students, undo)
+            self.history.discard(version)
+            self.view_all()
+
+        def failed(error):
+            undone()
+            self.save_failed(error)
+
+        def saved(_):
+            self.saved()
+            messagebox.showinfo("Bulk Import", f"Imported {len(changes)} student record(s).")
+
+        self.runner.submit("Saving import", save, on_done=saved,
+                           on_error=failed, on_cancel=undone, writer=True)
+        self.view_all()
+
+    def export_records(self):
+        from student_bulk import export_rows
 
-        messagebox.showinfo("Not Found", "Student not found.")
+        path = filedialog.asksaveasfilename(
+            title="Export Grades",
+            defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("JSON", "*.json"), ("JSON Lines", "*.jsonl")]
+        )
+        if not path:
+            return
 
+        rows = self.stats.rows()  # bound to the current snapshot
+        self.runner.submit("Exporting", lambda task: export_rows(rows, path),
+                           on_done=lambda n: messagebox.showinfo("Export", f"Exported {n} students."),
+                           on_error=lambda e: messagebox.showerror("Export Failed", str(e)))
 
-# ---------------------------------------------------------
-#   RUN APPLICATION
-# ---------------------------------------------------------
-root = tk.Tk()
-StudentGUI(root)
-root.mainloop()
 
+    # ---------------------------------------------------------
+    #   Cross-Cohort Reports
+    # ---------------------------------------------------------
+    #   Every roster file in a chosen folder (one per cohort or term) is
+    #   read in worker processes; only merged totals come back.
+
+    def choose_cohorts(self):
+        directory = filedialog.askdirectory(title="Folder of Roster Files",
+                                            initialdir=self.cohort_dir or ".")
+        if directory:
+            self.cohort_dir = directory
+        return directory
+
+    def run_cohorts(self, name, work, on_done):
+        """Run work(roster, task) over the chosen folder, closing the pool afterwards."""
+        from student_shards import ShardedRoster  # multiprocessing is slow to import
+
+        roster = ShardedRoster(self.cohort_dir)
+
+        def done(result):
+            roster.close()
+            on_done(result)
+
+        def failed(error):
+            roster.close()
+            messagebox.showerror(name, str(error))
+
+        self.runner.submit(name, lambda task: work(roster, task),
+                           on_done=done, on_error=failed, on_cancel=roster.close)
 
+    def cohort_report(self):
+        if not self.choose_cohorts():
+            return
+        self.show("Reading cohorts...")
+        self.run_cohorts("Cohort Report", lambda roster, task: roster.aggregate(task=task),
+                         self.render_cohorts)
+
+    def render_cohorts(self, agg):
+        if not agg.shards:
+            return self.show(f"No roster files found in {self.cohort_dir}.")
+        summary = agg.summary()
+        pct = summary["percentiles"]
+        files = "\n".join(f"  {name}: {info['count']} students"
+                          + (f", {info['skipped']} lines skipped" if info["skipped"] else "")
+                          for name, info in summary["shards"].items())
+        top = "\n".join(f"  {row_percentage(row)}%  "
+                        f"{row[1]} ({row[0]}, {shard})"
+                        for _, row, shard in agg.top[:5])
+        self.show(
+            f"COHORT REPORT — {self.cohort_dir}\n\n"
+            f"Students: {summary['count']} in {len(agg.shards)} files\n"
+            f"Mean: {summary['mean']}%   Median: {summary['median']}%   "
+            f"Std Dev: {summary['std']}\n"
+            f"Percentiles: " + ", ".join(f"P{q} {v}%" for q, v in pct.items()) + "\n"
+            f"Grades: " + ", ".join(f"{g}: {n}" for g, n in summary["grades"].items()) + "\n\n"
+            f"Top Students:\n{top}\n\n"
+            f"Files:\n{files}"
+        )
+
+    def find_in_cohorts(self):
+        if not (self.cohort_dir or self.choose_cohorts()):
+            return
+        code = simpledialog.askinteger("Find in Cohorts", "Enter student code:")
+        if code is None:
+            return
 
+        def done(found):
+            if not found:
+                return messagebox.showinfo("Not Found", f"Student {code} is not in any roster file.")
+            entries = []
+            for shard, (_, name, c1, c2, c3, exam) in found:
+                p = total_percentage(c1 + c2 + c3 + exam)
+                entries.append(f"{shard}\nName: {name}\nCoursework: {c1 + c2 + c3}\n"
+                               f"Exam: {exam}\nPercentage: {p}%\nGrade: {grade(p)}")
+            self.show("\n\n".join(entries))
+
+        self.run_cohorts("Searching cohorts", lambda roster, task: roster.lookup(code, task), done)
+
+
+# ---------------------------------------------------------
+#   RUN APPLICATION
+# ---------------------------------------------------------
+if __name__ == "__main__":
+    root = tk.Tk()
+    StudentGUI(root)
+    root.mainloop()
@@ -0,0 +1,333 @@
+"""
+Reports across a directory of roster shards (one roster file per cohort or term).
+
+    python student_shards.py DIR stats [--workers N] [--pattern "*.txt"]
+    python student_shards.py DIR report [--asc] [--limit N] [--workers N]
+    python student_shards.py DIR show CODE [--workers N]
+
+Every shard is read by a separate process. Each returns a small
+ShardAggregate instead of its rows: counts, mark sums, a histogram of
+total marks and its own top and bottom students. Aggregates merge in
+any order, so the cross-cohort summary is exact (percentages are
+total / 160, so the histogram gives exact medians and percentiles)
+while only a few KB per shard cross the process boundary.
+"""
+import argparse
+import glob
+import heapq
+import json
+import math
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from instrument import timed
+from student_core import load_students
+from student_io import find_student, grade, iter_lines, iter_students, parse_row, total_percentage
+from student_stats import GRADE_LETTERS, PERCENTILES
+
+SHARD_PATTERN = "*.txt"
+TOP_K = 10  # best and worst students each shard reports
+PARALLEL_BYTES = 4 * 1024 * 1024  # smaller directories are read in-process
+
+
+def list_shards(directory, pattern=SHARD_PATTERN):
+    """Roster files in directory, sorted by name."""
+    return sorted(p for p in glob.glob(os.path.join(directory, pattern)) if os.path.isfile(p))
+
+
+def _has_journal(path):
+    journal = path + ".journal"
+    return os.path.exists(journal) and os.path.getsize(journal) > 0
+
+
+def shard_rows(path, errors=None):
+    """
+    (code, name, c1, c2, c3, exam) rows of one shard. The file is streamed
+    unless it has a pending journal, which needs a store to replay into.
+    """
+    if _has_journal(path):
+        return [s.as_tuple() for s in load_students(path, errors)]
+    return iter_students(path, errors)
+
+
+def find_in_shard(path, code):
+    """(shard name, row or None); only lines starting with the code are parsed."""
+    name = os.path.basename(path)
+    if _has_journal(path):
+        return name, find_student(shard_rows(path), code)
+    prefix = f"{code},"
+    for _, line in iter_lines(path):
+        line = line.strip()
+        if line.startswith(prefix):
+            try:
+                return name, parse_row(line)
+            except ValueError:
+                continue
+    return name, None
+
+
+def _total(row):
+    return row[2] + row[3] + row[4] + row[5]
+
+
+def _rank_key(entry):
+    return entry[0], entry[1][0]  # total marks, then code, as StudentStore ranks
+
+
+def _nth(bins, n):
+    """The n-th smallest total (0-based) in a sorted [(total, count)] list."""
+    for total, count in bins:
+        if n < count:
+            return total
+        n -= count
+    raise IndexError(n)
+
+
+# ---------------------------------------------------------
+#   MERGEABLE AGGREGATE
+# ---------------------------------------------------------
+
+class ShardAggregate:
+    """Summary of one or more shards; merge() combines two without their rows."""
+
+    __slots__ = ("shards", "count", "errors", "totals", "components", "top", "bottom", "k")
+
+    def __init__(self, k=TOP_K):
+        self.shards = {}       # shard name -> (students, skipped lines)
+        self.count = 0
+        self.errors = 0
+        self.totals = {}       # total marks -> students with that total
+        self.components = [0, 0, 0, 0]  # sums of c1, c2, c3, exam
+        self.top = []          # up to k (total, row, shard), best first
+        self.bottom = []       # up to k (total, row, shard), worst first
+        self.k = k
+
+    @classmethod
+    def of_shard(cls, path, k=TOP_K):
+        """Read one shard; runs inside a worker process."""
+        if k < 1:
+            raise ValueError(f"k must be at least 1, not {k}")
+        agg = cls(k)
+        errors = []
+        name = os.path.basename(path)
+        totals, comps = agg.totals, agg.components
+        best, worst = [], []
+        for row in shard_rows(path, errors):
+            t = _total(row)
+            totals[t] = totals.get(t, 0) + 1
+            comps[0] += row[2]
+            comps[1] += row[3]
+            comps[2] += row[4]
+            comps[3] += row[5]
+            entry = (t, row[0], row)
+            # Bounded heaps: O(log k) per row, whatever the shard size.
+            if len(best) < k:
+                heapq.heappush(best, entry)
+            elif entry[:2] > best[0][:2]:
+                heapq.heapreplace(best, entry)
+            neg = (-t, -row[0], row)
+            if len(worst) < k:
+                heapq.heappush(worst, neg)
+            elif neg[:2] > worst[0][:2]:
+                heapq.heapreplace(worst, neg)
+        agg.count = sum(totals.values())
+        agg.errors = len(errors)
+        agg.shards[name] = (agg.count, agg.errors)
+        agg.top = [(t, row, name) for t, _, row in sorted(best, reverse=True)]
+        agg.bottom = [(-t, row, name) for t, _, row in sorted(worst, reverse=True)]
+        return agg
+
+    def merge(self, other):
+        self.shards.update(other.shards)
+        self.count += other.count
+        self.errors += other.errors
+        for t, n in other.totals.items():
+            self.totals[t] = self.totals.get(t, 0) + n
+        self.components = [a + b for a, b in zip(self.components, other.components)]
+        self.top = heapq.nlargest(self.k, self.top + other.top, key=_rank_key)
+        self.bottom = heapq.nsmallest(self.k, self.bottom + other.bottom, key=_rank_key)
+        return self
+
+    def summary(self):
+        """Same shape as student_stats.compute_summary(), plus per-shard counts."""
+        n = self.count
+        dist = {letter: 0 for letter in reversed(GRADE_LETTERS)}
+        bins = sorted(self.totals.items())
+        for t, c in bins:
+            dist[grade(total_percentage(t))] += c
+
+        if n:
+            mean = sum(total_percentage(t) * c for t, c in bins) / n
+            std = math.sqrt(sum((total_percentage(t) - mean) ** 2 * c for t, c in bins) / n)
+
+            def percentile(q):
+                pos = (n - 1) * q / 100
+                lo = math.floor(pos)
+                a, b = total_percentage(_nth(bins, lo)), total_percentage(_nth(bins, min(lo + 1, n - 1)))
+                return a + (b - a) * (pos - lo)
+
+            pct = {q: percentile(q) for q in PERCENTILES}
+            median = percentile(50)
+        else:
+            mean = median = std = 0.0
+            pct = {q: 0.0 for q in PERCENTILES}
+
+        names = ("c1", "c2", "c3", "exam")
+        return {
+            "count": n,
+            "mean": round(mean, 2),
+            "median": round(median, 2),
+            "std": round(std, 2),
+            "percentiles": {q: round(v, 2) for q, v in pct.items()},
+            "grades": dist,
+            "components": {k: round(s / n, 2) if n else 0.0 for k, s in zip(names, self.components)},
+            "skipped": self.errors,
+            "shards": {name: {"count": c, "skipped": e} for name, (c, e) in sorted(self.shards.items())}
+        }
+
+
+# ---------------------------------------------------------
+#   SHARDED ROSTER
+# ---------------------------------------------------------
+
+class ShardedRoster:
+    """
+    Read-only view of every roster in a directory. Work is spread over a
+    process pool (one task per shard), created on first use and reused.
+    Workers are spawned rather than forked, so the pool is also safe to
+    start from a GUI that has threads and an open display connection.
+    """
+
+    def __init__(self, directory, workers=None, pattern=SHARD_PATTERN):
+        self.directory = directory
+        self.pattern = pattern
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = None
+
+    def shards(self):
+        return list_shards(self.directory, self.pattern)
+
+    def _map(self, fn, args, task=None):
+        """Yield fn(*a) for each a as workers finish; inline when one process is enough."""
+        small = sum(os.path.getsize(a[0]) for a in args) < PARALLEL_BYTES
+        if self.workers == 1 or len(args) <= 1 or small:
+            for i, a in enumerate(args):
+                if task is not None:
+                    task.check()
+                    task.progress(i / len(args))
+                yield fn(*a)
+            return
+
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        futures = [self._pool.submit(fn, *a) for a in args]
+        try:
+            for i, future in enumerate(as_completed(futures)):
+                if task is not None:
+                    task.check()
+                    task.progress(i / len(futures))
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()  # stops queued shards after an error or cancel
+
+    @timed("student.shards_aggregate")
+    def aggregate(self, k=TOP_K, task=None):
+        """One ShardAggregate covering every shard."""
+        total = ShardAggregate(k)
+        for agg in self._map(ShardAggregate.of_shard, [(p, k) for p in self.shards()], task):
+            total.merge(agg)
+        return total
+
+    def summary(self, task=None):
+        return self.aggregate(task=task).summary()
+
+    @timed("student.shards_lookup")
+    def lookup(self, code, task=None):
+        """[(shard name, row)] for every shard holding code, in shard order."""
+        found = [hit for hit in self._map(find_in_shard, [(p, code) for p in self.shards()], task)
+                 if hit[1] is not None]
+        return sorted(found)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ---------------------------------------------------------
+#   COMMAND LINE
+# ---------------------------------------------------------
+
+def format_row(rank, total, row, shard):
+    code, name, c1, c2, c3, exam = row
+    p = total_percentage(total)
+    return f"{rank:>5}  {code:>5}  {name:<28}{c1 + c2 + c3:>4}{exam:>6}{p:>8.2f}  {grade(p)}  {shard}"
+
+
+def cmd_stats(roster, args):
+    print(json.dumps(roster.summary(), indent=2))
+
+
+def cmd_report(roster, args):
+    agg = roster.aggregate(k=args.limit)
+    rows = agg.bottom if args.asc else agg.top
+    print(f"{'Rank':>5}  {'Code':>5}  {'Name':<28}{'CW':>4}{'Exam':>6}{'%':>8}  Grade  Shard")
+    for rank, (total, row, shard) in enumerate(rows, 1):
+        print(format_row(rank, total, row, shard))
+    summary = agg.summary()
+    print(f"\nShards: {len(agg.shards)}\nTotal Students: {summary['count']}\n"
+          f"Average Percentage: {summary['mean']}%")
+
+
+def cmd_show(roster, args):
+    found = roster.lookup(args.code)
+    if not found:
+        sys.exit(f"Student {args.code} not found in {roster.directory}.")
+    for shard, row in found:
+        print(format_row("-", _total(row), row, shard))
+
+
+def main(argv=None):
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    common.add_argument("--pattern", default=SHARD_PATTERN,
+                        help="shard file names (default: %(default)s)")
+
+    parser = argparse.ArgumentParser(description="Cross-cohort reports over a directory of rosters.")
+    parser.add_argument("directory")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("stats", parents=[common],
+                   help="combined statistics as JSON").set_defaults(func=cmd_stats)
+
+    p = sub.add_parser("report", parents=[common], help="best (or worst) students across all shards")
+    p.add_argument("--asc", action="store_true")
+    p.add_argument("--limit", type=int, default=TOP_K, help="students to list (default: %(default)s)")
+    p.set_defaults(func=cmd_report)
+
+    p = sub.add_parser("show", parents=[common], help="one student code in every shard")
+    p.add_argument("code", type=int)
+    p.set_defaults(func=cmd_show)
+
+    args = parser.parse_args(argv)
+    if args.command == "report" and args.limit < 1:
+        parser.error("--limit must be at least 1")
+    if not os.path.isdir(args.directory):
+        sys.exit(f"{args.directory} is not a directory.")
+    with ShardedRoster(args.directory, args.workers, args.pattern) as roster:
+        args.func(roster, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import importlib.util
+import math
+
+from student_columns import StudentColumns
+from student_io import TOTAL_MARKS, grade
+
+# NumPy is optional — fall back to the pure-Python column maths. It is
+# slow to import, so startup only checks that it is installed.
+_HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+np = None
+
+
+def _numpy():
+    """The numpy module, imported on first use; None if it is unavailable."""
+    global np, _HAS_NUMPY
+    if np is None and _HAS_NUMPY:
+        try:
+            import numpy
+            np = numpy
+        except Exception:
+            _HAS_NUMPY = False
+    return np
+
+GRADE_BANDS = (40, 50, 60, 70)  # lower bounds of D, C, B, A
+GRADE_LETTERS = "FDCBA"
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def _percentile(sorted_values, q):
+    """Linear-interpolated percentile, matching numpy's default method."""
+    if not sorted_values:
+        return 0.0
+    pos = (len(sorted_values) - 1) * q / 100
+    lo = math.floor(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+# ---------------------------------------------------------
+#   CACHED ROSTER ANALYTICS
+# ---------------------------------------------------------
+
+class RosterStats:
+    """
+    Percentages and grades for a whole StudentStore, computed in one
+    batch and reused until the store's version changes.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._version = None
+        self._summary = None
+
+    def refresh(self):
+        if self._version == self.store.version:
+            return
+        self.records = list(self.store)
+        self.columns = StudentColumns(r.as_tuple() for r in self.records)
+        self.index = {r.code: i for i, r in enumerate(self.records)}
+
+        if _numpy() is not None:
+            cols = [np.frombuffer(c, dtype=np.intc) if len(c) else np.zeros(0, np.intc)
+                    for c in (self.columns.c1, self.columns.c2, self.columns.c3, self.columns.exam)]
+            # Same formula as total_percentage(); np.round agrees with round() for every total.
+            p = np.round((cols[0] + cols[1] + cols[2] + cols[3]) / TOTAL_MARKS * 100, 2)
+            letters = np.array(list(GRADE_LETTERS))
+            self.percentages = p.tolist()
+            self.grades = letters[np.digitize(p, GRADE_BANDS)].tolist()
+        else:
+            self.percentages = self.columns.percentages().tolist()
+            self.grades = [grade(p) for p in self.percentages]
+
+        self._summary = None
+        self._version = self.store.version
+
+    # ---------------- Per-student lookups ---------------- #
+
+    def rows(self):
+        """(record, percentage, grade) in stored order."""
+        self.refresh()
+        return zip(self.records, self.percentages, self.grades)
+
+    def of(self, code):
+        """(percentage, grade) for one student code."""
+        self.refresh()
+        i = self.index[code]
+        return self.percentages[i], self.grades[i]
+
+    def best(self):
+        top = self.store.top(1)
+        return top[0] if top else None
+
+    def worst(self):
+        bottom = self.store.bottom(1)
+        return bottom[0] if bottom else None
+
+    # ---------------- Summary ---------------- #
+
+    def summary(self):
+        """Mean, median, std dev, percentiles, grade counts and component averages."""
+        self.refresh()
+        if self._summary is None:
+            self._summary = compute_summary(self.percentages, self.grades, self.columns)
+        return self._summary
+
+    # ---------------- Background support ---------------- #
+
+    def cached_summary(self):
+        """The summary if it is already computed for the current data, else None."""
+        self.refresh()
+        return self._summary
+
+    def summary_inputs(self):
+        """Immutable inputs for compute_summary() on a worker thread."""
+        self.refresh()
+        return self._version, self.percentages, self.grades, self.columns
+
+    def accept_summary(self, version, summary):
+        if version == self._version:
+            self._summary = summary
+
+
+def compute_summary(percentages, grades, columns):
+    """Stats summary from one snapshot; safe to run off the Tk thread."""
+    n = len(percentages)
+    dist = {letter: 0 for letter in reversed(GRADE_LETTERS)}
+    for g in grades:
+        dist[g] += 1
+
+    names = ("c1", "c2", "c3", "exam")
+    if n and _numpy() is not None:
+        p = np.asarray(percentages)
+        mean, median, std = float(p.mean()), float(np.median(p)), float(p.std())
+        pct = {q: float(v) for q, v in zip(PERCENTILES, np.percentile(p, PERCENTILES))}
+        components = {name: float(np.frombuffer(getattr(columns, name), dtype=np.intc).mean())
+                      for name in names}
+    elif n:
+        ordered = sorted(percentages)
+        mean = sum(ordered) / n
+        median = _percentile(ordered, 50)
+        std = math.sqrt(sum((x - mean) ** 2 for x in ordered) / n)
+        pct = {q: _percentile(ordered, q) for q in PERCENTILES}
+        components = {name: sum(getattr(columns, name)) / n for name in names}
+    else:
+        mean = median = std = 0.0
+        pct = {q: 0.0 for q in PERCENTILES}
+        components = {name: 0.0 for name in names}
+
+    return {
+        "count": n,
+        "mean": round(mean, 2),
+        "median": round(median, 2),
+        "std": round(std, 2),
+        "percentiles": {q: round(v, 2) for q, v in pct.items()},
+        "grades": dist,
+        "components": {k: round(v, 2) for k, v in components.items()}
+    }
@@ -0,0 +1,190 @@
+import bisect
+import math
+
+from student_columns import StudentRecord
+from student_io import TOTAL_MARKS, total_percentage
+
+_PERCENTAGES = [total_percentage(t) for t in range(TOTAL_MARKS + 1)]  # by total marks, ascending
+
+# ---------------------------------------------------------
+#   INDEXED STUDENT STORE
+# ---------------------------------------------------------
+
+class StudentStore:
+    """In-memory roster keyed by student code, with sorted name and rank indexes."""
+
+    def __init__(self, students=()):
+        self._by_code = {}  # code -> record, insertion order == file order
+        self._slots = {}    # code -> place in that order; increases along it
+        self._next_slot = 0
+        self._names = []    # sorted (lowercase name, code) pairs for prefix search
+        self._ranks = []    # sorted (total marks, code) pairs for rank queries
+        self.version = 0    # bumped on every change so caches know to refresh
+        self.extend(students)
+
+    def __len__(self):
+        return len(self._by_code)
+
+    def __iter__(self):
+        return iter(self._by_code.values())
+
+    def __contains__(self, code):
+        return code in self._by_code
+
+    # ---------------- Lookup ---------------- #
+
+    def get(self, code):
+        """Return the record for a code, or None."""
+        return self._by_code.get(code)
+
+    def slot(self, code):
+        """Place of a record in the stored order, for add(..., slot=) to restore; None if unknown."""
+        return self._slots.get(code)
+
+    def find_by_name(self, prefix):
+        """Return records whose name starts with prefix (case-insensitive)."""
+        prefix = prefix.strip().lower()
+        i = bisect.bisect_left(self._names, (prefix,))
+        found = []
+        while i < len(self._names) and self._names[i][0].startswith(prefix):
+            found.append(self._by_code[self._names[i][1]])
+            i += 1
+        return found
+
+    # ---------------- Rank queries ---------------- #
+    #   Percentage is total marks / 160, so ordering by the integer
+    #   total is ordering by percentage.
+
+    def top(self, k=None):
+        """Highest-scoring records first (all of them if k is None)."""
+        _check_k(k)
+        n = len(self._ranks)
+        start = 0 if k is None else max(n - k, 0)
+        return [self._by_code[code] for _, code in reversed(self._ranks[start:])]
+
+    def bottom(self, k=None):
+        """Lowest-scoring records first (all of them if k is None)."""
+        _check_k(k)
+        return [self._by_code[code] for _, code in self._ranks[:k]]
+
+    def ranked_at(self, i, reverse=True):
+        """The record at position i of the ranking, without building a list."""
+        _, code = self._ranks[-1 - i] if reverse else self._ranks[i]
+        return self._by_code[code]
+
+    def rank(self, code):
+        """1-based rank of a student (ties share a rank), or None if unknown."""
+        record = self._by_code.get(code)
+        if record is None:
+            return None
+        above = len(self._ranks) - bisect.bisect_right(self._ranks, (_total(record), math.inf))
+        return above + 1
+
+    def between(self, low, high):
+        """Records with a percentage from low to high inclusive, lowest first."""
+        lo = bisect.bisect_left(_PERCENTAGES, low)  # compare rounded percentages, as shown
+        hi = bisect.bisect_right(_PERCENTAGES, high) - 1
+        i = bisect.bisect_left(self._ranks, (lo, -math.inf))
+        j = bisect.bisect_right(self._ranks, (hi, math.inf))
+        return [self._by_code[code] for _, code in self._ranks[i:j]]
+
+    # ---------------- Edits ---------------- #
+
+    def add(self, record, slot=None):
+        """
+        Insert a record (or mapping) at the end, or back at a place taken
+        from slot() before it was deleted; raises ValueError if its code
+        is already used.
+        """
+        if not isinstance(record, StudentRecord):
+            record = StudentRecord.from_mapping(record)
+        code = record.code
+        if code in self._by_code:
+            raise ValueError(f"Duplicate student code: {code}")
+        last = next(reversed(self._by_code), None)
+        self._by_code[code] = record
+        if slot is None:
+            slot = self._next_slot
+            self._next_slot += 1
+        self._slots[code] = slot
+        if last is not None and slot < self._slots[last]:
+            # Rare (undoing a delete): rebuild the order, which is already sorted but for one record.
+            self._by_code = {c: self._by_code[c] for c in sorted(self._by_code, key=self._slots.__getitem__)}
+        bisect.insort(self._names, (record.name.lower(), code))
+        bisect.insort(self._ranks, (_total(record), code))
+        self.version += 1
+        return record
+
+    def extend(self, records, duplicates=None):
+        """
+        Add many records, sorting each index once instead of per insert.
+        Records with a code already present raise ValueError, or are
+        skipped and appended to duplicates if that list is given.
+        """
+        names, ranks = [], []
+        for record in records:
+            if not isinstance(record, StudentRecord):
+                record = StudentRecord.from_mapping(record)
+            code = record.code
+            if code in self._by_code:
+                if duplicates is None:
+                    raise ValueError(f"Duplicate student code: {code}")
+                duplicates.append(record)
+                continue
+            self._by_code[code] = record
+            self._slots[code] = self._next_slot
+            self._next_slot += 1
+            names.append((record.name.lower(), code))
+            ranks.append((_total(record), code))
+
+        if names:
+            self._names.extend(names)
+            self._names.sort()
+            self._ranks.extend(ranks)
+            self._ranks.sort()
+            self.version += 1
+
+    def update(self, code, **changes):
+        """Change fields of an existing record; raises KeyError if missing."""
+        record = self._by_code[code]
+        if changes.get("code", code) != code:
+            raise ValueError("A student's code cannot be changed.")
+        if "name" in changes and changes["name"] != record.name:
+            self._drop_name(record)
+            bisect.insort(self._names, (changes["name"].lower(), code))
+        old_total = _total(record)
+        record.update(changes)
+        if _total(record) != old_total:
+            _remove(self._ranks, (old_total, code))
+            bisect.insort(self._ranks, (_total(record), code))
+        self.version += 1
+        return record
+
+    def delete(self, code):
+        """Remove and return a record, or None if the code is unknown."""
+        record = self._by_code.pop(code, None)
+        if record is not None:
+            del self._slots[code]
+            self._drop_name(record)
+            _remove(self._ranks, (_total(record), code))
+            self.version += 1
+        return record
+
+    def _drop_name(self, record):
+        _remove(self._names, (record.name.lower(), record.code))
+
+
+def _check_k(k):
+    if k is not None and k < 1:
+        raise ValueError(f"k must be at least 1, not {k}")
+
+
+def _total(record):
+    return record.c1 + record.c2 + record.c3 + record.exam
+
+
+def _remove(index, entry):
+    """Delete entry from a sorted list if present."""
+    i = bisect.bisect_left(index, entry)
+    if i < len(index) and index[i] == entry:
+        del index[i]
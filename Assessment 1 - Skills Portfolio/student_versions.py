@@ -0,0 +1,406 @@
+from student_columns import StudentRecord
+
+# ---------------------------------------------------------
+#   VERSIONED ROSTER (UNDO / REDO / POINT-IN-TIME VIEWS)
+# ---------------------------------------------------------
+#   The live StudentStore stays the working copy. Every edit is also
+#   recorded as an immutable version: a persistent map of each code
+#   changed since loading to its (code, name, c1, c2, c3, exam) tuple,
+#   or None once deleted. A new version copies only the O(log n) trie
+#   nodes on the path to the changed codes and shares the rest with the
+#   previous version, so history never copies the roster.
+#
+#   Codes no version has touched read through to the live store. The
+#   value each code had before its first recorded change is kept in
+#   `origin` (written once, before the store is modified), so a view
+#   of any version stays correct however the store changes afterwards.
+
+UNDO_LIMIT = 100  # versions kept for undo; older views stay usable
+
+BITS = 5
+WIDTH = 1 << BITS
+MASK = WIDTH - 1
+HASH_BITS = 64
+
+
+def _hash(key):
+    return hash(key) & ((1 << HASH_BITS) - 1)
+
+
+class _Node:
+    """Trie node: bit i of bitmap is set if slot i holds a child, stored densely."""
+
+    __slots__ = ("bitmap", "children")
+
+    def __init__(self, bitmap, children):
+        self.bitmap = bitmap
+        self.children = children  # tuple of _Node, _Collision or (key, value) leaves
+
+
+class _Collision:
+    """Leaves whose keys hash identically."""
+
+    __slots__ = ("hash", "leaves")
+
+    def __init__(self, h, leaves):
+        self.hash = h
+        self.leaves = leaves
+
+
+_EMPTY_NODE = _Node(0, ())
+
+
+def _child_hash(child):
+    return child.hash if isinstance(child, _Collision) else _hash(child[0])
+
+
+def _pair(shift, a, b):
+    """Smallest subtree holding two children with different slots further down."""
+    ha, hb = _child_hash(a), _child_hash(b)
+    if ha == hb:
+        leaves = (a.leaves if isinstance(a, _Collision) else (a,)) + (b,)
+        return _Collision(ha, leaves)
+    ia, ib = (ha >> shift) & MASK, (hb >> shift) & MASK
+    if ia == ib:
+        return _Node(1 << ia, (_pair(shift + BITS, a, b),))
+    children = (a, b) if ia < ib else (b, a)
+    return _Node((1 << ia) | (1 << ib), children)
+
+
+def _set(node, shift, h, key, value):
+    """(new node, whether a key was added); only the path to key is copied."""
+    bit = 1 << ((h >> shift) & MASK)
+    i = (node.bitmap & (bit - 1)).bit_count()
+    children = node.children
+    if not node.bitmap & bit:
+        return _Node(node.bitmap | bit, children[:i] + ((key, value),) + children[i:]), True
+
+    child = children[i]
+    added = False
+    if isinstance(child, _Node):
+        new, added = _set(child, shift + BITS, h, key, value)
+    elif isinstance(child, _Collision):
+        if child.hash != h:
+            new, added = _pair(shift + BITS, child, (key, value)), True
+        else:
+            kept = tuple(leaf for leaf in child.leaves if leaf[0] != key)
+            added = len(kept) == len(child.leaves)
+            new = _Collision(h, kept + ((key, value),))
+    elif child[0] == key:
+        if child[1] is value:
+            return node, False
+        new = (key, value)
+    else:
+        new, added = _pair(shift + BITS, child, (key, value)), True
+    return _Node(node.bitmap, children[:i] + (new,) + children[i + 1:]), added
+
+
+def _delete(node, shift, h, key):
+    """New node without key (None if it became empty); node itself if key is absent."""
+    bit = 1 << ((h >> shift) & MASK)
+    if not node.bitmap & bit:
+        return node
+    i = (node.bitmap & (bit - 1)).bit_count()
+    children = node.children
+    child = children[i]
+
+    if isinstance(child, _Node):
+        new = _delete(child, shift + BITS, h, key)
+        if new is child:
+            return node
+        if new is not None and len(new.children) == 1 and not isinstance(new.children[0], _Node):
+            new = new.children[0]  # pull a lone leaf up, keeping the trie shallow
+    elif isinstance(child, _Collision):
+        kept = tuple(leaf for leaf in child.leaves if leaf[0] != key)
+        if len(kept) == len(child.leaves):
+            return node
+        new = kept[0] if len(kept) == 1 else _Collision(child.hash, kept)
+    elif child[0] == key:
+        new = None
+    else:
+        return node
+
+    if new is not None:
+        return _Node(node.bitmap, children[:i] + (new,) + children[i + 1:])
+    if node.bitmap == bit:
+        return None
+    return _Node(node.bitmap & ~bit, children[:i] + children[i + 1:])
+
+
+def _items(node):
+    for child in node.children:
+        if isinstance(child, _Node):
+            yield from _items(child)
+        elif isinstance(child, _Collision):
+            yield from child.leaves
+        else:
+            yield child
+
+
+class PersistentMap:
+    """
+    Immutable hash map (hash array mapped trie). set() and delete()
+    return a new map in O(log32 n), sharing every untouched node.
+    """
+
+    __slots__ = ("_root", "_len")
+
+    def __init__(self, root=_EMPTY_NODE, length=0):
+        self._root = root
+        self._len = length
+
+    def __len__(self):
+        return self._len
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __iter__(self):
+        return (key for key, _ in _items(self._root))
+
+    def items(self):
+        return _items(self._root)
+
+    def get(self, key, default=None):
+        h = _hash(key)
+        node, shift = self._root, 0
+        while True:
+            bit = 1 << ((h >> shift) & MASK)
+            if not node.bitmap & bit:
+                return default
+            child = node.children[(node.bitmap & (bit - 1)).bit_count()]
+            if isinstance(child, _Node):
+                node, shift = child, shift + BITS
+            elif isinstance(child, _Collision):
+                for k, v in child.leaves:
+                    if k == key:
+                        return v
+                return default
+            else:
+                return child[1] if child[0] == key else default
+
+    def set(self, key, value):
+        root, added = _set(self._root, 0, _hash(key), key, value)
+        return self if root is self._root else PersistentMap(root, self._len + added)
+
+    def delete(self, key):
+        root = _delete(self._root, 0, _hash(key), key)
+        if root is self._root:
+            return self
+        return PersistentMap(root or _EMPTY_NODE, self._len - 1)
+
+
+_MISSING = object()
+
+
+# ---------------------------------------------------------
+#   ROSTER VERSIONS
+# ---------------------------------------------------------
+
+class RosterView:
+    """
+    Read-only roster as of one version, for reports. Lookups are
+    O(log n); iteration walks the live store once. Safe to read on a
+    worker thread while the Tk thread keeps editing.
+    """
+
+    def __init__(self, history, version):
+        self.version = version.number
+        self.label = version.label
+        self._changed = version.changed
+        self._origin = history.origin
+        self._store = history.store
+
+    def _value(self, code):
+        """Tuple for code in this version, None if absent, _MISSING if never changed."""
+        value = self._changed.get(code, _MISSING)
+        if value is _MISSING:
+            value = self._origin.get(code, _MISSING)
+        return value
+
+    def get(self, code):
+        value = self._value(code)
+        if value is _MISSING:
+            s = self._store.get(code)
+            value = s.as_tuple() if s is not None else None
+            if code in self._origin:  # edited while we read it
+                value = self._value(code)
+        return StudentRecord(*value) if value is not None else None
+
+    def __contains__(self, code):
+        return self.get(code) is not None
+
+    def rows(self):
+        """(code, name, c1, c2, c3, exam) tuples: live order, then codes since deleted."""
+        seen = set()
+        for s in list(self._store):
+            row = s.as_tuple()  # read before checking origin, which is filled before edits
+            code = row[0]
+            seen.add(code)
+            if code in self._origin:
+                row = self._value(code)
+            if row is not None:
+                yield row
+        for code, _ in list(self._origin.items()):
+            if code not in seen:
+                row = self._value(code)
+                if row is not None:
+                    yield row
+
+    def __iter__(self):
+        return (StudentRecord(*row) for row in self.rows())
+
+    def __len__(self):
+        return sum(1 for _ in self.rows())
+
+
+class _Version:
+    __slots__ = ("number", "label", "changed", "before", "after", "slots_before", "slots_after")
+
+    def __init__(self, number, label, changed, before=None, after=None,
+                 slots_before=None, slots_after=None):
+        self.number = number
+        self.label = label
+        self.changed = changed  # PersistentMap: code -> tuple or None, every code changed so far
+        self.before = before    # {code: tuple or None} this edit replaced
+        self.after = after      # {code: tuple or None} this edit wrote
+        self.slots_before = slots_before  # {code: store slot} of the codes present before the edit
+        self.slots_after = slots_after    # ... and after it, so re-added rows go back in place
+
+
+class RosterHistory:
+    """
+    Undo/redo for edits to a StudentStore. Call capture() with the
+    codes an edit will touch before making it, then record() after:
+
+        before = history.capture(codes)
+        ... edit store ...
+        history.record("Delete 1234", before)
+    """
+
+    def __init__(self, store, limit=UNDO_LIMIT):
+        self.store = store
+        self.limit = limit
+        self.reset()
+
+    def reset(self):
+        """
+        Forget all history, e.g. after reloading changes made by another
+        process. Views taken before the reset no longer track the store.
+        """
+        self.origin = {}  # code -> value before its first recorded change (written once)
+        self._captured_slots = {}
+        self._versions = [_Version(0, "Loaded", PersistentMap())]
+        self._current = 0
+        self._numbers = 0
+
+    def _value(self, code):
+        s = self.store.get(code)
+        return s.as_tuple() if s is not None else None
+
+    # ---------------- Recording ---------------- #
+
+    def capture(self, codes):
+        """Current values of codes; call before changing them."""
+        before = {}
+        slots = {}
+        for code in codes:
+            value = self._value(code)
+            before[code] = value
+            self.origin.setdefault(code, value)
+            if value is not None:
+                slots[code] = self.store.slot(code)
+        self._captured_slots = slots
+        return before
+
+    def record(self, label, before):
+        """Add a version for the edit that changed the captured codes; returns its number."""
+        after = {code: self._value(code) for code in before}
+        slots_after = {code: self.store.slot(code) for code, value in after.items() if value is not None}
+        changed = self.current.changed
+        for code, value in after.items():
+            changed = changed.set(code, value)
+
+        del self._versions[self._current + 1:]  # a new edit ends the redo branch
+        self._numbers += 1
+        self._versions.append(_Version(self._numbers, label, changed, before, after,
+                                       self._captured_slots, slots_after))
+        self._captured_slots = {}
+        if len(self._versions) > self.limit + 1:
+            del self._versions[0]
+        self._current = len(self._versions) - 1
+        return self._numbers
+
+    def discard(self, number):
+        """Drop version number after its edit was rolled back in the store."""
+        if self.current.number == number and self._current > 0:
+            del self._versions[self._current:]
+            self._current -= 1
+        else:
+            self.reset()  # other edits came after it; history no longer matches the store
+
+    # ---------------- Undo / redo ---------------- #
+
+    @property
+    def current(self):
+        return self._versions[self._current]
+
+    def can_undo(self):
+        return self._current > 0
+
+    def can_redo(self):
+        return self._current < len(self._versions) - 1
+
+    def undo_label(self):
+        return self.current.label if self.can_undo() else None
+
+    def redo_label(self):
+        return self._versions[self._current + 1].label if self.can_redo() else None
+
+    def undo(self):
+        """
+        Put the store back as it was before the current version's edit.
+        Returns (label, records written, codes deleted) for the caller to
+        journal, or None if there is nothing to undo.
+        """
+        if not self.can_undo():
+            return None
+        version = self.current
+        self._current -= 1
+        return (version.label, *self._apply(version.before, version.slots_before))
+
+    def redo(self):
+        if not self.can_redo():
+            return None
+        self._current += 1
+        version = self.current
+        return (version.label, *self._apply(version.after, version.slots_after))
+
+    def _apply(self, values, slots):
+        """Write values into the store; deleted rows that come back return to their old place."""
+        puts, deletes = [], []
+        for code, value in values.items():
+            if value is None:
+                if self.store.delete(code) is not None:
+                    deletes.append(code)
+            elif code in self.store:
+                _, name, c1, c2, c3, exam = value
+                puts.append(self.store.update(code, name=name, c1=c1, c2=c2, c3=c3, exam=exam))
+            else:
+                puts.append(self.store.add(StudentRecord(*value), slot=slots.get(code)))
+        return puts, deletes
+
+    # ---------------- Point-in-time views ---------------- #
+
+    def versions(self):
+        """(number, label) of every version kept, oldest first."""
+        return [(v.number, v.label) for v in self._versions]
+
+    def view(self, number=None):
+        """RosterView of a kept version (the current one by default)."""
+        if number is None:
+            return RosterView(self, self.current)
+        for version in self._versions:
+            if version.number == number:
+                return RosterView(self, version)
+        raise KeyError(f"version {number} is no longer kept")
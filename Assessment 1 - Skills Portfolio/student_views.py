@@ -0,0 +1,110 @@
+import tkinter as tk
+from tkinter import ttk
+
+from instrument import timed
+
+# ---------------------------------------------------------
+#   VIRTUALIZED TABLE
+# ---------------------------------------------------------
+
+class VirtualTable(tk.Frame):
+    """
+    Treeview over a row_at(i) callback that holds only a window of rows.
+    Scrolling near either edge of the window loads a page on that side
+    and drops one from the other. The scrollbar spans every row, so
+    dragging it jumps straight to any part of the data, loading only
+    the rows around that point.
+    """
+
+    PAGE = 200
+    WINDOW = 3 * PAGE  # rows kept in the Treeview at once
+    EDGE = 0.1  # move the window once the view is within 10% of either end
+
+    def __init__(self, master, columns, widths=None, **kw):
+        super().__init__(master, **kw)
+        self.tree = ttk.Treeview(self, columns=columns, show="headings",
+                                 style="Dashboard.Treeview")
+        for i, col in enumerate(columns):
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=(widths[i] if widths else 120), anchor="w")
+
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.tree.configure(yscrollcommand=self._on_scroll)
+        self.scrollbar.pack(side="right", fill="y")
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        self._count = 0
+        self._start = 0  # rows [_start, _end) are in the tree
+        self._end = 0
+        self._row_at = None
+
+    def set_source(self, count, row_at):
+        """Show a new data set of count rows, where row_at(i) returns row i."""
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
+        self._count = count
+        self._row_at = row_at
+        self._start = self._end = 0
+        self._load(0)
+        self.tree.yview_moveto(0)
+
+    @timed("student.table_page")
+    def _load(self, start):
+        """Hold rows [start, start + WINDOW), keeping any already loaded."""
+        start = max(0, min(start, self._count - self.WINDOW))
+        end = min(start + self.WINDOW, self._count)
+        items = self.tree.get_children()
+        if start >= self._end or end <= self._start:
+            if items:
+                self.tree.delete(*items)
+            for i in range(start, end):
+                self.tree.insert("", "end", values=self._row_at(i))
+        else:
+            drop = items[:max(start - self._start, 0)] + items[end - self._start:]
+            if drop:
+                self.tree.delete(*drop)
+            for i in reversed(range(start, self._start)):
+                self.tree.insert("", 0, values=self._row_at(i))
+            for i in range(self._end, end):
+                self.tree.insert("", "end", values=self._row_at(i))
+        self._start, self._end = start, end
+
+    def _view(self):
+        """(first row shown, rows shown), in row numbers of the whole data set."""
+        first, last = self.tree.yview()
+        loaded = self._end - self._start
+        return self._start + round(first * loaded), max(1, round((last - first) * loaded))
+
+    def _scroll_to(self, row, visible):
+        """Put row at the top of the view, re-centring the window on it if needed."""
+        row = max(0, min(row, self._count - visible))
+        if row < self._start or row + visible > self._end:
+            self._load(row - (self.WINDOW - visible) // 2)
+        self.tree.yview_moveto((row - self._start) / max(self._end - self._start, 1))
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        """Scrollbar drags and clicks, which are in fractions of every row."""
+        if not self._count:
+            return
+        top, visible = self._view()
+        if action == "moveto":
+            row = round(float(amount) * self._count)
+        else:
+            row = top + int(amount) * (visible if unit == "pages" else 1)
+        self._scroll_to(row, visible)
+
+    def _on_scroll(self, first, last):
+        """The tree view moved (wheel, keys or _scroll_to): slide the window, sync the scrollbar."""
+        first, last = float(first), float(last)
+        loaded = self._end - self._start
+        if not loaded:
+            return self.scrollbar.set(first, last)
+        if (last >= 1 - self.EDGE and self._end < self._count
+                or first <= self.EDGE and self._start > 0):
+            top, visible = self._view()
+            self._load(top - (self.WINDOW - visible) // 2)
+            self.tree.yview_moveto((top - self._start) / (self._end - self._start))
+            return  # the tree calls back with the new fractions
+        self.scrollbar.set((self._start + first * loaded) / self._count,
+                           (self._start + last * loaded) / self._count)
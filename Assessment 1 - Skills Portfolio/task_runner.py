@@ -0,0 +1,111 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# ---------------------------------------------------------
+#   BACKGROUND TASKS FOR TKINTER
+# ---------------------------------------------------------
+#   Work runs on a thread pool; results are handed back to Tk by
+#   polling with root.after, so callbacks always run on the main
+#   loop. Writer tasks share a single thread, so at most one file
+#   write is in flight and writes land in the order they were queued.
+
+
+class Cancelled(Exception):
+    """Raised inside a task when the user cancels it."""
+
+
+class Task:
+    """Handle passed to every task function for progress and cancel checks."""
+
+    def __init__(self, name, writer=False):
+        self.name = name
+        self.writer = writer
+        self.fraction = 0.0
+        self._cancel = threading.Event()
+        self.future = None
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def progress(self, fraction):
+        self.fraction = fraction
+
+    def check(self):
+        """Call from long loops; raises Cancelled once cancel() was requested."""
+        if self._cancel.is_set():
+            raise Cancelled(self.name)
+
+
+class TaskRunner:
+    POLL_MS = 50
+
+    def __init__(self, root, workers=2, on_progress=None):
+        self.root = root
+        self.on_progress = on_progress  # called with (task or None)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="worker")
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="writer")
+        self._active = []  # (task, on_done, on_error, on_cancel)
+        self._polling = False
+
+    def submit(self, name, fn, *args, on_done=None, on_error=None, on_cancel=None, writer=False):
+        """
+        Run fn(task, *args) in the background; callbacks run on the Tk loop.
+        Exactly one of on_done(result), on_error(exc) or on_cancel() is
+        called, so callers can always clean up.
+        """
+        task = Task(name, writer)
+        pool = self._writer if writer else self._pool
+        task.future = pool.submit(fn, task, *args)
+        self._active.append((task, on_done, on_error, on_cancel))
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.POLL_MS, self._poll)
+        return task
+
+    def writing(self):
+        """True while writer tasks are queued or running."""
+        return any(task.writer and not task.future.done() for task, *_ in self._active)
+
+    def cancel_all(self):
+        for task, *_ in self._active:
+            task.cancel()
+
+    def shutdown(self, wait=True):
+        """Cancel compute tasks but let queued writes finish."""
+        for task, *_ in self._active:
+            if not task.writer:
+                task.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._writer.shutdown(wait=wait)
+
+    def _poll(self):
+        still_running = []
+        for entry in self._active:
+            task, on_done, on_error, on_cancel = entry
+            if not task.future.done():
+                still_running.append(entry)
+                continue
+            error = None if task.future.cancelled() else task.future.exception()
+            if task.future.cancelled() or isinstance(error, Cancelled):
+                if on_cancel:
+                    on_cancel()
+            elif error is None:
+                if on_done:
+                    on_done(task.future.result())
+            elif on_error:
+                on_error(error)
+            else:
+                self.root.report_callback_exception(type(error), error, error.__traceback__)
+
+        self._active = still_running
+        if self.on_progress:
+            self.on_progress(still_running[0][0] if still_running else None)
+
+        if still_running:
+            self.root.after(self.POLL_MS, self._poll)
+        else:
+            self._polling = False